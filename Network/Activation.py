@@ -0,0 +1,266 @@
+"""Module which holds the registry of activation functions a Layer can use.
+
+Every activation provides a vectorized function and derivative which work
+on whole-layer numpy arrays, and a scalar function for neurodes which fire
+one at a time. Derivatives are expressed in terms of the activation output,
+which is the value the neurodes and engines keep after the forward pass.
+
+Back-propagation goes through Activation.backward, which multiplies a
+gradient by the Jacobian of the activation. For element-wise activations
+that is the derivative; softmax couples every output of the layer, so it
+provides the full Jacobian product instead.
+"""
+import math
+
+import numpy as np
+
+LEAKY_RELU_SLOPE = 0.01
+
+
+class Activation:
+    """
+    Activation function and its derivative.
+
+    Attributes:
+        name: name the activation is registered under
+        function: vectorized activation function of the weighted sums
+        derivative: vectorized derivative, given the activation outputs.
+          For an activation with a jacobian_product this is only the
+          diagonal of its Jacobian.
+        scalar_function: activation function of a single weighted sum
+        jacobian_product: product of a gradient with the Jacobian, given
+          the activation outputs and the gradient, or None for an
+          element-wise activation
+    """
+
+    def __init__(self, name: str, function, derivative, scalar_function,
+                 jacobian_product=None):
+        """
+        Inits Activation with all class attributes initialized.
+
+        Args:
+            name: name to register the activation under
+            function: vectorized activation function of the weighted sums
+            derivative: vectorized derivative, given the activation outputs
+            scalar_function: activation function of a single weighted sum
+            jacobian_product: product of a gradient with the Jacobian, for
+              activations which are not element-wise
+        """
+        self.name = name
+        self.function = function
+        self.derivative = derivative
+        self.scalar_function = scalar_function
+        self.jacobian_product = jacobian_product
+
+    def __repr__(self):
+        return "Activation(" + self.name + ")"
+
+    def backward(self, outputs: np.ndarray,
+                 gradient: np.ndarray) -> np.ndarray:
+        """
+        Turns a gradient with respect to the outputs of a layer into the
+        gradient with respect to its weighted sums.
+
+        Args:
+            outputs: activation outputs, 1-D for one example or 2-D with
+              one row per example
+            gradient: gradient with respect to the outputs, same shape
+
+        Returns:
+            gradient with respect to the weighted sums, same shape
+        """
+        if self.jacobian_product is not None:
+            return self.jacobian_product(outputs, gradient)
+        return gradient * self.derivative(outputs)
+
+
+def sigmoid(values: np.ndarray) -> np.ndarray:
+    """Logistic function, written with tanh so it cannot overflow"""
+    return 0.5 * (1 + np.tanh(0.5 * values))
+
+
+def sigmoid_derivative(values: np.ndarray) -> np.ndarray:
+    """Derivative of the logistic function given its outputs"""
+    return values * (1 - values)
+
+
+def sigmoid_scalar(value: float) -> float:
+    """Logistic function of a single value, split on its sign so math.exp
+    never overflows"""
+    if value >= 0:
+        return 1 / (1 + math.exp(-value))
+    exp_value = math.exp(value)
+    return exp_value / (1 + exp_value)
+
+
+def tanh_derivative(values: np.ndarray) -> np.ndarray:
+    """Derivative of the hyperbolic tangent given its outputs"""
+    return 1 - values * values
+
+
+def relu(values: np.ndarray) -> np.ndarray:
+    """Rectified linear unit"""
+    return np.maximum(values, 0)
+
+
+def relu_derivative(values: np.ndarray) -> np.ndarray:
+    """Derivative of the rectified linear unit given its outputs, in the
+    dtype of the outputs. A single output of a neurode gives a float."""
+    if isinstance(values, np.ndarray):
+        return (values > 0).astype(values.dtype)
+    return 1.0 if values > 0 else 0.0
+
+
+def relu_scalar(value: float) -> float:
+    """Rectified linear unit of a single value"""
+    return value if value > 0 else 0.0
+
+
+def leaky_relu(values: np.ndarray) -> np.ndarray:
+    """Rectified linear unit which keeps a small slope below zero"""
+    return np.where(values > 0, values, LEAKY_RELU_SLOPE * values)
+
+
+def leaky_relu_derivative(values: np.ndarray) -> np.ndarray:
+    """Derivative of the leaky rectified linear unit given its outputs, in
+    the dtype of the outputs. A single output of a neurode gives a float."""
+    if isinstance(values, np.ndarray):
+        return np.where(values > 0, values.dtype.type(1),
+                        values.dtype.type(LEAKY_RELU_SLOPE))
+    return 1.0 if values > 0 else LEAKY_RELU_SLOPE
+
+
+def leaky_relu_scalar(value: float) -> float:
+    """Leaky rectified linear unit of a single value"""
+    return value if value > 0 else LEAKY_RELU_SLOPE * value
+
+
+def softmax(values: np.ndarray) -> np.ndarray:
+    """Normalized exponential over the last axis, i.e. over each layer"""
+    exp_values = np.exp(values - np.max(values, axis=-1, keepdims=True))
+    return exp_values / np.sum(exp_values, axis=-1, keepdims=True)
+
+
+def softmax_jacobian_product(outputs: np.ndarray,
+                             gradient: np.ndarray) -> np.ndarray:
+    """Product of a gradient with the Jacobian of softmax given its outputs,
+    s * (g - sum(g * s)) over each layer"""
+    return outputs * (gradient - np.sum(gradient * outputs, axis=-1,
+                                        keepdims=True))
+
+
+def softmax_scalar(value: float) -> float:
+    """Softmax depends on the whole layer and has no scalar form"""
+    raise LayerActivationError(
+        "softmax needs the whole layer and cannot run neurode by neurode; "
+        "use FFBPNetwork.Engine.MATRIX")
+
+
+ACTIVATIONS = {}
+
+
+def register_activation(activation: Activation):
+    """
+    Adds an activation to the registry, replacing any activation already
+    registered under the same name.
+
+    Args:
+        activation: Activation to register
+    """
+    ACTIVATIONS[activation.name] = activation
+
+
+def get_activation(activation) -> Activation:
+    """
+    Looks up an activation in the registry.
+
+    Args:
+        activation: registered name, or an Activation which is returned
+          unchanged
+
+    Returns:
+        Activation registered under the given name
+
+    Raises:
+        UnknownActivationError: if no activation has the given name
+    """
+    if isinstance(activation, Activation):
+        return activation
+    if activation not in ACTIVATIONS:
+        raise UnknownActivationError(activation)
+    return ACTIVATIONS[activation]
+
+
+register_activation(Activation('sigmoid', sigmoid, sigmoid_derivative,
+                               sigmoid_scalar))
+register_activation(Activation('tanh', np.tanh, tanh_derivative, math.tanh))
+register_activation(Activation('relu', relu, relu_derivative, relu_scalar))
+register_activation(Activation('leaky_relu', leaky_relu,
+                               leaky_relu_derivative, leaky_relu_scalar))
+register_activation(Activation('softmax', softmax, sigmoid_derivative,
+                               softmax_scalar, softmax_jacobian_product))
+
+
+class UnknownActivationError(Exception):
+    """No activation is registered under the given name"""
+
+
+class LayerActivationError(Exception):
+    """Activation needs the whole layer and cannot run neurode by neurode"""
+
+
+def main():
+    """Main Unit test for module"""
+    rng = np.random.default_rng(0)
+    sums = rng.uniform(-2, 2, 5)
+    gradient = rng.random(5)
+    step = 1e-6
+
+    for activation in ACTIVATIONS.values():
+        outputs = activation.function(sums)
+        # Numeric Jacobian, one column per weighted sum
+        jacobian = np.empty((5, 5))
+        for column in range(5):
+            shift = np.zeros(5)
+            shift[column] = step
+            jacobian[:, column] = (activation.function(sums + shift)
+                                   - activation.function(sums - shift)) \
+                / (2 * step)
+        assert np.allclose(activation.backward(outputs, gradient),
+                           gradient @ jacobian, atol=1e-6), activation
+        batch = activation.backward(np.array([outputs, outputs]),
+                                    np.array([gradient, gradient]))
+        assert np.allclose(batch[1], gradient @ jacobian, atol=1e-6)
+
+        if activation.jacobian_product is None:
+            assert np.allclose([activation.scalar_function(value)
+                                for value in sums], outputs)
+            assert np.allclose([activation.derivative(float(value))
+                                for value in outputs],
+                               activation.derivative(outputs))
+        else:
+            try:
+                activation.scalar_function(sums[0])
+                assert False
+            except LayerActivationError:
+                pass
+
+    # Kernels and backward keep the dtype of the network
+    for activation in ACTIVATIONS.values():
+        outputs = activation.function(sums.astype(np.float32))
+        assert outputs.dtype == np.float32, activation
+        assert activation.backward(outputs, gradient.astype(
+            np.float32)).dtype == np.float32, activation
+
+    assert sigmoid_scalar(-1000) == 0 and sigmoid_scalar(1000) == 1
+    assert get_activation('tanh') is get_activation(get_activation('tanh'))
+    try:
+        get_activation('nope')
+        assert False
+    except UnknownActivationError:
+        pass
+    print("Done!")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,20 +11,38 @@ class BPNeurode(Neurode):
     Attributes:
         delta: measure of how incoming weights need to change
         learning_rate: learning rate of the network
+        layer: Layer which holds the neurode, None if it has none. Each
+          learning rate assignment is counted by the layer, which tells
+          its MatrixEngine when its copies of the rates are stale.
     """
 
-    def __init__(self, my_type: LayerType):
+    __slots__ = ('delta', '_learning_rate', 'layer')
+
+    def __init__(self, my_type: LayerType, activation='sigmoid'):
         """
         Inits BPNeurode with all class and inherited attributes initialized.
 
         Args:
             my_type: LayerType Enum
+            activation: registered activation name or Activation
         """
-        super().__init__(my_type)
+        super().__init__(my_type, activation)
 
         self.delta = 0
+        self.layer = None
         self.learning_rate = 0.05
 
+    @property
+    def learning_rate(self) -> float:
+        """Learning rate of the neurode's incoming weights"""
+        return self._learning_rate
+
+    @learning_rate.setter
+    def learning_rate(self, learning_rate: float):
+        self._learning_rate = learning_rate
+        if self.layer is not None:
+            self.layer.rate_changes += 1
+
     @staticmethod
     def sigmoid_derivative(value: float) -> float:
         """
@@ -82,11 +100,8 @@ class BPNeurode(Neurode):
         if self.my_type is LayerType.OUTPUT:
             return True
 
-        index = list(self.output_nodes.keys()).index(from_node)
-        self.reporting_outputs = self.reporting_outputs | 2 ** index
-
-        if self.reporting_outputs == self.compare_outputs_full:
-            self.reporting_outputs = 0
+        if self.output_reports.set(self.output_index[from_node]):
+            self.output_reports.clear()
             return True
         return False
 
@@ -97,12 +112,12 @@ class BPNeurode(Neurode):
 
         Output Layer Node:
          delta for output neurode = (expected value - value) *
-                                     sigmoid_derivative
+                                     activation derivative
 
         Hidden Layer Node:
          weighted deltas = sum(weight of self node logged by target node *
                            delta of target node) delta for hidden neurode =
-                           (sum of weighted deltas) * sigmoid_derivative
+                           (sum of weighted deltas) * activation derivative
 
         Input Layer Node:
         No action taken.
@@ -115,7 +130,7 @@ class BPNeurode(Neurode):
         # Output Node
         if self.my_type == LayerType.OUTPUT:
             error = expected - self.value
-            self.delta = error * self.sigmoid_derivative(self.value)
+            self.delta = error * self.activation.derivative(self.value)
 
         # Hidden Node
         if self.my_type == LayerType.HIDDEN:
@@ -123,16 +138,16 @@ class BPNeurode(Neurode):
             for node in self.output_nodes:
                 self.delta += (node.get_weight_for_input_node(self) *
                                node.delta)
-            self.delta *= self.sigmoid_derivative(self.value)
+            self.delta *= self.activation.derivative(self.value)
 
     def adjust_input_node(self, node, value):
         """
         Helper method for Update_weights
 
-        Updates the value of the given node in the input_nodes dict, adding
+        Updates the weight in the input slot of the given node, adding
         the value given to the current value.
         """
-        self.input_nodes[node] += value
+        self.input_weights[self.input_index[node]] += value
 
     def update_weights(self):
         """
@@ -145,7 +160,7 @@ class BPNeurode(Neurode):
             learning rate)
         """
 
-        for key, node_data in self.output_nodes.items():
+        for key in self.output_index:
             adjustment = key.get_learning_rate() * key.get_delta() * self.value
             key.adjust_input_node(self, adjustment)
 
@@ -153,7 +168,7 @@ class BPNeurode(Neurode):
         """Recursive method which calls receive_back_input on each neurode
         connected to it's input_nodes dict."""
 
-        for node in self.input_nodes:
+        for node in self.input_index:
             node.receive_back_input(self)
 
     def get_learning_rate(self):
@@ -163,7 +178,7 @@ class BPNeurode(Neurode):
         Returns:
             learning_rate attribute
         """
-        return self.learning_rate
+        return self._learning_rate
 
     def get_delta(self):
         """
@@ -176,4 +191,4 @@ class BPNeurode(Neurode):
 
     def get_weight_for_input_node(self, from_node):
         """TODO Docs"""
-        return self.input_nodes[from_node]
+        return self.input_weights[self.input_index[from_node]]
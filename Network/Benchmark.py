@@ -0,0 +1,496 @@
+"""This module times the training and inference hot paths.
+
+Every workload runs on seeded data, across a matrix of network widths,
+depths and data set sizes. Results are written as JSON and can be compared
+against a stored baseline, flagging every benchmark which got slower than
+the baseline by more than a tolerance. The precision benchmarks train the
+XOR, sin and Iris workloads of FFBPNetwork.main in float64, in float32 and
+in float32 on float16 data, recording the RMSE next to the time. Import
+times are taken in fresh interpreters and checked against IMPORT_BUDGET, so
+module level work which slows down the start of every training worker is
+caught.
+
+Run it as a script:
+
+    python -m Network.Benchmark --output results.json --baseline base.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from Network.FFBPNetwork import FFBPNetwork, iris_data, sin_data, xor_data
+from Network.Initializer import get_initializer
+from Network.Metrics import Metrics
+from Network.NNData import NNData
+from Network.NNDataJson import NNDataJson, load_nn_data, nn_data_decoder
+from Network.Sweep import evaluate
+
+WIDTHS = (8, 32, 128)
+DEPTHS = (1, 3)
+SIZES = (100, 1000)
+QUICK_WIDTHS = (8, 32)
+QUICK_DEPTHS = (1,)
+QUICK_SIZES = (100,)
+SAMPLE_EXAMPLES = 50  # examples timed one at a time per repeat
+DEFAULT_TOLERANCE = 0.25  # slow-down allowed before a regression is flagged
+RESULTS_VERSION = 1
+# workload: (data function, hidden layer sizes, training percentage), the
+# shapes FFBPNetwork.main trains
+WORKLOADS = {'xor': (xor_data, (3,), 100),
+             'sin': (sin_data, (25,), 45),
+             'iris': (iris_data, (6,), 45)}
+PRECISIONS = (('float64', 'float64'), ('float32', 'float32'),
+              ('float32', 'float16'))  # (network dtype, data set dtype)
+PRECISION_EPOCHS = 1000
+PRECISION_BATCH = 4
+IMPORT_MODULES = ('Network', 'Network.NNData', 'Network.FFBPNetwork')
+# Seconds a module may take to import after numpy, as measured by
+# time_import: best of fresh interpreters, with the bytecode already cached
+# by an untimed first run. Network.FFBPNetwork measured 0.005s that way on
+# a 1-CPU Linux VM under Python 3.11, so the budget leaves 4x headroom for
+# slower machines. Compiling the bytecode on a first import adds about
+# 0.02s, which is not the start-up cost of a training worker.
+IMPORT_BUDGET = 0.02
+# Run in a fresh interpreter: imports numpy, which is not ours to speed up,
+# then times importing the module and prints the seconds it took.
+IMPORT_SCRIPT = """
+import sys, time
+import numpy
+start = time.perf_counter()
+__import__(sys.argv[1])
+print(time.perf_counter() - start)
+"""
+
+
+def time_best(function, repeats: int) -> tuple:
+    """
+    Times a function several times.
+
+    Args:
+        function: function without arguments to time
+        repeats: number of times to run it
+
+    Returns:
+        tuple of the best and the median time in seconds
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times), float(np.median(times))
+
+
+def time_import(module: str, repeats: int) -> tuple:
+    """
+    Times importing a module, each time in a fresh interpreter so nothing
+    is cached in sys.modules. An untimed first run compiles and caches the
+    bytecode, so compiling is not counted.
+
+    Args:
+        module: dotted name of the module to import
+        repeats: number of interpreters to start
+
+    Returns:
+        tuple of the best and the median import time in seconds, numpy's
+        own import excluded
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, (root, env.get('PYTHONPATH'))))
+    times = []
+    for _ in range(repeats + 1):
+        output = subprocess.run(
+            [sys.executable, '-c', IMPORT_SCRIPT, module], env=env,
+            stdout=subprocess.PIPE, check=True, universal_newlines=True)
+        times.append(float(output.stdout.split()[-1]))
+    return min(times[1:]), float(np.median(times[1:]))
+
+
+def make_data(size: int, width: int, seed: int, storage=NNData.Storage.LIST):
+    """
+    Builds a seeded regression data set.
+
+    Args:
+        size: number of examples
+        width: number of inputs and outputs of each example
+        seed: seed of the examples and of the split
+        storage: NNData.Storage of the data set
+
+    Returns:
+        NNData with 80% of the examples in the training set
+    """
+    rng = np.random.default_rng(seed)
+    x = rng.random((size, width))
+    y = 0.5 + 0.5 * np.sin(x)
+    if storage is NNData.Storage.LIST:
+        x, y = x.tolist(), y.tolist()
+    return NNData(x, y, 80, storage, seed=seed)
+
+
+def make_network(width: int, depth: int, engine, seed: int,
+                 initializer=None, dtype=np.float64) -> FFBPNetwork:
+    """
+    Builds a seeded network with depth hidden layers of the given width.
+
+    Args:
+        width: number of neurodes of every layer
+        depth: number of hidden layers
+        engine: FFBPNetwork.Engine of the network
+        seed: seed of the initial weights, through random.seed for an
+          initialiser which ignores the Generator
+        initializer: name of the weight initialiser, None for the seeded
+          default
+        dtype: numpy dtype of the network
+
+    Returns:
+        FFBPNetwork
+    """
+    random.seed(seed)
+    if initializer is not None and not get_initializer(initializer).seeded:
+        seed = None
+    network = FFBPNetwork(width, width, engine, initializer=initializer,
+                          seed=seed, dtype=dtype)
+    for _ in range(depth):
+        network.add_hidden_layer(width)
+    return network
+
+
+class Benchmark:
+    """
+    Runs the benchmark matrix and collects its results.
+
+    Attributes:
+        widths: network widths to run
+        depths: numbers of hidden layers to run
+        sizes: data set sizes to run
+        repeats: number of timed runs of every benchmark
+        seed: seed of every data set and network
+        results: list of result dicts with name, params, best and median
+    """
+
+    def __init__(self, widths=WIDTHS, depths=DEPTHS, sizes=SIZES,
+                 repeats: int = 5, seed: int = 0):
+        """
+        Inits Benchmark with no results.
+
+        Args:
+            widths: network widths to run
+            depths: numbers of hidden layers to run
+            sizes: data set sizes to run
+            repeats: number of timed runs of every benchmark
+            seed: seed of every data set and network
+        """
+        self.widths = widths
+        self.depths = depths
+        self.sizes = sizes
+        self.repeats = repeats
+        self.seed = seed
+        self.results = []
+
+    def record(self, name: str, params: dict, function):
+        """
+        Helper method which times a function and records the result.
+
+        Args:
+            name: name of the benchmark
+            params: dict of the benchmark's parameters
+            function: function without arguments to time
+        """
+        best, median = time_best(function, self.repeats)
+        self.add_result(name, params, best, median)
+
+    def add_result(self, name: str, params: dict, best: float,
+                   median: float, **extra):
+        """Helper method which records the times of one benchmark, and any
+        extra measurements such as the rmse"""
+        self.results.append({'name': name, 'params': params,
+                             'best': best, 'median': median, **extra})
+
+    def run(self) -> list:
+        """
+        Runs every benchmark of the matrix.
+
+        Returns:
+            list of result dicts
+        """
+        with contextlib.redirect_stdout(io.StringIO()):
+            for width in self.widths:
+                for depth in self.depths:
+                    self.run_network(width, depth)
+            for size in self.sizes:
+                self.run_data(size)
+            for workload in WORKLOADS:
+                self.run_precision(workload)
+        self.run_imports()
+        return self.results
+
+    def run_precision(self, workload: str):
+        """
+        Times training one workload of FFBPNetwork.main in every precision
+        of PRECISIONS, and records the RMSE each precision reaches.
+
+        Args:
+            workload: name of the workload in WORKLOADS
+        """
+        load, hidden_layers, percentage = WORKLOADS[workload]
+        x, y = load()
+        for dtype, data_dtype in PRECISIONS:
+            data = NNData(x, y, percentage, NNData.Storage.NUMPY,
+                          np.dtype(data_dtype), self.seed)
+            networks = []
+
+            def train():
+                network = FFBPNetwork(len(x[0]), len(y[0]),
+                                      FFBPNetwork.Engine.MATRIX,
+                                      initializer='xavier', seed=self.seed,
+                                      dtype=np.dtype(dtype))
+                for size in hidden_layers:
+                    network.add_hidden_layer(size)
+                data.rng = np.random.default_rng(self.seed)
+                network.train(data, PRECISION_EPOCHS, 0,
+                              batch_size=PRECISION_BATCH,
+                              metrics=Metrics([], 0))
+                networks.append(network)
+
+            best, median = time_best(train, self.repeats)
+            self.add_result('precision',
+                            {'workload': workload, 'dtype': dtype,
+                             'data_dtype': data_dtype,
+                             'epochs': PRECISION_EPOCHS},
+                            best, median, rmse=evaluate(networks[-1], data))
+
+    def run_imports(self):
+        """Times the cold import of every module in IMPORT_MODULES."""
+        for module in IMPORT_MODULES:
+            best, median = time_import(module, self.repeats)
+            self.add_result('import', {'module': module}, best, median)
+
+    def run_network(self, width: int, depth: int):
+        """
+        Times the construction, the forward pass, the backward pass, a
+        batched forward pass and a full epoch of one network shape on both
+        engines.
+
+        Args:
+            width: number of neurodes of every layer
+            depth: number of hidden layers
+        """
+        data = make_data(max(self.sizes), width, self.seed)
+        examples, labels = data.get_items(data.train_indices[
+            :SAMPLE_EXAMPLES])
+
+        for initializer in ('legacy', 'xavier'):
+            self.record('construct', {'initializer': initializer,
+                                      'width': width, 'depth': depth},
+                        lambda: make_network(width, depth,
+                                             FFBPNetwork.Engine.OBJECT,
+                                             self.seed, initializer))
+
+        for engine in FFBPNetwork.Engine:
+            params = {'engine': engine.name, 'width': width, 'depth': depth}
+            network = make_network(width, depth, engine, self.seed)
+
+            def forward():
+                for example in examples:
+                    network.send_data_to_inputs(example)
+
+            def forward_backward():
+                for example, label in zip(examples, labels):
+                    network.send_data_to_inputs(example)
+                    network.send_data_to_outputs(label)
+
+            self.record('forward', {**params, 'examples': len(examples)},
+                        forward)
+            self.record('forward_backward',
+                        {**params, 'examples': len(examples)},
+                        forward_backward)
+
+            for size in self.sizes:
+                epoch_data = make_data(size, width, self.seed)
+                self.record('epoch', {**params, 'size': size},
+                            lambda: network.train(epoch_data, 1, 0,
+                                                  metrics=Metrics([], 0)))
+
+        for dtype in ('float64', 'float32'):
+            network = make_network(width, depth, FFBPNetwork.Engine.MATRIX,
+                                   self.seed, dtype=np.dtype(dtype))
+            for size in self.sizes:
+                batch = np.random.default_rng(self.seed).random(
+                    (size, width)).astype(dtype)
+                self.record('predict', {'width': width, 'depth': depth,
+                                        'size': size, 'dtype': dtype},
+                            lambda: network.predict(batch))
+
+    def run_data(self, size: int):
+        """
+        Times priming and draining the training pool, and decoding the
+        data set from JSON, for one data set size.
+
+        Args:
+            size: number of examples
+        """
+        for storage in NNData.Storage:
+            data = make_data(size, 8, self.seed, storage)
+            params = {'storage': storage.name, 'size': size}
+
+            def prime_and_drain():
+                data.prime_data(NNData.Set.TRAIN, NNData.Order.RANDOM)
+                while not data.empty_pool(NNData.Set.TRAIN):
+                    data.get_one_item(NNData.Set.TRAIN)
+
+            self.record('prime_get_one_item', params, prime_and_drain)
+
+        text = json.dumps(make_data(size, 8, self.seed), cls=NNDataJson)
+        params = {'size': size, 'bytes': len(text)}
+        self.record('json_decode', params,
+                    lambda: json.loads(text, object_hook=nn_data_decoder))
+        self.record('json_stream_decode', params,
+                    lambda: load_nn_data(io.StringIO(text)))
+
+    def to_json(self) -> dict:
+        """Returns the results with the environment they were taken in"""
+        return {'version': RESULTS_VERSION,
+                'environment': {'python': platform.python_version(),
+                                'numpy': np.__version__,
+                                'machine': platform.machine(),
+                                'repeats': self.repeats,
+                                'seed': self.seed},
+                'results': self.results}
+
+
+def result_key(result: dict) -> tuple:
+    """Helper function which identifies a result by name and params"""
+    return result['name'], tuple(sorted(result['params'].items()))
+
+
+def compare(results: list, baseline: list,
+            tolerance: float = DEFAULT_TOLERANCE) -> list:
+    """
+    Compares results against baseline results of the same benchmarks.
+
+    Args:
+        results: list of result dicts
+        baseline: list of result dicts taken earlier
+        tolerance: fraction by which a benchmark may be slower than its
+          baseline before it counts as a regression
+
+    Returns:
+        list of (result, baseline result, ratio) tuples of regressions
+    """
+    baseline = {result_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        previous = baseline.get(result_key(result))
+        if previous is None:
+            continue
+        ratio = result['best'] / previous['best']
+        if ratio > 1 + tolerance:
+            regressions.append((result, previous, ratio))
+    return regressions
+
+
+def over_budget(results: list, budget: float = IMPORT_BUDGET) -> list:
+    """
+    Finds the import results slower than the import budget.
+
+    Args:
+        results: list of result dicts
+        budget: seconds a module may take to import
+
+    Returns:
+        list of import result dicts whose best time exceeds the budget
+    """
+    return [result for result in results
+            if result['name'] == 'import' and result['best'] > budget]
+
+
+def format_results(results: list) -> str:
+    """
+    Formats results as a plain text table.
+
+    Args:
+        results: list of result dicts
+
+    Returns:
+        table with one row per result
+    """
+    lines = []
+    for result in results:
+        params = ' '.join(key + '=' + str(value)
+                          for key, value in result['params'].items())
+        if 'rmse' in result:
+            params += ' rmse={:.6f}'.format(result['rmse'])
+        lines.append('{:<20} {:>10.6f} {:>10.6f}  {}'.format(
+            result['name'], result['best'], result['median'], params))
+    return '\n'.join(lines)
+
+
+def main(argv=None) -> int:
+    """
+    Runs the benchmark suite from the command line.
+
+    Args:
+        argv: list of command line arguments, defaults to sys.argv
+
+    Returns:
+        exit status, 1 if a regression against the baseline was found
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--output', help="write results to this JSON file")
+    parser.add_argument('--baseline', help="compare against this JSON file")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="overwrite the baseline with these results")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--quick', action='store_true',
+                        help="run a reduced matrix")
+    parser.add_argument('--import-budget', type=float, default=IMPORT_BUDGET,
+                        help="seconds a module may take to import")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        benchmark = Benchmark(QUICK_WIDTHS, QUICK_DEPTHS, QUICK_SIZES,
+                              args.repeats, args.seed)
+    else:
+        benchmark = Benchmark(repeats=args.repeats, seed=args.seed)
+    results = benchmark.run()
+    print(format_results(results))
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(benchmark.to_json(), file, indent=1)
+
+    status = 0
+    for result in over_budget(results, args.import_budget):
+        print("Over import budget:", result['params']['module'],
+              "{:.6f}s > {:.6f}s".format(result['best'], args.import_budget))
+        status = 1
+    if args.baseline and not args.update_baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)['results']
+        for result, previous, ratio in compare(results, baseline,
+                                               args.tolerance):
+            print("Regression:", result['name'], result['params'],
+                  "{:.2f}x slower".format(ratio), "({:.6f}s vs {:.6f}s)"
+                  .format(result['best'], previous['best']))
+            status = 1
+    elif args.baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(benchmark.to_json(), file, indent=1)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Module which provides a compact bit array for tracking reporting nodes."""
+
+
+class BitArray:
+    """
+    Fixed-width array of bits packed into a bytearray.
+
+    Keeps a running count of set bits so that checking whether every bit
+    is set costs O(1), unlike comparing ever-growing Python ints.
+
+    Attributes:
+        size: number of bits in the array
+        count: number of bits currently set
+        bits: bytearray holding the packed bits, bit i is stored in byte
+          i // 8 at position i % 8
+    """
+
+    __slots__ = ('size', 'count', 'bits')
+
+    def __init__(self, size: int = 0):
+        """
+        Inits BitArray with all bits cleared.
+
+        Args:
+            size: number of bits in the array
+        """
+        self.size = size
+        self.count = 0
+        self.bits = bytearray((size + 7) >> 3)
+
+    def __int__(self) -> int:
+        """Returns the bits encoded as an int, bit i having value 2 ** i"""
+        return int.from_bytes(self.bits, 'little')
+
+    def resize(self, size: int):
+        """
+        Changes the number of bits in the array, keeping the bits which
+        still fit.
+
+        Args:
+            size: new number of bits
+        """
+        num_bytes = (size + 7) >> 3
+        if num_bytes > len(self.bits):
+            self.bits.extend(bytes(num_bytes - len(self.bits)))
+        shrinking = size < self.size
+        self.size = size
+        if shrinking:
+            self.load(int(self))
+
+    def set(self, position: int) -> bool:
+        """
+        Sets the bit at the given position.
+
+        Args:
+            position: bit position to set
+
+        Returns:
+            True if every bit of the array is now set, False if not
+        """
+        byte, mask = position >> 3, 1 << (position & 7)
+        if not self.bits[byte] & mask:
+            self.bits[byte] |= mask
+            self.count += 1
+        return self.count == self.size
+
+    def is_full(self) -> bool:
+        """Returns True if every bit of the array is set"""
+        return self.count == self.size
+
+    def clear(self):
+        """Clears every bit of the array."""
+        self.bits[:] = bytes(len(self.bits))
+        self.count = 0
+
+    def load(self, value: int):
+        """
+        Replaces the bits of the array with the bits of the given int.
+        Bits beyond the size of the array are dropped.
+
+        Args:
+            value: int whose bit i becomes bit i of the array
+        """
+        value &= (1 << self.size) - 1
+        self.bits[:] = value.to_bytes(len(self.bits), 'little')
+        self.count = bin(value).count('1')
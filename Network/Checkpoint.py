@@ -0,0 +1,175 @@
+"""This module reads and writes network checkpoints in a binary container.
+
+A checkpoint starts with a fixed prefix (magic, version and header length),
+followed by a JSON header describing the topology and the arrays, followed
+by the arrays themselves as raw contiguous bytes. Every array starts on an
+aligned offset, so it can be memory-mapped straight from the file.
+"""
+import json
+import struct
+
+import numpy as np
+
+CHECKPOINT_MAGIC = b'FFBPNET\x00'
+CHECKPOINT_VERSION = 1
+CHECKPOINT_PREFIX = struct.Struct('<8sHI')  # magic, version, header length
+CHECKPOINT_ALIGNMENT = 64
+
+
+def align(offset: int) -> int:
+    """
+    Rounds an offset up to the next multiple of CHECKPOINT_ALIGNMENT.
+
+    Args:
+        offset: offset in bytes
+
+    Returns:
+        aligned offset in bytes
+    """
+    return -(-offset // CHECKPOINT_ALIGNMENT) * CHECKPOINT_ALIGNMENT
+
+
+def write_checkpoint(path: str, header: dict, arrays: list):
+    """
+    Writes a header and a list of arrays to a checkpoint file.
+
+    Args:
+        path: path of the file to write
+        header: JSON serializable dict, stored under 'header'
+        arrays: list of numpy arrays, written in order
+    """
+    arrays = [np.asarray(array) for array in arrays]
+    descriptions = []
+    offset = 0
+    for array in arrays:
+        descriptions.append({'dtype': array.dtype.str,
+                             'shape': list(array.shape),
+                             'offset': offset})
+        offset = align(offset + array.nbytes)
+
+    text = json.dumps({'header': header, 'arrays': descriptions})
+    text = text.encode('utf-8')
+    prefix = CHECKPOINT_PREFIX.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION,
+                                    len(text))
+    data_start = align(len(prefix) + len(text))
+
+    with open(path, 'wb') as file:
+        file.write(prefix)
+        file.write(text)
+        for array, description in zip(arrays, descriptions):
+            file.write(bytes(data_start + description['offset']
+                             - file.tell()))
+            np.ascontiguousarray(array).tofile(file)
+
+
+def read_checkpoint(path: str, mmap_mode='c') -> tuple:
+    """
+    Reads the header of a checkpoint file and opens its arrays.
+
+    Args:
+        path: path of the file to read
+        mmap_mode: numpy.memmap mode used to map the arrays. The default
+          'c' maps them copy-on-write, so they can be trained further
+          without changing the file. None reads them into memory.
+
+    Returns:
+        tuple of the header dict and the list of arrays
+
+    Raises:
+        CheckpointFormatError: if the file does not start with a valid
+          prefix
+    """
+    with open(path, 'rb') as file:
+        prefix = file.read(CHECKPOINT_PREFIX.size)
+        if len(prefix) < CHECKPOINT_PREFIX.size:
+            raise CheckpointFormatError(path)
+        magic, version, length = CHECKPOINT_PREFIX.unpack(prefix)
+        if magic != CHECKPOINT_MAGIC or version != CHECKPOINT_VERSION:
+            raise CheckpointFormatError(path)
+        contents = json.loads(file.read(length).decode('utf-8'))
+        data_start = align(CHECKPOINT_PREFIX.size + length)
+
+        arrays = []
+        for description in contents['arrays']:
+            dtype = np.dtype(description['dtype'])
+            shape = tuple(description['shape'])
+            offset = data_start + description['offset']
+            if mmap_mode is None or 0 in shape:
+                file.seek(offset)
+                count = int(np.prod(shape))
+                array = np.fromfile(file, dtype, count).reshape(shape)
+            else:
+                array = np.memmap(path, dtype, mmap_mode, offset, shape)
+            arrays.append(array)
+
+    return contents['header'], arrays
+
+
+class CheckpointFormatError(Exception):
+    """File is not a checkpoint of a supported version"""
+
+
+def main():
+    """Main Unit test for module"""
+    # Imported here, as FFBPNetwork imports this module
+    import os
+    import tempfile
+    from Network.FFBPNetwork import FFBPNetwork
+
+    arrays = [np.arange(12, dtype=np.float64).reshape(3, 4),
+              np.linspace(0, 1, 5, dtype=np.float32), np.empty((0, 2)),
+              np.array([3, 1, 2], dtype=np.int32)]
+    header = {'name': 'test', 'layers': [1, 2]}
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'arrays.ckpt')
+        write_checkpoint(path, header, arrays)
+        for mmap_mode in ('c', 'r', None):
+            read_header, read_arrays = read_checkpoint(path, mmap_mode)
+            assert read_header == header
+            for array, read_array in zip(arrays, read_arrays):
+                assert read_array.dtype == array.dtype
+                assert np.array_equal(read_array, array)
+            del read_arrays
+        # copy-on-write arrays can change without touching the file
+        _, read_arrays = read_checkpoint(path)
+        read_arrays[0] += 1
+        del read_arrays
+        assert read_checkpoint(path, None)[1][0][0, 0] == 0
+
+        bad_path = os.path.join(directory, 'bad.ckpt')
+        with open(bad_path, 'wb') as file:
+            file.write(b'not a checkpoint at all')
+        try:
+            read_checkpoint(bad_path)
+            assert False
+        except CheckpointFormatError:
+            pass
+
+        network = FFBPNetwork(3, 2, FFBPNetwork.Engine.MATRIX, 'tanh',
+                              seed=0, dtype=np.float32)
+        network.add_hidden_layer(4, 'relu', 'he')
+        network.layers.get_output_nodes()[0].learning_rate = 0.2
+        path = os.path.join(directory, 'network.ckpt')
+        network.save(path)
+        for mmap_mode in ('c', None):
+            loaded = FFBPNetwork.load(path, mmap_mode)
+            assert loaded.layers.dtype == np.float32
+            assert [(len(layer.neurodes), layer.activation.name)
+                    for layer in loaded.matrix_engine.get_layers()[1:]] \
+                == [(4, 'relu'), (2, 'tanh')]
+            assert loaded.matrix_engine.get_layers()[1].initializer.name \
+                == 'he'
+            assert loaded.layers.get_output_nodes()[0].learning_rate == 0.2
+            for matrix, loaded_matrix in zip(network.matrix_engine.weights,
+                                             loaded.matrix_engine.weights):
+                assert np.array_equal(matrix, loaded_matrix)
+            example = [0.1, 0.5, 0.9]
+            assert np.array_equal(network.predict([example]),
+                                  loaded.predict([example]))
+            del loaded
+    print("Done!")
+
+
+if __name__ == "__main__":
+    main()
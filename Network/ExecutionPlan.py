@@ -0,0 +1,36 @@
+"""Module which describes the layers of a LayerList as flat tuples, so the
+engines can run them without walking the list or moving its cursor."""
+from typing import NamedTuple
+
+
+class ExecutionPlan(NamedTuple):
+    """
+    Immutable snapshot of the structure of a LayerList.
+
+    LayerList builds the plan on first use and keeps it until a layer is
+    inserted or removed, or a layer's weight matrix is replaced, so an
+    engine which still holds the plan it bound to holds current matrices.
+    The weights and activations are read from the Layers themselves.
+
+    Attributes:
+        layers: tuple of Layers in order from input to output
+    """
+    layers: tuple
+
+    @classmethod
+    def from_head(cls, head):
+        """
+        Builds the plan of the layers from head to the end of the list.
+
+        Args:
+            head: first Layer of a LayerList
+
+        Returns:
+            ExecutionPlan of the layers
+        """
+        layers = []
+        layer = head
+        while layer is not None:
+            layers.append(layer)
+            layer = layer.get_next()
+        return cls(tuple(layers))
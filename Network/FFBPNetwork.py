@@ -1,9 +1,17 @@
 """Module which ties together the layers and nodes into a Neural Network."""
 
+from enum import Enum
+
 import numpy as np
-import matplotlib.pyplot as plt
 from Network.NNData import NNData
 from Network.LayerList import LayerList
+from Network.LayerType import LayerType
+from Network.MatrixEngine import MatrixEngine
+from Network.Metrics import Metrics
+from Network.Loss import Loss, get_loss
+from Network.Activation import LayerActivationError, get_activation
+from Network.Initializer import DEFAULT_INITIALIZER, get_initializer
+from Network.VisualBuffer import VisualBuffer
 
 
 class FFBPNetwork:
@@ -13,17 +21,60 @@ class FFBPNetwork:
     Attributes:
         layers: Layer list initialized with input and output layers in place
                 with the number of nodes specified for each
+        engine: Engine used to run examples through the network
+        matrix_engine: MatrixEngine bound to layers, used when engine is
+                Engine.MATRIX
+        visual_buffer: VisualBuffer keeping a bounded sample of test
+                results for plot_output_comparison
 
     """
 
-    def __init__(self, num_inputs=1, num_outputs=1):
-        """Inits FFBPNetwork with all attributes initialized"""
-        self.layers = LayerList(num_inputs, num_outputs)
-        self._visualize_x = []
-        self._visualize_y_nw = []
-        self._visualize_y = []
+    class Engine(Enum):
+        """Enum which selects how examples are run through the network
+
+        Returns:
+            OBJECT: Every neurode fires and back-fires to its neighbours.
+
+            MATRIX: Each layer is evaluated with one matrix operation.
+        """
+        OBJECT = 0
+        MATRIX = 1
+
+    def __init__(self, num_inputs=1, num_outputs=1, engine=Engine.OBJECT,
+                 output_activation='sigmoid', initializer=None, seed=None,
+                 dtype=np.float64):
+        """
+        Inits FFBPNetwork with all attributes initialized
 
-    def add_hidden_layer(self, num_neurodes: int = 5):
+        Args:
+            num_inputs (int): number of input neurodes.
+            num_outputs (int): number of output neurodes.
+            engine: Engine used to run examples through the network.
+            output_activation: name of a registered activation or an
+            Activation of the output layer.
+            initializer: name of a registered initialiser ('legacy',
+            'uniform', 'xavier', 'xavier_normal', 'he', 'he_normal') or an
+            Initializer, used for every layer without one of its own. None
+            selects 'legacy' for an unseeded network and 'uniform' for a
+            seeded one.
+            seed: seed of the Generator the initialisers draw from, which
+            makes the initial weights reproducible. The 'legacy'
+            initialiser follows random.seed instead, so it raises
+            UnseededInitializerError when given a seed.
+            dtype: numpy dtype of the weights, and of the values, deltas
+            and weight updates the matrix engine calculates. np.float32
+            halves memory and memory traffic. The object engine keeps its
+            per-neurode arithmetic in Python floats.
+        """
+        self.engine = engine
+        self.check_activation(output_activation)
+        self.layers = LayerList(num_inputs, num_outputs, output_activation,
+                                initializer, seed, dtype)
+        self.matrix_engine = MatrixEngine(self.layers)
+        self.visual_buffer = VisualBuffer()
+
+    def add_hidden_layer(self, num_neurodes: int = 5, activation='sigmoid',
+                         initializer=None):
         """
         Adds a hidden neurode layer into the layers LayerList with the
         given number of neurodes initialized.
@@ -31,14 +82,53 @@ class FFBPNetwork:
         Args:
             num_neurodes (int): number of neurodes to initialize in the neural
             layer. Default value is 5.
+            activation: name of a registered activation ('sigmoid', 'tanh',
+            'relu', 'leaky_relu', 'softmax') or an Activation.
+            initializer: name of a registered initialiser or an
+            Initializer of the layer's weights, None for the network's.
         """
         if num_neurodes < 1:
             raise EmptyLayerException
         else:
-            self.layers.insert_hidden_layer(num_neurodes)
+            self.check_activation(activation)
+            self.layers.insert_hidden_layer(num_neurodes, activation,
+                                            initializer)
+
+    def check_activation(self, activation):
+        """
+        Checks that the engine can run a layer with the given activation.
+        The object engine fires one neurode at a time, so it cannot run an
+        activation which couples the whole layer, such as softmax.
+
+        Args:
+            activation: name of a registered activation or an Activation
+
+        Raises:
+            LayerActivationError: if the object engine is selected and the
+            activation needs the whole layer
+        """
+        activation = get_activation(activation)
+        if (self.engine is FFBPNetwork.Engine.OBJECT
+                and activation.jacobian_product is not None):
+            raise LayerActivationError(
+                activation.name + " needs the whole layer and cannot run on "
+                "FFBPNetwork.Engine.OBJECT; use FFBPNetwork.Engine.MATRIX")
+
+    def check_engine(self):
+        """
+        Checks that the engine can run every layer of the network, as the
+        engine may have been changed since the layers were added.
+
+        Raises:
+            LayerActivationError: if the object engine is selected and a
+            layer's activation needs the whole layer
+        """
+        for layer in self.layers.plan.layers[1:]:
+            self.check_activation(layer.activation)
 
     def train(self, data_set: NNData, epochs: int = 1000, verbosity=2,
-              order=NNData.Order.RANDOM):
+              order=NNData.Order.RANDOM, batch_size: int = 1,
+              metrics: Metrics = None, loss=None) -> float:
         """
         Runs the training data through the neural network for the given
         number of epochs.
@@ -46,18 +136,161 @@ class FFBPNetwork:
         Args:
             data_set (NNData): Object containing the training data.
             epochs (int): number of epochs to train the data.
-            verbosity: Level of print output desired
+            verbosity: Level of print output desired, used when no metrics
+            are given.
             order: Randomize, or keep data sequential.
+            batch_size (int): number of examples per weight update. Values
+            above 1 train with averaged mini-batch updates on the matrix
+            engine.
+            metrics (Metrics): where training progress is reported. Defaults
+            to printing to stdout according to verbosity. Given metrics are
+            flushed but left open, so they can span several calls.
+            loss: name of a registered loss ('mse', 'rmse',
+            'binary_cross_entropy', 'categorical_cross_entropy') or a Loss
+            whose gradient is back-propagated. None trains on the squared
+            error as before.
 
+        Returns:
+            Root mean squared error of the last epoch (float)
         """
         if data_set.x is None:
             raise EmptySetException
+        elif batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
         else:
+            if batch_size > 1:
+                def run_epoch(epoch_metrics, epoch_loss):
+                    self.run_train_batches(data_set, epoch_metrics,
+                                           batch_size, epoch_loss)
+            else:
+                self.check_engine()
+
+                def run_epoch(epoch_metrics, epoch_loss):
+                    self.run_train_data(data_set, epoch_metrics, epoch_loss)
+            return self.run_epochs(data_set, epochs, verbosity, order,
+                                   metrics, loss, run_epoch)
+
+    def train_parallel(self, data_set: NNData, epochs: int = 1000,
+                       verbosity=2, order=NNData.Order.RANDOM,
+                       batch_size: int = 256, metrics: Metrics = None,
+                       loss=None, workers: int = None) -> float:
+        """
+        Trains the network like train(), with every batch split between
+        several worker processes which calculate the weight adjustments of
+        their share of the examples. The adjustments are averaged into
+        weights held in shared memory, giving the same updates as
+        train() with the same batch_size.
+
+        Args:
+            data_set (NNData): Object containing the training data.
+            epochs (int): number of epochs to train the data.
+            verbosity: Level of print output desired, used when no metrics
+            are given.
+            order: Randomize, or keep data sequential.
+            batch_size (int): number of examples per weight update, split
+            between the workers. Larger batches leave each worker more work
+            per update.
+            metrics (Metrics): where training progress is reported.
+            loss: name of a registered loss, or None for the squared error.
+            workers (int): number of worker processes, defaults to the
+            number of CPUs.
+
+        Returns:
+            Root mean squared error of the last epoch (float)
+        """
+        if data_set.x is None:
+            raise EmptySetException
+        elif batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        else:
+            from Network.ParallelTrainer import ParallelTrainer
+            with ParallelTrainer(self, data_set, workers, loss) as trainer:
+                return self.run_epochs(
+                    data_set, epochs, verbosity, order, metrics, loss,
+                    lambda epoch_metrics, _: trainer.run_epoch(
+                        epoch_metrics, batch_size))
+
+    def train_hogwild(self, data_set: NNData, epochs: int = 1000,
+                      verbosity=2, order=NNData.Order.RANDOM,
+                      batch_size: int = 16, metrics: Metrics = None,
+                      loss=None, threads: int = None) -> float:
+        """
+        Trains the network like train(), with several threads drawing
+        batches from the training pool and updating the shared weights
+        asynchronously, without locking them (Hogwild).
+
+        Args:
+            data_set (NNData): Object containing the training data.
+            epochs (int): number of epochs to train the data.
+            verbosity: Level of print output desired, used when no metrics
+            are given.
+            order: Randomize, or keep data sequential.
+            batch_size (int): number of examples per weight update of a
+            thread.
+            metrics (Metrics): where training progress is reported.
+            loss: name of a registered loss, or None for the squared error.
+            threads (int): number of training threads, defaults to the
+            number of CPUs.
+
+        Returns:
+            Root mean squared error of the last epoch (float)
+        """
+        if data_set.x is None:
+            raise EmptySetException
+        elif batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        else:
+            from Network.HogwildTrainer import HogwildTrainer
+            with HogwildTrainer(self, data_set, threads,
+                                None if loss is None else get_loss(loss)) \
+                    as trainer:
+                return self.run_epochs(
+                    data_set, epochs, verbosity, order, metrics, loss,
+                    lambda epoch_metrics, _: trainer.run_epoch(
+                        epoch_metrics, batch_size))
+
+    def run_epochs(self, data_set: NNData, epochs: int, verbosity, order,
+                   metrics: Metrics, loss, run_epoch) -> float:
+        """
+        Helper function which primes the training pool and runs one epoch
+        of training at a time, reporting each to the metrics.
+
+        Args:
+            data_set (NNData): Object containing the training data.
+            epochs (int): number of epochs to train the data.
+            verbosity: Level of print output desired, used when no metrics
+            are given.
+            order: Randomize, or keep data sequential.
+            metrics (Metrics): where training progress is reported, None
+            to print a header and then according to verbosity.
+            loss: name of a registered loss or a Loss, or None.
+            run_epoch: function called with the metrics and the Loss, which
+            runs the primed training pool through the network.
+
+        Returns:
+            Root mean squared error of the last epoch (float)
+        """
+        own_metrics = metrics is None
+        if own_metrics:
             print("\nTraining:")
+            metrics = Metrics.from_verbosity(verbosity)
+        if loss is not None:
+            loss = get_loss(loss)
+        metrics.loss = loss
 
+        rmse = 0.0
+        try:
             for epoch in range(epochs):
                 data_set.prime_data(NNData.Set.TRAIN, order)
-                self.run_train_data(data_set, verbosity, epoch)
+                metrics.start_epoch(epoch)
+                run_epoch(metrics, loss)
+                rmse = metrics.end_epoch()
+        finally:
+            if own_metrics:
+                metrics.close()
+            else:
+                metrics.flush()
+        return rmse
 
     def test(self, data_set: NNData, order=NNData.Order.RANDOM, one_hot=0):
         """
@@ -72,11 +305,129 @@ class FFBPNetwork:
         if data_set.y is None:
             raise EmptySetException
         else:
+            self.check_engine()
             print("\nTesting:")
             data_set.prime_data(NNData.Set.TEST, order)
             rmse = self.run_test_data(data_set, one_hot)
             print("Final RMSE:", rmse)
 
+    def profile(self):
+        """
+        Instruments the network for as long as the returned Profiler is
+        active, recording per-layer forward and backward time, call counts,
+        data access time and samples per second of each epoch:
+
+            with network.profile() as profiler:
+                network.train(data_set, 10)
+            report = profiler.report()
+
+        Training without a Profiler runs uninstrumented code. Trainings
+        which evaluate on other processes or threads are not recorded.
+
+        Returns:
+            Profiler of this network, not yet active
+        """
+        from Network.Profiler import Profiler
+        return Profiler(self)
+
+    def predict(self, data, batch_size: int = 4096) -> np.ndarray:
+        """
+        Runs examples through the network and returns the outputs, without
+        printing, priming data pools or recording visualisation data.
+
+        Args:
+            data: 2-D array or list of rows of input values, one row per
+            example
+            batch_size (int): number of rows evaluated at a time
+
+        Returns:
+            2-D array of output values, one row per example
+        """
+        data = np.asarray(data, dtype=self.layers.dtype)
+        if data.ndim != 2 or data.shape[1] != len(
+                self.layers.get_input_nodes()):
+            raise ValueError("data must have one row per example and one "
+                             "column per input neurode")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        return self.matrix_engine.predict(data, batch_size)
+
+    def save(self, path: str):
+        """
+        Saves the topology and every weight of the network to a binary
+        checkpoint file.
+
+        Args:
+            path: path of the checkpoint file to write
+        """
+        self.matrix_engine.ensure_bound()
+        layers = self.matrix_engine.get_layers()
+        header = {'engine': self.engine.name,
+                  'dtype': self.layers.dtype.str,
+                  'initializer': self.layers.initializer.name,
+                  'layers': [{'type': layer.my_type.name,
+                              'neurodes': len(layer.neurodes),
+                              'activation': layer.activation.name,
+                              'initializer': None
+                              if layer.initializer is None
+                              else layer.initializer.name}
+                             for layer in layers]}
+        learning_rates = [np.array([node.learning_rate
+                                    for node in layer.neurodes])
+                          for layer in layers[1:]]
+        arrays = self.matrix_engine.weights + learning_rates
+        from Network.Checkpoint import write_checkpoint
+        write_checkpoint(path, header, arrays)
+
+    @classmethod
+    def load(cls, path: str, mmap_mode='c'):
+        """
+        Rebuilds a network saved by save().
+
+        The weights are memory-mapped from the file, so they are only read
+        from disk as they are used.
+
+        Args:
+            path: path of the checkpoint file to read
+            mmap_mode: numpy.memmap mode of the weights. The default 'c'
+              maps them copy-on-write, so training the loaded network does
+              not change the file. None reads them into memory.
+
+        Returns:
+            FFBPNetwork with the saved layers and weights
+        """
+        from Network.Checkpoint import read_checkpoint
+        header, arrays = read_checkpoint(path, mmap_mode)
+        layers = header['layers']
+        # The weights drawn while rebuilding are replaced by the saved ones,
+        # so draw them the cheap way and restore the initialisers after.
+        network = cls(layers[0]['neurodes'], layers[-1]['neurodes'],
+                      cls.Engine[header['engine']],
+                      layers[-1]['activation'], 'uniform',
+                      dtype=np.dtype(header.get('dtype', '<f8')))
+
+        network.reset_cur()
+        for layer in layers[1:-1]:
+            if LayerType[layer['type']] is not LayerType.HIDDEN:
+                raise CheckpointLayerError(layer['type'])
+            network.add_hidden_layer(layer['neurodes'], layer['activation'])
+            network.iterate()
+        network.layers.initializer = get_initializer(
+            header.get('initializer', DEFAULT_INITIALIZER))
+        for layer, saved in zip(network.matrix_engine.get_layers(), layers):
+            if saved.get('initializer') is not None:
+                layer.initializer = get_initializer(saved['initializer'])
+
+        weights = arrays[:len(layers) - 1]
+        learning_rates = arrays[len(layers) - 1:]
+        for layer, rates in zip(network.matrix_engine.get_layers()[1:],
+                                learning_rates):
+            for node, rate in zip(layer.neurodes, rates.tolist()):
+                node.learning_rate = rate
+        network.matrix_engine.bind(weights)
+        network.reset_cur()
+        return network
+
     def iterate(self):
         """
         This function iterates the current pointer to the next
@@ -113,55 +464,73 @@ class FFBPNetwork:
         Args:
             data (list): example data to send to the input layer nodes.
         """
+        if self.engine is FFBPNetwork.Engine.MATRIX:
+            self.matrix_engine.forward(data)
+            return
+
         list_of_inputs = self.layers.get_input_nodes()
 
         for index, node in enumerate(list_of_inputs):
             node.receive_input(None, data[index])
 
-    def send_data_to_outputs(self, data):
+    def send_data_to_outputs(self, data, loss: Loss = None):
         """
-        Helper function. Sends label data to the output nodes, iterating
-        through each node and data value, if there is more than one value
-        for the label data. The nodes then perform the back-propagation
-        through the network with the expected values given from the label data.
+        Helper function. Sends label data to the output layer and
+        back-propagates the expected values through the network, one layer
+        at a time from the output layer to the input layer.
 
         Args:
             data (list): example data to send to the output layer nodes.
+            loss (Loss): loss whose gradient is back-propagated, None for
+            the squared error.
         """
-        list_of_outputs = self.layers.get_output_nodes()
+        if self.engine is FFBPNetwork.Engine.MATRIX:
+            self.matrix_engine.backward(data, loss)
+            return
 
-        for index, node in enumerate(list_of_outputs):
-            node.receive_back_input(None, data[index])
+        self.layers.back_propagate(data, loss)
 
-    def run_train_data(self, epoch_data: NNData, verbosity, epoch):
+    def run_train_data(self, epoch_data: NNData, metrics: Metrics,
+                       loss: Loss = None):
         """
-        Helper function. Sends input data to the input layer, calculates
-        the error from the output nodes against the expected values,
-        and then sends the expected values to the output nodes to backprop
-        through the network.
+        Helper function. Sends input data to the input layer, records
+        the outputs against the expected values, and then sends the
+        expected values to the output nodes to backprop through the network.
 
         Args:
             epoch_data (NNData): Object containing the data set.
-            verbosity: how often to print epoch details
-            epoch: current epoch
-
-        Returns:
-            The root mean squared error of the epoch. (float)
+            metrics (Metrics): running statistics of the epoch
+            loss (Loss): loss whose gradient is back-propagated, None for
+            the squared error.
         """
-        error = 0
         size = epoch_data.get_number_samples(NNData.Set.TRAIN)
-        outputs = []
-        labels = []
         for _ in range(size):
             single_data = epoch_data.get_one_item(NNData.Set.TRAIN)
 
             self.send_data_to_inputs(single_data[0])
-            error += self.calculate_error(single_data[1])
-            self.send_data_to_outputs(single_data[1])
-            outputs.append(self.collect_outputs())
-            labels.append(single_data[1])
-        self.print_training_data(verbosity, epoch, outputs, labels,
-                                 self.calculate_rmse(size, error))
+            metrics.update(self.collect_outputs(), single_data[1])
+            self.send_data_to_outputs(single_data[1], loss)
+
+    def run_train_batches(self, epoch_data: NNData, metrics: Metrics,
+                          batch_size: int, loss: Loss = None):
+        """
+        Helper function. Draws batch_size examples at a time from the
+        training pool, runs them forward through the matrix engine as one
+        batch, and applies one averaged weight update per batch.
+
+        Args:
+            epoch_data (NNData): Object containing the data set.
+            metrics (Metrics): running statistics of the epoch
+            batch_size (int): number of examples per weight update
+            loss (Loss): loss whose gradient is back-propagated, None for
+            the squared error.
+        """
+        while not epoch_data.empty_pool(NNData.Set.TRAIN):
+            batch = epoch_data.get_batch(NNData.Set.TRAIN, batch_size)
+
+            batch_outputs = self.matrix_engine.forward_batch(batch[0])
+            metrics.update_batch(batch_outputs, batch[1])
+            self.matrix_engine.backward_batch(batch[1], loss)
 
     def run_test_data(self, epoch_data: NNData, one_hot=0) -> float:
         """
@@ -182,12 +551,9 @@ class FFBPNetwork:
         for _ in range(size):
             single_data = epoch_data.get_one_item(NNData.Set.TEST)
             self.send_data_to_inputs(single_data[0])
-            self._visualize_x.append(single_data[0])
-            self._visualize_y_nw.append(self.collect_outputs(one_hot))
-            self._visualize_y.append(single_data[1])
-            self.print_testing_data(single_data[0],
-                                    self.collect_outputs(one_hot),
-                                    single_data[1])
+            output = self.collect_outputs(one_hot)
+            self.visual_buffer.add(single_data[0], output, single_data[1])
+            self.print_testing_data(single_data[0], output, single_data[1])
             error += self.calculate_error(single_data[1])
         return self.calculate_rmse(size, error)
 
@@ -221,9 +587,8 @@ class FFBPNetwork:
         return output_data
 
     def _clear_vis(self):
-        """Resets the two lists which hold the visualize data"""
-        self._visualize_x = []
-        self._visualize_y = []
+        """Forgets the test results which hold the visualize data"""
+        self.visual_buffer.clear()
 
     # Math Functions ----------------------------------------------------------
     def calculate_error(self, labels):
@@ -236,17 +601,12 @@ class FFBPNetwork:
             values from output nodes.
 
         Returns:
-            calculates the squared error of the output nodes
+            mean squared error of the output nodes
 
         """
-        outputs = self.layers.get_output_nodes()
-        size = outputs.__sizeof__()
-        total_error = 0
-        for index, node in enumerate(outputs):
-            value = node.value
-            error = value - labels[index]
-            total_error += np.power(error, 2)
-        return total_error / size
+        outputs = np.array(self.collect_outputs(), dtype=np.float64)
+        return float(get_loss('mse').function(
+            outputs, np.asarray(labels, dtype=np.float64)))
 
     @staticmethod
     def calculate_rmse(size: int, squared_error: float) -> float:
@@ -264,38 +624,6 @@ class FFBPNetwork:
         return np.sqrt(squared_error / size)
 
     # Print Functions ---------------------------------------------------------
-    @staticmethod
-    def print_training_data(verbosity, epoch, output: list,
-                            label: list, rmse=0.0):
-        """
-        This function prints out observed values and expected values of the
-        outputs every 1000 epochs, and prints out the epoch number and RMSE
-        values every 100 epochs.
-
-        Args:
-            verbosity: if this value is less than 1, it will not print the
-            label data. If this value is less than 0 it will print nothing
-            epoch: current epoch
-            output: list of output values
-            label: list of label values
-            rmse: root mean squared error
-
-        Returns:
-            Formatted output string of [output, label] data, and RMSE
-
-        """
-
-        if verbosity > 1 and epoch % 1000 == 0:
-            ret_string = '['
-            for i in range(len(output)):
-                ret_string += str(output[i])
-                ret_string += ', '
-                ret_string += str(label[i])
-                ret_string += ']\n'
-            print(ret_string)
-        if verbosity > 0 and epoch % 100 == 0:
-            print("Epoch: ", epoch, "RMSE: ", rmse)
-
     @staticmethod
     def print_testing_data(input_values, output, label_data):
         """
@@ -324,20 +652,25 @@ class FFBPNetwork:
 
     def plot_output_comparison(self, scatter=0, plot=0):
         """
-        Uses matplotlib to visualize the testing data
+        Uses matplotlib to visualize the testing data. matplotlib is
+        imported on the first call, so networks which never plot do not
+        pay for it.
 
         """
+        import matplotlib.pyplot as plt
+
         plt.ylim(top=2)
         plt.ylim(bottom=0)
         plt.xlim(left=0)
         plt.xlim(right=2)
         plt.xlim()
+        x, y_nw, y = self.visual_buffer.get_rows()
         if scatter == 1:
-            plt.scatter(self._visualize_x, self._visualize_y, color='r')
-            plt.scatter(self._visualize_x, self._visualize_y_nw, color='g')
+            plt.scatter(x, y, color='r')
+            plt.scatter(x, y_nw, color='g')
         else:
-            plt.plot(self._visualize_x, self._visualize_y, color='r')
-            plt.plot(self._visualize_x, self._visualize_y_nw, color='g')
+            plt.plot(x, y, color='r')
+            plt.plot(x, y_nw, color='g')
         plt.show()
         self._clear_vis()
 
@@ -346,169 +679,306 @@ class EmptyLayerException(Exception):
     """Layer is empty"""
 
 
+class CheckpointLayerError(Exception):
+    """Checkpoint has an input or output layer between hidden layers"""
+
+
 class EmptySetException(Exception):
     """Data set is empty"""
 
 
+def xor_data() -> tuple:
+    """
+    XOR data set used by main().
+
+    Returns:
+        tuple of the examples and the labels, lists of lists
+    """
+    XORx = [[0, 0], [1, 0], [0, 1], [1, 1]]
+    XORy = [[0], [1], [1], [0]]
+    return XORx, XORy
+
+
+def sin_data() -> tuple:
+    """
+    sin(x) data set on [0, 1.57] used by main().
+
+    Returns:
+        tuple of the examples and the labels, lists of lists
+    """
+    sin_X = [[0], [0.01], [0.02], [0.03], [0.04], [0.05], [0.06], [0.07],
+             [0.08], [0.09], [0.1], [0.11], [0.12],
+             [0.13], [0.14], [0.15], [0.16], [0.17], [0.18], [0.19], [0.2],
+             [0.21], [0.22], [0.23], [0.24], [0.25],
+             [0.26], [0.27], [0.28], [0.29], [0.3], [0.31], [0.32], [0.33],
+             [0.34], [0.35], [0.36], [0.37], [0.38],
+             [0.39], [0.4], [0.41], [0.42], [0.43], [0.44], [0.45], [0.46],
+             [0.47], [0.48], [0.49], [0.5], [0.51],
+             [0.52], [0.53], [0.54], [0.55], [0.56], [0.57], [0.58],
+             [0.59],
+             [0.6], [0.61], [0.62], [0.63], [0.64],
+             [0.65], [0.66], [0.67], [0.68], [0.69], [0.7], [0.71], [0.72],
+             [0.73], [0.74], [0.75], [0.76], [0.77],
+             [0.78], [0.79], [0.8], [0.81], [0.82], [0.83], [0.84], [0.85],
+             [0.86], [0.87], [0.88], [0.89], [0.9],
+             [0.91], [0.92], [0.93], [0.94], [0.95], [0.96], [0.97],
+             [0.98],
+             [0.99], [1], [1.01], [1.02], [1.03],
+             [1.04], [1.05], [1.06], [1.07], [1.08], [1.09], [1.1], [1.11],
+             [1.12], [1.13], [1.14], [1.15], [1.16],
+             [1.17], [1.18], [1.19], [1.2], [1.21], [1.22], [1.23], [1.24],
+             [1.25], [1.26], [1.27], [1.28], [1.29],
+             [1.3], [1.31], [1.32], [1.33], [1.34], [1.35], [1.36], [1.37],
+             [1.38], [1.39], [1.4], [1.41], [1.42],
+             [1.43], [1.44], [1.45], [1.46], [1.47], [1.48], [1.49], [1.5],
+             [1.51], [1.52], [1.53], [1.54], [1.55],
+             [1.56], [1.57]]
+    sin_Y = [[0], [0.00999983333416666], [0.0199986666933331],
+             [0.0299955002024957], [0.0399893341866342],
+             [0.0499791692706783], [0.0599640064794446],
+             [0.0699428473375328],
+             [0.0799146939691727],
+             [0.089878549198011], [0.0998334166468282],
+             [0.109778300837175],
+             [0.119712207288919],
+             [0.129634142619695], [0.139543114644236], [0.149438132473599],
+             [0.159318206614246],
+             [0.169182349066996], [0.179029573425824], [0.188858894976501],
+             [0.198669330795061], [0.2084598998461],
+             [0.218229623080869], [0.227977523535188], [0.237702626427135],
+             [0.247403959254523],
+             [0.257080551892155], [0.266731436688831], [0.276355648564114],
+             [0.285952225104836], [0.29552020666134],
+             [0.305058636443443], [0.314566560616118], [0.324043028394868],
+             [0.333487092140814],
+             [0.342897807455451], [0.35227423327509], [0.361615431964962],
+             [0.370920469412983], [0.380188415123161],
+             [0.389418342308651], [0.398609327984423], [0.40776045305957],
+             [0.416870802429211], [0.425939465066],
+             [0.43496553411123], [0.44394810696552], [0.452886285379068],
+             [0.461779175541483], [0.470625888171158],
+             [0.479425538604203], [0.488177246882907], [0.496880137843737],
+             [0.505533341204847],
+             [0.514135991653113], [0.522687228930659], [0.531186197920883],
+             [0.539632048733969],
+             [0.548023936791874], [0.556361022912784], [0.564642473395035],
+             [0.572867460100481],
+             [0.581035160537305], [0.58914475794227], [0.597195441362392],
+             [0.60518640573604], [0.613116851973434],
+             [0.62098598703656], [0.628793024018469], [0.636537182221968],
+             [0.644217687237691], [0.651833771021537],
+             [0.659384671971473], [0.666869635003698], [0.674287911628145],
+             [0.681638760023334],
+             [0.688921445110551], [0.696135238627357], [0.70327941920041],
+             [0.710353272417608], [0.717356090899523],
+             [0.724287174370143], [0.731145829726896], [0.737931371109963],
+             [0.744643119970859],
+             [0.751280405140293], [0.757842562895277], [0.764328937025505],
+             [0.770738878898969],
+             [0.777071747526824], [0.783326909627483], [0.78950373968995],
+             [0.795601620036366], [0.801619940883777],
+             [0.807558100405114], [0.813415504789374], [0.819191568300998],
+             [0.82488571333845], [0.83049737049197],
+             [0.836025978600521], [0.841470984807897], [0.846831844618015],
+             [0.852108021949363],
+             [0.857298989188603], [0.862404227243338], [0.867423225594017],
+             [0.872355482344986],
+             [0.877200504274682], [0.881957806884948], [0.886626914449487],
+             [0.891207360061435],
+             [0.895698685680048], [0.900100442176505], [0.904412189378826],
+             [0.908633496115883],
+             [0.912763940260521], [0.916803108771767], [0.920750597736136],
+             [0.92460601240802], [0.928368967249167],
+             [0.932039085967226], [0.935616001553386], [0.939099356319068],
+             [0.942488801931697],
+             [0.945783999449539], [0.948984619355586], [0.952090341590516],
+             [0.955100855584692],
+             [0.958015860289225], [0.960835064206073], [0.963558185417193],
+             [0.966184951612734],
+             [0.968715100118265], [0.971148377921045], [0.973484541695319],
+             [0.975723357826659],
+             [0.977864602435316], [0.979908061398614], [0.98185353037236],
+             [0.983700814811277], [0.98544972998846],
+             [0.98710010101385], [0.98865176285172], [0.990104560337178],
+             [0.991458348191686], [0.992712991037588],
+             [0.993868363411645], [0.994924349777581], [0.99588084453764],
+             [0.996737752043143], [0.997494986604054],
+             [0.998152472497548], [0.998710143975583], [0.999167945271476],
+             [0.999525830605479],
+             [0.999783764189357], [0.999941720229966], [0.999999682931835]]
+    return sin_X, sin_Y
+
+
+def iris_data() -> tuple:
+    """
+    Iris data set used by main(), with one-hot labels.
+
+    Returns:
+        tuple of the examples and the labels, lists of lists
+    """
+    Iris_X = [[5.1, 3.5, 1.4, 0.2], [4.9, 3, 1.4, 0.2],
+              [4.7, 3.2, 1.3, 0.2],
+              [4.6, 3.1, 1.5, 0.2],
+              [5, 3.6, 1.4, 0.2], [5.4, 3.9, 1.7, 0.4],
+              [4.6, 3.4, 1.4, 0.3],
+              [5, 3.4, 1.5, 0.2],
+              [4.4, 2.9, 1.4, 0.2], [4.9, 3.1, 1.5, 0.1],
+              [5.4, 3.7, 1.5, 0.2],
+              [4.8, 3.4, 1.6, 0.2],
+              [4.8, 3, 1.4, 0.1], [4.3, 3, 1.1, 0.1], [5.8, 4, 1.2, 0.2],
+              [5.7, 4.4, 1.5, 0.4],
+              [5.4, 3.9, 1.3, 0.4], [5.1, 3.5, 1.4, 0.3],
+              [5.7, 3.8, 1.7, 0.3],
+              [5.1, 3.8, 1.5, 0.3],
+              [5.4, 3.4, 1.7, 0.2], [5.1, 3.7, 1.5, 0.4],
+              [4.6, 3.6, 1, 0.2],
+              [5.1, 3.3, 1.7, 0.5],
+              [4.8, 3.4, 1.9, 0.2], [5, 3, 1.6, 0.2], [5, 3.4, 1.6, 0.4],
+              [5.2, 3.5, 1.5, 0.2],
+              [5.2, 3.4, 1.4, 0.2], [4.7, 3.2, 1.6, 0.2],
+              [4.8, 3.1, 1.6, 0.2],
+              [5.4, 3.4, 1.5, 0.4],
+              [5.2, 4.1, 1.5, 0.1], [5.5, 4.2, 1.4, 0.2],
+              [4.9, 3.1, 1.5, 0.1],
+              [5, 3.2, 1.2, 0.2],
+              [5.5, 3.5, 1.3, 0.2], [4.9, 3.1, 1.5, 0.1],
+              [4.4, 3, 1.3, 0.2],
+              [5.1, 3.4, 1.5, 0.2],
+              [5, 3.5, 1.3, 0.3], [4.5, 2.3, 1.3, 0.3],
+              [4.4, 3.2, 1.3, 0.2],
+              [5, 3.5, 1.6, 0.6],
+              [5.1, 3.8, 1.9, 0.4], [4.8, 3, 1.4, 0.3],
+              [5.1, 3.8, 1.6, 0.2],
+              [4.6, 3.2, 1.4, 0.2],
+              [5.3, 3.7, 1.5, 0.2], [5, 3.3, 1.4, 0.2], [7, 3.2, 4.7, 1.4],
+              [6.4, 3.2, 4.5, 1.5],
+              [6.9, 3.1, 4.9, 1.5], [5.5, 2.3, 4, 1.3],
+              [6.5, 2.8, 4.6, 1.5],
+              [5.7, 2.8, 4.5, 1.3],
+              [6.3, 3.3, 4.7, 1.6], [4.9, 2.4, 3.3, 1],
+              [6.6, 2.9, 4.6, 1.3],
+              [5.2, 2.7, 3.9, 1.4], [5, 2, 3.5, 1],
+              [5.9, 3, 4.2, 1.5], [6, 2.2, 4, 1], [6.1, 2.9, 4.7, 1.4],
+              [5.6, 2.9, 3.6, 1.3], [6.7, 3.1, 4.4, 1.4],
+              [5.6, 3, 4.5, 1.5], [5.8, 2.7, 4.1, 1], [6.2, 2.2, 4.5, 1.5],
+              [5.6, 2.5, 3.9, 1.1],
+              [5.9, 3.2, 4.8, 1.8], [6.1, 2.8, 4, 1.3],
+              [6.3, 2.5, 4.9, 1.5],
+              [6.1, 2.8, 4.7, 1.2],
+              [6.4, 2.9, 4.3, 1.3], [6.6, 3, 4.4, 1.4],
+              [6.8, 2.8, 4.8, 1.4],
+              [6.7, 3, 5, 1.7], [6, 2.9, 4.5, 1.5],
+              [5.7, 2.6, 3.5, 1], [5.5, 2.4, 3.8, 1.1], [5.5, 2.4, 3.7, 1],
+              [5.8, 2.7, 3.9, 1.2],
+              [6, 2.7, 5.1, 1.6], [5.4, 3, 4.5, 1.5], [6, 3.4, 4.5, 1.6],
+              [6.7, 3.1, 4.7, 1.5],
+              [6.3, 2.3, 4.4, 1.3], [5.6, 3, 4.1, 1.3], [5.5, 2.5, 4, 1.3],
+              [5.5, 2.6, 4.4, 1.2],
+              [6.1, 3, 4.6, 1.4], [5.8, 2.6, 4, 1.2], [5, 2.3, 3.3, 1],
+              [5.6, 2.7, 4.2, 1.3], [5.7, 3, 4.2, 1.2],
+              [5.7, 2.9, 4.2, 1.3], [6.2, 2.9, 4.3, 1.3],
+              [5.1, 2.5, 3, 1.1],
+              [5.7, 2.8, 4.1, 1.3],
+              [6.3, 3.3, 6, 2.5], [5.8, 2.7, 5.1, 1.9], [7.1, 3, 5.9, 2.1],
+              [6.3, 2.9, 5.6, 1.8],
+              [6.5, 3, 5.8, 2.2], [7.6, 3, 6.6, 2.1], [4.9, 2.5, 4.5, 1.7],
+              [7.3, 2.9, 6.3, 1.8],
+              [6.7, 2.5, 5.8, 1.8], [7.2, 3.6, 6.1, 2.5],
+              [6.5, 3.2, 5.1, 2],
+              [6.4, 2.7, 5.3, 1.9],
+              [6.8, 3, 5.5, 2.1], [5.7, 2.5, 5, 2], [5.8, 2.8, 5.1, 2.4],
+              [6.4, 3.2, 5.3, 2.3], [6.5, 3, 5.5, 1.8],
+              [7.7, 3.8, 6.7, 2.2], [7.7, 2.6, 6.9, 2.3], [6, 2.2, 5, 1.5],
+              [6.9, 3.2, 5.7, 2.3],
+              [5.6, 2.8, 4.9, 2], [7.7, 2.8, 6.7, 2], [6.3, 2.7, 4.9, 1.8],
+              [6.7, 3.3, 5.7, 2.1],
+              [7.2, 3.2, 6, 1.8], [6.2, 2.8, 4.8, 1.8], [6.1, 3, 4.9, 1.8],
+              [6.4, 2.8, 5.6, 2.1],
+              [7.2, 3, 5.8, 1.6], [7.4, 2.8, 6.1, 1.9], [7.9, 3.8, 6.4, 2],
+              [6.4, 2.8, 5.6, 2.2],
+              [6.3, 2.8, 5.1, 1.5], [6.1, 2.6, 5.6, 1.4],
+              [7.7, 3, 6.1, 2.3],
+              [6.3, 3.4, 5.6, 2.4],
+              [6.4, 3.1, 5.5, 1.8], [6, 3, 4.8, 1.8], [6.9, 3.1, 5.4, 2.1],
+              [6.7, 3.1, 5.6, 2.4],
+              [6.9, 3.1, 5.1, 2.3], [5.8, 2.7, 5.1, 1.9],
+              [6.8, 3.2, 5.9, 2.3],
+              [6.7, 3.3, 5.7, 2.5],
+              [6.7, 3, 5.2, 2.3], [6.3, 2.5, 5, 1.9], [6.5, 3, 5.2, 2],
+              [6.2, 3.4, 5.4, 2.3], [5.9, 3, 5.1, 1.8]]
+    Iris_Y = [[1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ],
+              [1, 0, 0, ],
+              [1, 0, 0, ], [1, 0, 0, ],
+              [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ],
+              [1, 0, 0, ],
+              [1, 0, 0, ], [1, 0, 0, ],
+              [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ],
+              [1, 0, 0, ],
+              [1, 0, 0, ], [1, 0, 0, ],
+              [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ],
+              [1, 0, 0, ],
+              [1, 0, 0, ], [1, 0, 0, ],
+              [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ],
+              [1, 0, 0, ],
+              [1, 0, 0, ], [1, 0, 0, ],
+              [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ],
+              [1, 0, 0, ],
+              [1, 0, 0, ], [1, 0, 0, ],
+              [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ],
+              [1, 0, 0, ],
+              [1, 0, 0, ], [1, 0, 0, ],
+              [1, 0, 0, ], [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ],
+              [0, 1, 0, ],
+              [0, 1, 0, ], [0, 1, 0, ],
+              [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ],
+              [0, 1, 0, ],
+              [0, 1, 0, ], [0, 1, 0, ],
+              [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ],
+              [0, 1, 0, ],
+              [0, 1, 0, ], [0, 1, 0, ],
+              [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ],
+              [0, 1, 0, ],
+              [0, 1, 0, ], [0, 1, 0, ],
+              [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ],
+              [0, 1, 0, ],
+              [0, 1, 0, ], [0, 1, 0, ],
+              [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ],
+              [0, 1, 0, ],
+              [0, 1, 0, ], [0, 1, 0, ],
+              [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ],
+              [0, 1, 0, ],
+              [0, 1, 0, ], [0, 1, 0, ],
+              [0, 1, 0, ], [0, 1, 0, ], [0, 0, 1, ], [0, 0, 1, ],
+              [0, 0, 1, ],
+              [0, 0, 1, ], [0, 0, 1, ],
+              [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ],
+              [0, 0, 1, ],
+              [0, 0, 1, ], [0, 0, 1, ],
+              [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ],
+              [0, 0, 1, ],
+              [0, 0, 1, ], [0, 0, 1, ],
+              [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ],
+              [0, 0, 1, ],
+              [0, 0, 1, ], [0, 0, 1, ],
+              [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ],
+              [0, 0, 1, ],
+              [0, 0, 1, ], [0, 0, 1, ],
+              [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ],
+              [0, 0, 1, ],
+              [0, 0, 1, ], [0, 0, 1, ],
+              [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ],
+              [0, 0, 1, ],
+              [0, 0, 1, ], [0, 0, 1, ],
+              [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ]]
+    return Iris_X, Iris_Y
+
+
 def main():
     def run_iris():
         network = FFBPNetwork(4, 3)
         network.add_hidden_layer(6)
 
-        Iris_X = [[5.1, 3.5, 1.4, 0.2], [4.9, 3, 1.4, 0.2],
-                  [4.7, 3.2, 1.3, 0.2],
-                  [4.6, 3.1, 1.5, 0.2],
-                  [5, 3.6, 1.4, 0.2], [5.4, 3.9, 1.7, 0.4],
-                  [4.6, 3.4, 1.4, 0.3],
-                  [5, 3.4, 1.5, 0.2],
-                  [4.4, 2.9, 1.4, 0.2], [4.9, 3.1, 1.5, 0.1],
-                  [5.4, 3.7, 1.5, 0.2],
-                  [4.8, 3.4, 1.6, 0.2],
-                  [4.8, 3, 1.4, 0.1], [4.3, 3, 1.1, 0.1], [5.8, 4, 1.2, 0.2],
-                  [5.7, 4.4, 1.5, 0.4],
-                  [5.4, 3.9, 1.3, 0.4], [5.1, 3.5, 1.4, 0.3],
-                  [5.7, 3.8, 1.7, 0.3],
-                  [5.1, 3.8, 1.5, 0.3],
-                  [5.4, 3.4, 1.7, 0.2], [5.1, 3.7, 1.5, 0.4],
-                  [4.6, 3.6, 1, 0.2],
-                  [5.1, 3.3, 1.7, 0.5],
-                  [4.8, 3.4, 1.9, 0.2], [5, 3, 1.6, 0.2], [5, 3.4, 1.6, 0.4],
-                  [5.2, 3.5, 1.5, 0.2],
-                  [5.2, 3.4, 1.4, 0.2], [4.7, 3.2, 1.6, 0.2],
-                  [4.8, 3.1, 1.6, 0.2],
-                  [5.4, 3.4, 1.5, 0.4],
-                  [5.2, 4.1, 1.5, 0.1], [5.5, 4.2, 1.4, 0.2],
-                  [4.9, 3.1, 1.5, 0.1],
-                  [5, 3.2, 1.2, 0.2],
-                  [5.5, 3.5, 1.3, 0.2], [4.9, 3.1, 1.5, 0.1],
-                  [4.4, 3, 1.3, 0.2],
-                  [5.1, 3.4, 1.5, 0.2],
-                  [5, 3.5, 1.3, 0.3], [4.5, 2.3, 1.3, 0.3],
-                  [4.4, 3.2, 1.3, 0.2],
-                  [5, 3.5, 1.6, 0.6],
-                  [5.1, 3.8, 1.9, 0.4], [4.8, 3, 1.4, 0.3],
-                  [5.1, 3.8, 1.6, 0.2],
-                  [4.6, 3.2, 1.4, 0.2],
-                  [5.3, 3.7, 1.5, 0.2], [5, 3.3, 1.4, 0.2], [7, 3.2, 4.7, 1.4],
-                  [6.4, 3.2, 4.5, 1.5],
-                  [6.9, 3.1, 4.9, 1.5], [5.5, 2.3, 4, 1.3],
-                  [6.5, 2.8, 4.6, 1.5],
-                  [5.7, 2.8, 4.5, 1.3],
-                  [6.3, 3.3, 4.7, 1.6], [4.9, 2.4, 3.3, 1],
-                  [6.6, 2.9, 4.6, 1.3],
-                  [5.2, 2.7, 3.9, 1.4], [5, 2, 3.5, 1],
-                  [5.9, 3, 4.2, 1.5], [6, 2.2, 4, 1], [6.1, 2.9, 4.7, 1.4],
-                  [5.6, 2.9, 3.6, 1.3], [6.7, 3.1, 4.4, 1.4],
-                  [5.6, 3, 4.5, 1.5], [5.8, 2.7, 4.1, 1], [6.2, 2.2, 4.5, 1.5],
-                  [5.6, 2.5, 3.9, 1.1],
-                  [5.9, 3.2, 4.8, 1.8], [6.1, 2.8, 4, 1.3],
-                  [6.3, 2.5, 4.9, 1.5],
-                  [6.1, 2.8, 4.7, 1.2],
-                  [6.4, 2.9, 4.3, 1.3], [6.6, 3, 4.4, 1.4],
-                  [6.8, 2.8, 4.8, 1.4],
-                  [6.7, 3, 5, 1.7], [6, 2.9, 4.5, 1.5],
-                  [5.7, 2.6, 3.5, 1], [5.5, 2.4, 3.8, 1.1], [5.5, 2.4, 3.7, 1],
-                  [5.8, 2.7, 3.9, 1.2],
-                  [6, 2.7, 5.1, 1.6], [5.4, 3, 4.5, 1.5], [6, 3.4, 4.5, 1.6],
-                  [6.7, 3.1, 4.7, 1.5],
-                  [6.3, 2.3, 4.4, 1.3], [5.6, 3, 4.1, 1.3], [5.5, 2.5, 4, 1.3],
-                  [5.5, 2.6, 4.4, 1.2],
-                  [6.1, 3, 4.6, 1.4], [5.8, 2.6, 4, 1.2], [5, 2.3, 3.3, 1],
-                  [5.6, 2.7, 4.2, 1.3], [5.7, 3, 4.2, 1.2],
-                  [5.7, 2.9, 4.2, 1.3], [6.2, 2.9, 4.3, 1.3],
-                  [5.1, 2.5, 3, 1.1],
-                  [5.7, 2.8, 4.1, 1.3],
-                  [6.3, 3.3, 6, 2.5], [5.8, 2.7, 5.1, 1.9], [7.1, 3, 5.9, 2.1],
-                  [6.3, 2.9, 5.6, 1.8],
-                  [6.5, 3, 5.8, 2.2], [7.6, 3, 6.6, 2.1], [4.9, 2.5, 4.5, 1.7],
-                  [7.3, 2.9, 6.3, 1.8],
-                  [6.7, 2.5, 5.8, 1.8], [7.2, 3.6, 6.1, 2.5],
-                  [6.5, 3.2, 5.1, 2],
-                  [6.4, 2.7, 5.3, 1.9],
-                  [6.8, 3, 5.5, 2.1], [5.7, 2.5, 5, 2], [5.8, 2.8, 5.1, 2.4],
-                  [6.4, 3.2, 5.3, 2.3], [6.5, 3, 5.5, 1.8],
-                  [7.7, 3.8, 6.7, 2.2], [7.7, 2.6, 6.9, 2.3], [6, 2.2, 5, 1.5],
-                  [6.9, 3.2, 5.7, 2.3],
-                  [5.6, 2.8, 4.9, 2], [7.7, 2.8, 6.7, 2], [6.3, 2.7, 4.9, 1.8],
-                  [6.7, 3.3, 5.7, 2.1],
-                  [7.2, 3.2, 6, 1.8], [6.2, 2.8, 4.8, 1.8], [6.1, 3, 4.9, 1.8],
-                  [6.4, 2.8, 5.6, 2.1],
-                  [7.2, 3, 5.8, 1.6], [7.4, 2.8, 6.1, 1.9], [7.9, 3.8, 6.4, 2],
-                  [6.4, 2.8, 5.6, 2.2],
-                  [6.3, 2.8, 5.1, 1.5], [6.1, 2.6, 5.6, 1.4],
-                  [7.7, 3, 6.1, 2.3],
-                  [6.3, 3.4, 5.6, 2.4],
-                  [6.4, 3.1, 5.5, 1.8], [6, 3, 4.8, 1.8], [6.9, 3.1, 5.4, 2.1],
-                  [6.7, 3.1, 5.6, 2.4],
-                  [6.9, 3.1, 5.1, 2.3], [5.8, 2.7, 5.1, 1.9],
-                  [6.8, 3.2, 5.9, 2.3],
-                  [6.7, 3.3, 5.7, 2.5],
-                  [6.7, 3, 5.2, 2.3], [6.3, 2.5, 5, 1.9], [6.5, 3, 5.2, 2],
-                  [6.2, 3.4, 5.4, 2.3], [5.9, 3, 5.1, 1.8]]
-        Iris_Y = [[1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ],
-                  [1, 0, 0, ],
-                  [1, 0, 0, ], [1, 0, 0, ],
-                  [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ],
-                  [1, 0, 0, ],
-                  [1, 0, 0, ], [1, 0, 0, ],
-                  [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ],
-                  [1, 0, 0, ],
-                  [1, 0, 0, ], [1, 0, 0, ],
-                  [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ],
-                  [1, 0, 0, ],
-                  [1, 0, 0, ], [1, 0, 0, ],
-                  [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ],
-                  [1, 0, 0, ],
-                  [1, 0, 0, ], [1, 0, 0, ],
-                  [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ],
-                  [1, 0, 0, ],
-                  [1, 0, 0, ], [1, 0, 0, ],
-                  [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ], [1, 0, 0, ],
-                  [1, 0, 0, ],
-                  [1, 0, 0, ], [1, 0, 0, ],
-                  [1, 0, 0, ], [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ],
-                  [0, 1, 0, ],
-                  [0, 1, 0, ], [0, 1, 0, ],
-                  [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ],
-                  [0, 1, 0, ],
-                  [0, 1, 0, ], [0, 1, 0, ],
-                  [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ],
-                  [0, 1, 0, ],
-                  [0, 1, 0, ], [0, 1, 0, ],
-                  [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ],
-                  [0, 1, 0, ],
-                  [0, 1, 0, ], [0, 1, 0, ],
-                  [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ],
-                  [0, 1, 0, ],
-                  [0, 1, 0, ], [0, 1, 0, ],
-                  [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ],
-                  [0, 1, 0, ],
-                  [0, 1, 0, ], [0, 1, 0, ],
-                  [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ], [0, 1, 0, ],
-                  [0, 1, 0, ],
-                  [0, 1, 0, ], [0, 1, 0, ],
-                  [0, 1, 0, ], [0, 1, 0, ], [0, 0, 1, ], [0, 0, 1, ],
-                  [0, 0, 1, ],
-                  [0, 0, 1, ], [0, 0, 1, ],
-                  [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ],
-                  [0, 0, 1, ],
-                  [0, 0, 1, ], [0, 0, 1, ],
-                  [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ],
-                  [0, 0, 1, ],
-                  [0, 0, 1, ], [0, 0, 1, ],
-                  [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ],
-                  [0, 0, 1, ],
-                  [0, 0, 1, ], [0, 0, 1, ],
-                  [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ],
-                  [0, 0, 1, ],
-                  [0, 0, 1, ], [0, 0, 1, ],
-                  [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ],
-                  [0, 0, 1, ],
-                  [0, 0, 1, ], [0, 0, 1, ],
-                  [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ],
-                  [0, 0, 1, ],
-                  [0, 0, 1, ], [0, 0, 1, ],
-                  [0, 0, 1, ], [0, 0, 1, ], [0, 0, 1, ]]
+        Iris_X, Iris_Y = iris_data()
         data = NNData(Iris_X, Iris_Y, 45)
         network.train(data, 1001, verbosity=0)
         network.test(data, one_hot=1)
@@ -516,106 +986,7 @@ def main():
     def run_sin():
         network = FFBPNetwork(1, 1)
         network.add_hidden_layer(25)
-        sin_X = [[0], [0.01], [0.02], [0.03], [0.04], [0.05], [0.06], [0.07],
-                 [0.08], [0.09], [0.1], [0.11], [0.12],
-                 [0.13], [0.14], [0.15], [0.16], [0.17], [0.18], [0.19], [0.2],
-                 [0.21], [0.22], [0.23], [0.24], [0.25],
-                 [0.26], [0.27], [0.28], [0.29], [0.3], [0.31], [0.32], [0.33],
-                 [0.34], [0.35], [0.36], [0.37], [0.38],
-                 [0.39], [0.4], [0.41], [0.42], [0.43], [0.44], [0.45], [0.46],
-                 [0.47], [0.48], [0.49], [0.5], [0.51],
-                 [0.52], [0.53], [0.54], [0.55], [0.56], [0.57], [0.58],
-                 [0.59],
-                 [0.6], [0.61], [0.62], [0.63], [0.64],
-                 [0.65], [0.66], [0.67], [0.68], [0.69], [0.7], [0.71], [0.72],
-                 [0.73], [0.74], [0.75], [0.76], [0.77],
-                 [0.78], [0.79], [0.8], [0.81], [0.82], [0.83], [0.84], [0.85],
-                 [0.86], [0.87], [0.88], [0.89], [0.9],
-                 [0.91], [0.92], [0.93], [0.94], [0.95], [0.96], [0.97],
-                 [0.98],
-                 [0.99], [1], [1.01], [1.02], [1.03],
-                 [1.04], [1.05], [1.06], [1.07], [1.08], [1.09], [1.1], [1.11],
-                 [1.12], [1.13], [1.14], [1.15], [1.16],
-                 [1.17], [1.18], [1.19], [1.2], [1.21], [1.22], [1.23], [1.24],
-                 [1.25], [1.26], [1.27], [1.28], [1.29],
-                 [1.3], [1.31], [1.32], [1.33], [1.34], [1.35], [1.36], [1.37],
-                 [1.38], [1.39], [1.4], [1.41], [1.42],
-                 [1.43], [1.44], [1.45], [1.46], [1.47], [1.48], [1.49], [1.5],
-                 [1.51], [1.52], [1.53], [1.54], [1.55],
-                 [1.56], [1.57]]
-        sin_Y = [[0], [0.00999983333416666], [0.0199986666933331],
-                 [0.0299955002024957], [0.0399893341866342],
-                 [0.0499791692706783], [0.0599640064794446],
-                 [0.0699428473375328],
-                 [0.0799146939691727],
-                 [0.089878549198011], [0.0998334166468282],
-                 [0.109778300837175],
-                 [0.119712207288919],
-                 [0.129634142619695], [0.139543114644236], [0.149438132473599],
-                 [0.159318206614246],
-                 [0.169182349066996], [0.179029573425824], [0.188858894976501],
-                 [0.198669330795061], [0.2084598998461],
-                 [0.218229623080869], [0.227977523535188], [0.237702626427135],
-                 [0.247403959254523],
-                 [0.257080551892155], [0.266731436688831], [0.276355648564114],
-                 [0.285952225104836], [0.29552020666134],
-                 [0.305058636443443], [0.314566560616118], [0.324043028394868],
-                 [0.333487092140814],
-                 [0.342897807455451], [0.35227423327509], [0.361615431964962],
-                 [0.370920469412983], [0.380188415123161],
-                 [0.389418342308651], [0.398609327984423], [0.40776045305957],
-                 [0.416870802429211], [0.425939465066],
-                 [0.43496553411123], [0.44394810696552], [0.452886285379068],
-                 [0.461779175541483], [0.470625888171158],
-                 [0.479425538604203], [0.488177246882907], [0.496880137843737],
-                 [0.505533341204847],
-                 [0.514135991653113], [0.522687228930659], [0.531186197920883],
-                 [0.539632048733969],
-                 [0.548023936791874], [0.556361022912784], [0.564642473395035],
-                 [0.572867460100481],
-                 [0.581035160537305], [0.58914475794227], [0.597195441362392],
-                 [0.60518640573604], [0.613116851973434],
-                 [0.62098598703656], [0.628793024018469], [0.636537182221968],
-                 [0.644217687237691], [0.651833771021537],
-                 [0.659384671971473], [0.666869635003698], [0.674287911628145],
-                 [0.681638760023334],
-                 [0.688921445110551], [0.696135238627357], [0.70327941920041],
-                 [0.710353272417608], [0.717356090899523],
-                 [0.724287174370143], [0.731145829726896], [0.737931371109963],
-                 [0.744643119970859],
-                 [0.751280405140293], [0.757842562895277], [0.764328937025505],
-                 [0.770738878898969],
-                 [0.777071747526824], [0.783326909627483], [0.78950373968995],
-                 [0.795601620036366], [0.801619940883777],
-                 [0.807558100405114], [0.813415504789374], [0.819191568300998],
-                 [0.82488571333845], [0.83049737049197],
-                 [0.836025978600521], [0.841470984807897], [0.846831844618015],
-                 [0.852108021949363],
-                 [0.857298989188603], [0.862404227243338], [0.867423225594017],
-                 [0.872355482344986],
-                 [0.877200504274682], [0.881957806884948], [0.886626914449487],
-                 [0.891207360061435],
-                 [0.895698685680048], [0.900100442176505], [0.904412189378826],
-                 [0.908633496115883],
-                 [0.912763940260521], [0.916803108771767], [0.920750597736136],
-                 [0.92460601240802], [0.928368967249167],
-                 [0.932039085967226], [0.935616001553386], [0.939099356319068],
-                 [0.942488801931697],
-                 [0.945783999449539], [0.948984619355586], [0.952090341590516],
-                 [0.955100855584692],
-                 [0.958015860289225], [0.960835064206073], [0.963558185417193],
-                 [0.966184951612734],
-                 [0.968715100118265], [0.971148377921045], [0.973484541695319],
-                 [0.975723357826659],
-                 [0.977864602435316], [0.979908061398614], [0.98185353037236],
-                 [0.983700814811277], [0.98544972998846],
-                 [0.98710010101385], [0.98865176285172], [0.990104560337178],
-                 [0.991458348191686], [0.992712991037588],
-                 [0.993868363411645], [0.994924349777581], [0.99588084453764],
-                 [0.996737752043143], [0.997494986604054],
-                 [0.998152472497548], [0.998710143975583], [0.999167945271476],
-                 [0.999525830605479],
-                 [0.999783764189357], [0.999941720229966], [0.999999682931835]]
+        sin_X, sin_Y = sin_data()
         data = NNData(sin_X, sin_Y, 45)
         network.train(data, 1, verbosity=1)
         network.test(data)
@@ -624,8 +995,7 @@ def main():
     def run_XOR():
         network = FFBPNetwork(2, 1)
         network.add_hidden_layer(3)
-        XORx = [[0, 0], [1, 0], [0, 1], [1, 1]]
-        XORy = [[0], [1], [1], [0]]
+        XORx, XORy = xor_data()
         data = NNData(XORx, XORy, 100)
         network.train(data, 1001)
         network.test(data, one_hot=1)
@@ -9,15 +9,19 @@ class FFBPNeurode(BPNeurode, FFNeurode):
     FFNeurode.
     """
 
-    def __init__(self, my_type: LayerType = LayerType.INPUT):
+    __slots__ = ()
+
+    def __init__(self, my_type: LayerType = LayerType.INPUT,
+                 activation='sigmoid'):
         """
         Inits FFBPNeurode with all inherited attributes initialized
 
         Args:
             my_type: LayerType enum. Determines the layer classification of
             the neurode.
+            activation: registered activation name or Activation
         """
-        super().__init__(my_type)
+        super().__init__(my_type, activation)
 
 
 def main():
@@ -1,5 +1,8 @@
+import math
+
 import numpy as np
 
+from Network.Activation import sigmoid_scalar
 from Network.LayerType import LayerType
 from Network.Neurode import *
 
@@ -13,9 +16,11 @@ class FFNeurode(Neurode):
     - 'fires' when appropriate, passing data to the output side.
     """
 
-    def __init__(self, my_type: LayerType):
+    __slots__ = ()
+
+    def __init__(self, my_type: LayerType, activation='sigmoid'):
         """Init method which initializes the FFNeurode class"""
-        super().__init__(my_type)
+        super().__init__(my_type, activation)
 
     @staticmethod
     def activate_sigmoid(value) -> float:
@@ -28,7 +33,7 @@ class FFNeurode(Neurode):
         Returns:
             Float value between -1 and 1
         """
-        return 1 / (1 + np.exp(-value))
+        return sigmoid_scalar(value)
 
     def receive_input(self, from_node: Neurode = None, input_value=0):
         """
@@ -72,9 +77,9 @@ class FFNeurode(Neurode):
         This method updates the binary encoding and checks if all inputs are
         reporting.
 
-        Using the binary encoding of reporting_inputs, we use the index of
-        from_node in the input_nodes ordered dictionary to determine the bit
-        position of the binary encoding to change to '1'. Once updated,
+        Using the binary encoding of reporting_inputs, we look up the bit
+        position of from_node in input_index to determine the bit of the
+        binary encoding to change to '1'. Once updated,
         this methood checks if all inputs are reporting. If all inputs are
         reporting, this method returns True; if all inputs are not
         reporting, this method returns False.
@@ -87,11 +92,8 @@ class FFNeurode(Neurode):
             not.
         """
 
-        self.reporting_inputs = self.reporting_inputs | (
-                2 ** list(self.input_nodes.keys()).index(from_node))
-
-        if self.reporting_inputs == self.compare_inputs_full:
-            self.reporting_inputs = 0
+        if self.input_reports.set(self.input_index[from_node]):
+            self.input_reports.clear()
             return True
         else:
             return False
@@ -102,7 +104,8 @@ class FFNeurode(Neurode):
         the values of the input connections.
 
         Calculates the weighted sum of values from connected input nodes
-        and their weights using the activate_sigmoid() function.
+        and their weights and passes it through the neurode's activation
+        function.
 
         After calculating the value of the neurode, this method reports to
         all output connected neurodes letting them known that this neurode
@@ -110,10 +113,11 @@ class FFNeurode(Neurode):
         """
 
         weighted_sum = 0
+        weights = self.input_weights
 
-        for index, neurode in self.input_nodes.items():
-            weighted_sum += index.get_value() * neurode
-        self.value = self.activate_sigmoid(weighted_sum)
+        for node, slot in self.input_index.items():
+            weighted_sum += node.value * weights[slot]
+        self.value = self.activation.scalar_function(weighted_sum)
 
         # Pass values to output nodes
         for node in self.output_nodes:
@@ -149,7 +153,7 @@ def main():
         hnodes[1]] * value_1
     final = (1 / (1 + np.exp(-inter)))
     try:
-        assert final == onodes[0].get_value()
+        assert math.isclose(final, onodes[0].get_value(), rel_tol=1e-12)
         assert 0 < final < 1
     except:
         print("Error: Calculation of neurode value may be incorrect")
@@ -0,0 +1,151 @@
+"""This module trains a network on several threads at once, Hogwild style.
+
+Every thread draws its own batches from the training pool and adds its
+weight adjustments straight into the network's weight matrices, without
+any lock around the weights. Updates from different threads may overlap,
+which asynchronous SGD tolerates, and numpy releases the GIL inside the
+matrix products so the threads run on several cores. Only drawing from the
+pool and recording metrics take a lock.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from Network.MatrixEngine import MatrixEngine
+from Network.Metrics import Metrics
+from Network.NNData import NNData
+
+
+class HogwildTrainer:
+    """
+    Asynchronous multi-threaded trainer of a network, used as a context
+    manager around the epochs of FFBPNetwork.train_hogwild.
+
+    Attributes:
+        network: FFBPNetwork being trained
+        data_set: NNData whose training pool the threads draw from
+        threads: number of training threads
+        loss: Loss whose gradient is used, None for the squared error
+        lock: lock taken to draw from the pool and to record metrics
+        executor: ThreadPoolExecutor running the training threads
+    """
+
+    def __init__(self, network, data_set: NNData, threads: int = None,
+                 loss=None):
+        """
+        Inits HogwildTrainer. No thread is started until it is entered.
+
+        Args:
+            network: FFBPNetwork to train
+            data_set: NNData whose training set is used
+            threads: number of training threads, defaults to the number of
+              CPUs
+            loss: Loss whose gradient is used, None for the squared error
+        """
+        self.network = network
+        self.data_set = data_set
+        self.threads = threads or os.cpu_count() or 1
+        self.loss = loss
+        self.lock = threading.Lock()
+        self.executor = None
+
+    def __enter__(self):
+        self.network.matrix_engine.ensure_bound()
+        self.executor = ThreadPoolExecutor(self.threads)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.executor.shutdown()
+        self.executor = None
+
+    def run_epoch(self, metrics: Metrics, batch_size: int):
+        """
+        Runs the primed training pool through the network on every thread
+        and waits until the pool is empty.
+
+        Args:
+            metrics: running statistics of the epoch
+            batch_size: number of examples per weight update of a thread
+        """
+        futures = [self.executor.submit(self.run_thread, metrics,
+                                        batch_size)
+                   for _ in range(self.threads)]
+        for future in futures:
+            future.result()
+
+    def run_thread(self, metrics: Metrics, batch_size: int):
+        """
+        Body of one training thread. Draws batches until the pool is empty
+        and applies each batch's weight update without locking the
+        weights.
+
+        Args:
+            metrics: running statistics of the epoch
+            batch_size: number of examples per weight update
+        """
+        shared = self.network.matrix_engine
+        engine = MatrixEngine.detached(shared.weights, shared.learning_rates,
+                                       shared.layer_activations)
+        pool = self.data_set.train_pool
+        outputs = labels = None
+
+        while True:
+            with self.lock:
+                if outputs is not None:
+                    metrics.update_batch(outputs, labels)
+                indices = pool.take(batch_size).copy()
+            if not len(indices):
+                return
+
+            examples, labels = self.data_set.get_items(indices)
+            outputs = engine.forward_batch(examples)
+            adjustments = engine.batch_adjustments(labels, self.loss)
+            for matrix, adjustment in zip(engine.weights, adjustments):
+                adjustment /= len(indices)
+                matrix += adjustment
+
+
+def main():
+    """Main Unit test for module"""
+    # Imported here, as FFBPNetwork imports this module when training
+    import numpy as np
+    from Network.FFBPNetwork import FFBPNetwork
+    from Network.Metrics import MemorySink
+
+    rng = np.random.default_rng(0)
+    x = rng.random((400, 5))
+    y = np.sin(x.sum(axis=1, keepdims=True)) / 3
+
+    def make_network():
+        network = FFBPNetwork(5, 1, FFBPNetwork.Engine.MATRIX, seed=3)
+        network.add_hidden_layer(8, 'tanh')
+        return network
+
+    # A single thread applies the same batches as serial training
+    serial, hogwild = make_network(), make_network()
+    serial_rmse = serial.train(NNData(x, y, 80, NNData.Storage.NUMPY,
+                                      seed=5), 3, 0, batch_size=16)
+    hogwild_rmse = hogwild.train_hogwild(
+        NNData(x, y, 80, NNData.Storage.NUMPY, seed=5), 3, 0,
+        batch_size=16, threads=1)
+    assert np.isclose(serial_rmse, hogwild_rmse)
+    assert np.allclose(serial.predict(x), hogwild.predict(x))
+
+    # Several threads still see every training example once per epoch,
+    # and the error keeps falling
+    network = make_network()
+    memory = MemorySink()
+    metrics = Metrics([memory], 1)
+    data_set = NNData(x, y, 80, seed=5)
+    first = network.train_hogwild(data_set, 1, 0, batch_size=8,
+                                  metrics=metrics, threads=4)
+    last = network.train_hogwild(data_set, 20, 0, batch_size=8,
+                                 metrics=metrics, threads=4)
+    metrics.close()
+    assert [record['samples'] for record in memory.epochs] == [320] * 21
+    assert last < first
+    print("Done!")
+
+
+if __name__ == "__main__":
+    main()
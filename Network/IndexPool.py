@@ -0,0 +1,92 @@
+"""Module which provides the pools of example indices used by NNData."""
+import numpy as np
+
+
+class IndexPool:
+    """
+    Queue of example indices backed by one fixed numpy array.
+
+    Indices are handed out from the front of the array by advancing a
+    position, and the pool is refilled or re-shuffled in place, so priming
+    a pool every epoch allocates nothing.
+
+    Attributes:
+        order: array of indices in the order they are handed out
+        position: position in order of the next index to hand out
+    """
+
+    __slots__ = ('order', 'position')
+
+    def __init__(self, indices=()):
+        """
+        Inits IndexPool holding a copy of the given indices.
+
+        Args:
+            indices: iterable of example indices
+        """
+        self.order = np.array(indices, dtype=np.intp)
+        self.position = 0
+
+    def __len__(self) -> int:
+        return len(self.order) - self.position
+
+    def __bool__(self) -> bool:
+        return self.position < len(self.order)
+
+    def __iter__(self):
+        """Iterates over the indices not handed out yet, as ints"""
+        return iter(self.order[self.position:].tolist())
+
+    def popleft(self) -> int:
+        """
+        Hands out the next index.
+
+        Returns:
+            next example index
+
+        Raises:
+            IndexError: if the pool is empty
+        """
+        if self.position >= len(self.order):
+            raise IndexError("pop from an empty IndexPool")
+        index = self.order[self.position]
+        self.position += 1
+        return int(index)
+
+    def take(self, count: int) -> np.ndarray:
+        """
+        Hands out up to count indices at once.
+
+        Args:
+            count: number of indices wanted
+
+        Returns:
+            view of the next indices, shorter than count if the pool runs
+            out. The view is overwritten when the pool is refilled.
+        """
+        start = self.position
+        self.position = min(start + count, len(self.order))
+        return self.order[start:self.position]
+
+    def refill(self, indices: np.ndarray):
+        """
+        Copies the given indices into the pool in place and rewinds it.
+
+        Args:
+            indices: array of example indices
+        """
+        if len(indices) == len(self.order):
+            np.copyto(self.order, indices)
+        else:
+            self.order = np.array(indices, dtype=np.intp)
+        self.position = 0
+
+    def shuffle(self, rng: np.random.Generator):
+        """
+        Shuffles every index of the pool in place and rewinds it.
+
+        Args:
+            rng: numpy random Generator to draw the permutation from
+        """
+        rng.shuffle(self.order)
+        self.position = 0
@@ -0,0 +1,229 @@
+"""Module which holds the registry of weight initialisers.
+
+An initialiser fills the whole weight block between two layers at once: it
+is given a numpy Generator and the (fan_out, fan_in) shape of the block,
+rows being the neurodes of the receiving layer, and returns a float64
+matrix of that shape. Seeding the Generator makes the weights of a network
+reproducible on their own, independently of the random module.
+
+The 'legacy' initialiser draws one random.random() per weight, exactly as
+connecting one neurode at a time always did, so networks seeded through
+random.seed keep their weights. It is the default of unseeded networks;
+a network given a seed defaults to 'uniform', which draws from the same
+range through the Generator.
+"""
+import random
+
+import numpy as np
+
+
+class Initializer:
+    """
+    Scheme which draws the initial weights of a layer.
+
+    Attributes:
+        name: name the initialiser is registered under
+        function: function of a Generator and a (fan_out, fan_in) shape
+          returning the weight matrix
+        seeded: whether the weights are drawn from the Generator, so that
+          seeding it makes them reproducible
+    """
+
+    def __init__(self, name: str, function, seeded: bool = True):
+        """
+        Inits Initializer with all class attributes initialized.
+
+        Args:
+            name: name to register the initialiser under
+            function: function of a Generator and a (fan_out, fan_in) shape
+              returning the weight matrix
+            seeded: False if the function ignores the Generator
+        """
+        self.name = name
+        self.function = function
+        self.seeded = seeded
+
+    def __repr__(self):
+        return "Initializer(" + self.name + ")"
+
+    def __call__(self, rng: np.random.Generator, shape: tuple) -> np.ndarray:
+        """
+        Draws a weight matrix.
+
+        Args:
+            rng: Generator to draw from
+            shape: (fan_out, fan_in) shape of the matrix
+
+        Returns:
+            float64 matrix of the given shape
+        """
+        return np.asarray(self.function(rng, shape), dtype=np.float64)
+
+
+def legacy(rng: np.random.Generator, shape: tuple) -> np.ndarray:
+    """Uniform in [0, 1) from random.random(), row by row. rng is unused."""
+    size = shape[0] * shape[1]
+    return np.fromiter((random.random() for _ in range(size)), np.float64,
+                       size).reshape(shape)
+
+
+def uniform(rng: np.random.Generator, shape: tuple) -> np.ndarray:
+    """Uniform in [0, 1), the range of the legacy weights"""
+    return rng.random(shape)
+
+
+def xavier_uniform(rng: np.random.Generator, shape: tuple) -> np.ndarray:
+    """Glorot uniform, variance 2 / (fan_in + fan_out), for sigmoid and
+    tanh layers"""
+    limit = np.sqrt(6 / (shape[0] + shape[1]))
+    return rng.uniform(-limit, limit, shape)
+
+
+def xavier_normal(rng: np.random.Generator, shape: tuple) -> np.ndarray:
+    """Glorot normal, variance 2 / (fan_in + fan_out)"""
+    return rng.normal(0, np.sqrt(2 / (shape[0] + shape[1])), shape)
+
+
+def he_uniform(rng: np.random.Generator, shape: tuple) -> np.ndarray:
+    """He uniform, variance 2 / fan_in, for relu layers"""
+    limit = np.sqrt(6 / shape[1])
+    return rng.uniform(-limit, limit, shape)
+
+
+def he_normal(rng: np.random.Generator, shape: tuple) -> np.ndarray:
+    """He normal, variance 2 / fan_in, for relu layers"""
+    return rng.normal(0, np.sqrt(2 / shape[1]), shape)
+
+
+INITIALIZERS = {}
+DEFAULT_INITIALIZER = 'legacy'
+SEEDED_INITIALIZER = 'uniform'
+
+
+def register_initializer(initializer: Initializer):
+    """
+    Adds an initialiser to the registry, replacing any initialiser already
+    registered under the same name.
+
+    Args:
+        initializer: Initializer to register
+    """
+    INITIALIZERS[initializer.name] = initializer
+
+
+def get_initializer(initializer) -> Initializer:
+    """
+    Looks up an initialiser in the registry.
+
+    Args:
+        initializer: registered name, or an Initializer which is returned
+          unchanged
+
+    Returns:
+        Initializer registered under the given name
+
+    Raises:
+        UnknownInitializerError: if no initialiser has the given name
+    """
+    if isinstance(initializer, Initializer):
+        return initializer
+    if initializer not in INITIALIZERS:
+        raise UnknownInitializerError(initializer)
+    return INITIALIZERS[initializer]
+
+
+def resolve_initializer(initializer, seed) -> Initializer:
+    """
+    Looks up the initialiser of weights drawn from a Generator with the
+    given seed.
+
+    Args:
+        initializer: registered name or Initializer, None for
+          DEFAULT_INITIALIZER when seed is None and SEEDED_INITIALIZER
+          otherwise
+        seed: seed of the Generator, None if unseeded
+
+    Returns:
+        Initializer registered under the given name
+
+    Raises:
+        UnknownInitializerError: if no initialiser has the given name
+        UnseededInitializerError: if a seed is given to an initialiser
+          which ignores the Generator
+    """
+    if initializer is None:
+        initializer = DEFAULT_INITIALIZER if seed is None \
+            else SEEDED_INITIALIZER
+    initializer = get_initializer(initializer)
+    if seed is not None and not initializer.seeded:
+        raise UnseededInitializerError(initializer.name)
+    return initializer
+
+
+register_initializer(Initializer('legacy', legacy, seeded=False))
+register_initializer(Initializer('uniform', uniform))
+register_initializer(Initializer('xavier', xavier_uniform))
+register_initializer(Initializer('xavier_normal', xavier_normal))
+register_initializer(Initializer('he', he_uniform))
+register_initializer(Initializer('he_normal', he_normal))
+
+
+class UnknownInitializerError(Exception):
+    """No initialiser is registered under the given name"""
+
+
+class UnseededInitializerError(Exception):
+    """Initialiser ignores the Generator, so its weights cannot follow the
+    given seed; seed the random module instead"""
+
+
+def main():
+    """Main Unit test for module"""
+    # Imported here, as FFBPNetwork imports this module
+    from Network.FFBPNetwork import FFBPNetwork
+
+    for initializer in INITIALIZERS.values():
+        first = initializer(np.random.default_rng(4), (300, 200))
+        assert first.shape == (300, 200) and first.dtype == np.float64
+        if initializer.seeded:
+            state = random.getstate()
+            second = initializer(np.random.default_rng(4), (300, 200))
+            assert random.getstate() == state
+            assert np.array_equal(first, second)
+    limit = np.sqrt(6 / 500)
+    weights = get_initializer('xavier')(np.random.default_rng(0), (300, 200))
+    assert weights.min() >= -limit and weights.max() <= limit
+    weights = get_initializer('he_normal')(np.random.default_rng(0),
+                                           (300, 200))
+    assert abs(weights.std() - np.sqrt(2 / 200)) < 0.005
+    random.seed(1)
+    weights = get_initializer('legacy')(None, (2, 3))
+    random.seed(1)
+    assert weights.ravel().tolist() == [random.random() for _ in range(6)]
+
+    assert resolve_initializer(None, None).name == DEFAULT_INITIALIZER
+    assert resolve_initializer(None, 0).name == SEEDED_INITIALIZER
+    for initializer, error in (('legacy', UnseededInitializerError),
+                               ('nope', UnknownInitializerError)):
+        try:
+            resolve_initializer(initializer, 0)
+            assert False
+        except error:
+            pass
+
+    # The same seed gives the same network, whatever the random module does
+    networks = []
+    for seed_of_random in (1, 2):
+        random.seed(seed_of_random)
+        network = FFBPNetwork(2, 2, seed=0)
+        network.add_hidden_layer(3, initializer='xavier')
+        network.matrix_engine.ensure_bound()
+        networks.append(network)
+    for first, second in zip(networks[0].matrix_engine.weights,
+                             networks[1].matrix_engine.weights):
+        assert np.array_equal(first, second)
+    print("Done!")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,8 @@
 simple neural network."""
 import json
 
-from Network import NNDataJson, NNData
+from Network import NNDataJson
+from Network.NNData import NNData
 from Network.FFBPNetwork import FFBPNetwork
 
 
@@ -715,4 +716,5 @@ def main():
     menu.main_menu()
 
 
-main()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+"""This module reads JSON documents incrementally from a text stream.
+
+Only a chunk of the document is held in memory at a time. Arrays of numbers
+are converted to numpy arrays in bulk, one chunk of text at a time, without
+building Python lists of the values.
+"""
+import io
+import json
+import re
+
+import numpy as np
+
+SCALAR = re.compile(r'-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null')
+BRACKETS = re.compile(r'[\[\]]')
+DELIMITER = re.compile(r'[\s,\]}]')
+NUMBER_SEPARATORS = str.maketrans('[],', '   ')
+LITERALS = {'true': True, 'false': False, 'null': None}
+
+
+class GrowableArray:
+    """
+    One dimensional numpy array which is filled chunk by chunk, doubling its
+    preallocated capacity whenever it runs out of room.
+
+    Attributes:
+        data: preallocated array, only the first size values are in use
+        size: number of values appended so far
+    """
+
+    def __init__(self, dtype, capacity: int = 1024):
+        """
+        Inits GrowableArray with an empty preallocated array.
+
+        Args:
+            dtype: numpy dtype of the values
+            capacity: number of values to preallocate
+        """
+        self.data = np.empty(capacity, dtype=dtype)
+        self.size = 0
+
+    def extend(self, values: np.ndarray):
+        """
+        Appends the given values, growing the preallocated array if needed.
+
+        Args:
+            values: one dimensional array of values
+        """
+        end = self.size + len(values)
+        if end > len(self.data):
+            self.data.resize(max(end, 2 * len(self.data)), refcheck=False)
+        self.data[self.size:end] = values
+        self.size = end
+
+    def result(self) -> np.ndarray:
+        """
+        Shrinks the preallocated array to the values in use.
+
+        Returns:
+            array of the appended values
+        """
+        self.data.resize(self.size, refcheck=False)
+        return self.data
+
+
+class JsonStream:
+    """
+    Incremental reader of a JSON document from a text stream.
+
+    Attributes:
+        stream: text stream the document is read from
+        chunk_size: number of characters read from the stream at a time
+        buffer: characters read but not consumed yet, from position on
+        position: position of the next character to consume in buffer
+        eof: True once the stream has no more characters
+    """
+
+    def __init__(self, stream, chunk_size: int = 65536):
+        """
+        Inits JsonStream with an empty buffer.
+
+        Args:
+            stream: text stream to read the document from
+            chunk_size: number of characters read from the stream at a time
+        """
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """
+        Drops the consumed characters and reads one more chunk.
+
+        Returns:
+            False if the stream has no more characters
+        """
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def next_char(self) -> str:
+        """
+        Skips whitespace and returns the next character without consuming
+        it.
+
+        Returns:
+            next character, or an empty string at the end of the document
+        """
+        while True:
+            while self.position < len(self.buffer) \
+                    and self.buffer[self.position].isspace():
+                self.position += 1
+            if self.position < len(self.buffer) or not self.fill():
+                return self.buffer[self.position:self.position + 1]
+
+    def expect(self, char: str):
+        """
+        Consumes the given character.
+
+        Args:
+            char: character expected next
+
+        Raises:
+            StreamDecodeError: if another character comes next
+        """
+        if self.next_char() != char:
+            raise StreamDecodeError("Expected '" + char + "'")
+        self.position += 1
+
+    def read_string(self) -> str:
+        """
+        Reads a string.
+
+        Returns:
+            decoded string
+        """
+        self.expect('"')
+        start = self.position - 1
+        search = self.position
+        while True:
+            end = self.buffer.find('"', search)
+            if end >= 0:
+                escape = end
+                while self.buffer[escape - 1] == '\\':
+                    escape -= 1
+                if (end - escape) % 2 == 0:
+                    break
+                search = end + 1
+                continue
+
+            # Keep the whole string in the buffer while reading more
+            search = len(self.buffer) - start
+            self.position = start
+            if not self.fill():
+                raise StreamDecodeError("Unterminated string")
+            start = 0
+
+        raw = self.buffer[start:end + 1]
+        self.position = end + 1
+        return json.loads(raw)
+
+    def read_scalar(self):
+        """
+        Reads a number, true, false or null.
+
+        Returns:
+            decoded int, float, bool or None
+        """
+        self.next_char()
+        # Read until the scalar is delimited, so a chunk boundary inside it
+        # cannot cut it short
+        while DELIMITER.search(self.buffer, self.position) is None \
+                and self.fill():
+            pass
+        match = SCALAR.match(self.buffer, self.position)
+        if not match:
+            raise StreamDecodeError("Expected a value")
+        text = match.group()
+        self.position = match.end()
+        if text in LITERALS:
+            return LITERALS[text]
+        return json.loads(text)
+
+    def read_array(self, dtype) -> np.ndarray:
+        """
+        Reads an array of numbers, or an array of equally long arrays of
+        numbers, straight into a numpy array.
+
+        Args:
+            dtype: numpy dtype of the returned array
+
+        Returns:
+            1-D array for an array of numbers, 2-D array with one row per
+            inner array otherwise
+        """
+        self.expect('[')
+        values = GrowableArray(dtype)
+        depth, max_depth, rows, columns = 1, 1, 0, None
+        start = self.position
+
+        while True:
+            end = None
+            for bracket in BRACKETS.finditer(self.buffer, self.position):
+                if bracket.group() == '[':
+                    depth += 1
+                    max_depth = max(max_depth, depth)
+                else:
+                    depth -= 1
+                    if depth == 1:
+                        rows += 1
+                        if columns is None:
+                            self.add_numbers(values, start, bracket.end())
+                            start = bracket.end()
+                            columns = values.size
+                if depth == 0:
+                    end = bracket.start()
+                    break
+            if end is not None:
+                self.add_numbers(values, start, end)
+                self.position = end + 1
+                break
+
+            # Parse up to the last separator so no number is split. The
+            # rest holds no brackets, so it is safe to scan it again.
+            cut = max(self.buffer.rfind(',', start),
+                      self.buffer.rfind('[', start),
+                      self.buffer.rfind(']', start)) + 1
+            if cut > start:
+                self.add_numbers(values, start, cut)
+                start = cut
+            self.position = start
+            if not self.fill():
+                raise StreamDecodeError("Unterminated array")
+            start = self.position
+
+        array = values.result()
+        if max_depth > 2:
+            raise StreamDecodeError("Arrays nested too deep")
+        if max_depth == 2:
+            if rows and array.size != rows * columns:
+                raise StreamDecodeError("Rows of different lengths")
+            return array.reshape(rows, columns if rows else 0)
+        return array
+
+    def add_numbers(self, values: GrowableArray, start: int, end: int):
+        """
+        Parses the numbers between two positions of the buffer in bulk.
+
+        Args:
+            values: GrowableArray to append the numbers to
+            start: position of the first character to parse
+            end: position after the last character to parse
+
+        Raises:
+            StreamDecodeError: if a token between the separators is not a
+              number
+        """
+        tokens = self.buffer[start:end].translate(NUMBER_SEPARATORS).split()
+        try:
+            # numpy converts the whole list of tokens in C
+            values.extend(np.array(tokens, dtype=np.float64))
+        except ValueError:
+            for token in tokens:
+                try:
+                    float(token)
+                except ValueError:
+                    raise StreamDecodeError(
+                        "Expected a number, not '" + token + "'") from None
+            raise
+
+    def read_value(self):
+        """
+        Reads any JSON value into Python objects.
+
+        Returns:
+            decoded dict, list, string or scalar
+        """
+        char = self.next_char()
+        if char == '{':
+            return dict(self.read_object_items(lambda key: self.read_value()))
+        if char == '[':
+            self.expect('[')
+            items = []
+            if self.next_char() == ']':
+                self.position += 1
+                return items
+            while True:
+                items.append(self.read_value())
+                if self.next_char() == ']':
+                    self.position += 1
+                    return items
+                self.expect(',')
+        if char == '"':
+            return self.read_string()
+        return self.read_scalar()
+
+    def read_object_items(self, read_member):
+        """
+        Reads an object one member at a time.
+
+        Args:
+            read_member: function called with each key, which reads and
+              returns the member's value
+
+        Yields:
+            (key, value) tuples in document order
+        """
+        self.expect('{')
+        if self.next_char() == '}':
+            self.position += 1
+            return
+        while True:
+            key = self.read_string()
+            self.expect(':')
+            yield key, read_member(key)
+            if self.next_char() == '}':
+                self.position += 1
+                return
+            self.expect(',')
+
+
+class StreamDecodeError(ValueError):
+    """Document is not valid JSON of the expected shape"""
+
+
+def main():
+    """Main Unit test for module"""
+    document = {'name': 'a "quoted" \\ name', 'flags': [True, False, None],
+                'nested': {'empty': [], 'count': -12, 'scale': 2.5e-3}}
+    text = json.dumps(document)
+    rows = '[[1e2, -2.5, 3], [4, 5.25, -6E-1]]'
+
+    for chunk_size in (1, 2, 3, 7, 64, 65536):
+        assert JsonStream(io.StringIO(text), chunk_size).read_value() \
+            == document
+        array = JsonStream(io.StringIO(rows), chunk_size).read_array(
+            np.float32)
+        assert array.dtype == np.float32 and array.shape == (2, 3)
+        assert np.array_equal(array, np.float32(json.loads(rows)))
+        flat = JsonStream(io.StringIO('[0.5, 10, -3]'), chunk_size)
+        assert flat.read_array(np.float64).tolist() == [0.5, 10, -3]
+
+        for bad in ('[[1, 2], [3]]', '[1, 2', '[[[1]]]', '[1, true, 3]',
+                    '[[1, 2], [3, "4"]]', '[1, 2x]'):
+            try:
+                JsonStream(io.StringIO(bad), chunk_size).read_array(
+                    np.float64)
+                assert False
+            except StreamDecodeError:
+                pass
+    print("Done!")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+from Network.Activation import Activation, get_activation
+from Network.Initializer import Initializer, get_initializer
 from Network.FFBPNeurode import *
 from Network.DLLNode import *
 from Network.LayerType import *
@@ -14,21 +16,37 @@ class Layer(DLLNode):
     Attributes:
         my_type: LayerType classification of the Layer
         neurodes: list of FFBPNeurodes contained within the layer
+        activation: Activation shared by every neurode in the layer
+        initializer: Initializer of the layer's incoming weights, None to
+          use the one of its LayerList
+        weights: numpy matrix of incoming weights, set when the layer is
+          bound to a MatrixEngine
+        rate_changes: count of learning rate assignments to the layer's
+          neurodes
 
     """
 
     def __init__(self, num_neurodes: int = 5,
-                 my_type: LayerType = LayerType.HIDDEN):
+                 my_type: LayerType = LayerType.HIDDEN,
+                 activation='sigmoid', initializer=None):
         """
         Inits Layer class with all attributes initialized.
 
         Args:
             num_neurodes: number of neurodes to initialize in the neurodes list
             my_type: LayerType classification for the layer
+            activation: registered activation name or Activation
+            initializer: registered initialiser name or Initializer, None
+              to use the one of the LayerList
         """
         super().__init__()
         self.my_type = my_type
+        self.activation: Activation = get_activation(activation)
+        self.initializer: Initializer = None if initializer is None \
+            else get_initializer(initializer)
         self.neurodes = []
+        self.weights = None
+        self.rate_changes = 0
 
         self.init_neurodes(num_neurodes)
 
@@ -44,7 +62,8 @@ class Layer(DLLNode):
 
     def add_neurode(self):
         """Adds a single FFBPNeurode to the neurodes list"""
-        new_node = FFBPNeurode(self.my_type)
+        new_node = FFBPNeurode(self.my_type, self.activation)
+        new_node.layer = self
         self.neurodes.append(new_node)
 
     def get_my_neurodes(self) -> list:
@@ -1,6 +1,12 @@
 # TODO Optimize imports, math
 # TODO Take out getters and setters
+import numpy as np
+
+from Network.ExecutionPlan import ExecutionPlan
+from Network.Initializer import resolve_initializer
 from Network.Layer import Layer
+from Network.MultiLinkNode import slot_index
+from Network.Loss import Loss
 from Network.LayerType import LayerType
 from Network.DoublyLinkedList import DoublyLinkedList
 
@@ -10,6 +16,13 @@ class LayerList(DoublyLinkedList):
     Controlling object which extends functionality of DoublyLinkedList.
 
     Handles adding and removing Layers of nodes (input, output, hidden).
+    Topology edits are incremental: only the connections between the
+    layers an edit touches are allocated and initialised, so every other
+    layer keeps its trained weights.
+
+    Passes through the network read the cached ExecutionPlan instead of
+    walking the list, so they never move the current position pointer,
+    which belongs to the code browsing the layers.
 
     Attributes:
         input_layer: Layer object containing input FFBPNeurodes. This serves
@@ -17,26 +30,68 @@ class LayerList(DoublyLinkedList):
 
         output_layer: Layer object containing output FFBPNeurodes. This
         serves the same purpose as a 'tail' pointer.
+
+        plan: cached ExecutionPlan of the layers, None until it is next
+        needed
+
+        initializer: Initializer of the weights of every layer which has
+        none of its own
+
+        seed: seed of rng, None if unseeded
+
+        rng: numpy Generator the initialisers draw from
+
+        dtype: numpy dtype of every weight matrix
     """
 
-    def __init__(self, num_inputs: int, num_outputs: int):
+    def __init__(self, num_inputs: int, num_outputs: int,
+                 output_activation='sigmoid',
+                 initializer=None, seed=None, dtype=np.float64):
         """
         Inits LayerList with all class attributes initialized.
 
         Args:
             num_inputs: number of input nodes in the input layer
             num_outputs: number of output nodes in the output layer
+            output_activation: activation name or Activation of the output
+              layer
+            initializer: initialiser name or Initializer of the layers
+              which have none of their own, None for 'legacy' when seed
+              is None and 'uniform' otherwise
+            seed: seed of the Generator the initialisers draw from
+            dtype: numpy dtype of the weight matrices
+
+        Raises:
+            UnseededInitializerError: if a seed is given with an
+              initialiser which ignores it, such as 'legacy'
         """
         super().__init__()
+        self._plan = None
+        self.initializer = resolve_initializer(initializer, seed)
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.dtype = np.dtype(dtype)
         input_layer: Layer = Layer(num_inputs, LayerType.INPUT)
-        output_layer = Layer(num_outputs, LayerType.OUTPUT)
+        output_layer = Layer(num_outputs, LayerType.OUTPUT,
+                             output_activation)
 
         self.add_to_head(input_layer)
         self.reset_cur()
-        self.reconnect_outputs(input_layer, output_layer)
-
         self.insert_after_cur(output_layer)
 
+    @property
+    def plan(self) -> ExecutionPlan:
+        """ExecutionPlan of the current layers, rebuilt only after the
+        topology changed"""
+        if self._plan is None:
+            self._plan = ExecutionPlan.from_head(self.head)
+        return self._plan
+
+    def invalidate_plan(self):
+        """Drops the cached ExecutionPlan, e.g. after a layer's weight
+        matrix was replaced."""
+        self._plan = None
+
     def get_input_nodes(self) -> list:
         """
         Getter method which returns the list of input neurodes at the
@@ -61,33 +116,37 @@ class LayerList(DoublyLinkedList):
     def insert_after_cur(self, new_layer):
         """
         Private Method
-        Overridden method from base class. Resets connections between
-        Neurodes after insertion.
+        Overridden method from base class. Connects the new layer to its
+        neighbours after insertion. Only the weights into the new layer and
+        into the layer after it are initialised; the layer after it has
+        new inputs, so its old weights no longer apply.
 
         Args:
             new_layer: Layer to add into LayerList
         """
-        from_layer = self.current
         if self.current is None:
             self.reset_cur()
+        from_layer = self.current
 
         if new_layer.my_type is LayerType.OUTPUT:
             self.reconnect_nodes(from_layer, new_layer)
             super().insert_after_cur(new_layer)
 
         elif new_layer.my_type is LayerType.HIDDEN:
-            self.reconnect_nodes(new_layer, from_layer)
-            self.reconnect_nodes(self.current.get_next(), new_layer)
+            self.reconnect_nodes(from_layer, new_layer)
+            self.reconnect_nodes(new_layer, self.current.get_next())
             super().insert_after_cur(new_layer)
 
         else:
             pass
+        self.invalidate_plan()
 
     def remove_after_cur(self):
         """
         Private Method.
-        Overridden method from base class. Resets connections between
-        remaining neurodes, and clears connections from removed layer.
+        Overridden method from base class. Connects the layers on either
+        side of the removed layer, initialising only the weights into the
+        layer after it, and clears connections from the removed layer.
 
         """
         removed_nodes = self.current.get_next().get_my_neurodes()
@@ -98,25 +157,35 @@ class LayerList(DoublyLinkedList):
 
         super().remove_after_cur()
 
-        self.reconnect_inputs(self.current, self.current.get_next())
+        self.reconnect_nodes(self.current, self.current.get_next())
+        self.invalidate_plan()
 
-        self.reconnect_outputs(self.current.get_next(), self.current)
-
-    def insert_hidden_layer(self, num_neurodes: int):
+    def insert_hidden_layer(self, num_neurodes: int, activation='sigmoid',
+                            initializer=None):
         """
         Method which inserts a hidden layer directly after the current
         position pointer.
 
         Args:
             num_neurodes: number of neurodes to be in the new hidden layer
+            activation: activation name or Activation of the new layer
+            initializer: initialiser name or Initializer of the new layer's
+              weights, None for the initializer of the LayerList
+
+        Raises:
+            UnseededInitializerError: if the LayerList is seeded and the
+              initialiser ignores the seed
         """
+        if initializer is not None:
+            initializer = resolve_initializer(initializer, self.seed)
         if self.current is None:
             self.current = self.head
 
         if self.current is self.tail:
             raise NodePositionError
         else:
-            self.insert_after_cur(Layer(num_neurodes, LayerType.HIDDEN))
+            self.insert_after_cur(Layer(num_neurodes, LayerType.HIDDEN,
+                                        activation, initializer))
 
     def remove_hidden_layer(self):
         """
@@ -128,52 +197,69 @@ class LayerList(DoublyLinkedList):
         else:
             self.remove_after_cur()
 
-    def reconnect_nodes(self, input_layer, output_layer):
+    def back_propagate(self, expected, loss: Loss = None):
         """
-        Helper method which reconnects input and output nodes between the
-        given layers.
+        Method which back-propagates the expected values through the layers
+        iteratively, one layer at a time from tail to head of the
+        execution plan, instead of recursing through back_fire(). The
+        current position pointer is not moved.
 
-        Args:
-            input_layer: layer which is designated as the input layer
-            output_layer: layer which is designated as the output layer
-        """
-        self.reconnect_inputs(output_layer, input_layer)
-        self.reconnect_outputs(input_layer, output_layer)
-
-    @staticmethod
-    def reconnect_inputs(from_layer: Layer, connect_to: Layer):
-        """
-        Static helper method which connects each node in the from_layer
-        to input nodes in the connect_to
+        Output layer neurodes calculate their deltas from the expected
+        values. Every other layer calculates its deltas from the layer after
+        it and then updates the weights of that layer, so deltas are always
+        calculated from the weights of the forward pass.
 
         Args:
-            from_layer: layer to iterate through each node and connect to
-            input nodes in connect_to
-            connect_to: layer to connect each node in from_layer to
+            expected: list of expected values, one per output neurode
+            loss: Loss whose gradient gives the output deltas, None for
+              the squared error deltas of the output neurodes
         """
-
-        if from_layer.my_type is LayerType.INPUT:
-            pass
+        layers = self.plan.layers
+        layer = layers[-1]
+        if loss is None:
+            for node, value in zip(layer.neurodes, expected):
+                node.calculate_delta(value)
         else:
-            for node in from_layer.neurodes:
-                node.clear_and_add_input_nodes(connect_to.neurodes)
-
-    @staticmethod
-    def reconnect_outputs(from_layer: Layer, connect_to: Layer):
+            outputs = np.array([node.value for node in layer.neurodes])
+            deltas = loss.output_delta(outputs, np.asarray(expected,
+                                                           np.float64),
+                                       layer.activation)
+            for node, delta in zip(layer.neurodes, deltas.tolist()):
+                node.delta = delta
+
+        for layer in reversed(layers[:-1]):
+            for node in layer.neurodes:
+                node.calculate_delta()
+                node.update_weights()
+
+    def reconnect_nodes(self, input_layer: Layer, output_layer: Layer):
         """
-        Static helper method which connects each node in the from_layer
-        to output nodes in the connect_to
+        Helper method which connects every node of input_layer to every
+        node of output_layer, replacing their previous connections between
+        each other and any other layer.
+
+        The new weights are drawn by the initializer of output_layer, or
+        of the LayerList, into one matrix with a row per output node, and
+        each output node's input_weights is a view of its row. Every
+        output node shares one index of the input nodes, and every input
+        node one index of the output nodes.
 
         Args:
-            from_layer: layer to iterate through each node and connect to
-            output nodes in connect_to
-            connect_to: layer to connect each node in from_layer to
+            input_layer: layer which is designated as the input layer
+            output_layer: layer which is designated as the output layer
         """
-        if from_layer.my_type is LayerType.OUTPUT:
-            pass
-        else:
-            for node in from_layer.neurodes:
-                node.clear_and_add_output_nodes(connect_to.neurodes)
+        inputs = input_layer.neurodes
+        outputs = output_layer.neurodes
+        initializer = output_layer.initializer or self.initializer
+        matrix = initializer(self.rng, (len(outputs), len(inputs))).astype(
+            self.dtype, copy=False)
+        input_index = slot_index(inputs)
+        output_index = slot_index(outputs)
+        for row, node in enumerate(outputs):
+            node.set_input_nodes(inputs, matrix[row], input_index)
+        for node in inputs:
+            node.set_output_nodes(outputs, output_index)
+        output_layer.weights = matrix
 
 
 class NodePositionError(Exception):
@@ -276,7 +362,62 @@ def main():
     for i, node in enumerate(inputs[1].output_nodes):
         assert save_vals[i] != node.get_delta()
     assert saved_val == save_layer_for_later.get_my_neurodes()[0].get_value()
+    # inserting and removing a layer keeps the weights of every layer it
+    # does not reconnect
+    my_list = LayerList(3, 2, seed=0)
+    my_list.insert_hidden_layer(5)
+    my_list.insert_hidden_layer(4)
+    hidden_4, hidden_5, output = my_list.plan.layers[1:]
+    kept = {layer: layer.weights.copy() for layer in (hidden_4, output)}
+    my_list.iterate()
+    my_list.insert_hidden_layer(6)
+    assert [len(layer.neurodes) for layer in my_list.plan.layers] \
+        == [3, 4, 6, 5, 2]
+    assert my_list.plan.layers[3].weights.shape == (5, 6)
+    for layer, weights in kept.items():
+        assert np.array_equal(layer.weights, weights)
+    my_list.remove_hidden_layer()
+    assert hidden_5.weights.shape == (5, 4)
+    for layer, weights in kept.items():
+        assert np.array_equal(layer.weights, weights)
+    # every neurode reads its row of the layer's matrix, through one index
+    # of the previous layer shared by the whole layer
+    for previous, layer in zip(my_list.plan.layers, my_list.plan.layers[1:]):
+        for row, node in enumerate(layer.neurodes):
+            assert node.input_index is layer.neurodes[0].input_index
+            assert list(node.input_index) == previous.neurodes
+            node.input_weights[0] += 1
+            assert layer.weights[row, 0] == node.input_weights[0]
+            node.input_weights[0] -= 1
+    # weights added one connection at a time stay in the network dtype
+    small = LayerList(2, 1, dtype=np.float32)
+    node = small.get_output_nodes()[0]
+    for extra in range(5):
+        node.add_input_node(type(node)(LayerType.INPUT))
+    assert node.input_weights.dtype == np.float32
+    node.clear_and_add_input_nodes(small.get_input_nodes())
+    assert node.input_weights.dtype == np.float32
+    # the execution plan is cached until the topology changes, and passes
+    # through it leave the current position pointer alone
+    plan = my_list.plan
+    assert my_list.plan is plan
+    assert plan.layers == (my_list.head, hidden_4, hidden_5, output)
+    my_list.reset_cur()
+    my_list.iterate()
+    for node in my_list.get_input_nodes():
+        node.receive_input(None, 0.5)
+    my_list.back_propagate([0.2, 0.8])
+    assert my_list.current is hidden_4 and my_list.plan is plan
+    my_list.insert_hidden_layer(2)
+    assert my_list.plan is not plan and len(my_list.plan.layers) == 5
+    assert my_list.current is hidden_4
+    try:
+        plan.layers = ()
+        assert False
+    except AttributeError:
+        pass
     print("Done!")
 
 
-main()
+if __name__ == "__main__":
+    main()
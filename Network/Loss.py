@@ -0,0 +1,227 @@
+"""Module which holds the registry of loss functions the network can train
+against.
+
+Every loss works on whole arrays: a single example is a 1-D array of output
+values, a batch is a 2-D array with one example per row. Losses are reduced
+over the last axis, giving one value per example.
+
+Output deltas follow the sign convention of the neurodes, delta = -dL/dz
+where z is the weighted sum of an output neurode, so weights are updated by
+adding learning rate * delta * input value. Constant factors such as the 2
+of the squared error are left out, which keeps the step sizes the network
+has always used.
+"""
+import numpy as np
+
+EPSILON = 1e-12  # keeps logarithms and divisions of probabilities finite
+
+
+class Loss:
+    """
+    Loss function and its gradient.
+
+    Attributes:
+        name: name the loss is registered under
+        function: loss of each example given the outputs and the labels
+        gradient: derivative of the loss with respect to the outputs
+        canonical_activation: name of the output activation whose
+          derivative cancels with the gradient, so the output delta is
+          simply labels - outputs, or None
+    """
+
+    def __init__(self, name: str, function, gradient,
+                 canonical_activation: str = None):
+        """
+        Inits Loss with all class attributes initialized.
+
+        Args:
+            name: name to register the loss under
+            function: loss of each example given the outputs and the labels
+            gradient: derivative of the loss with respect to the outputs
+            canonical_activation: name of the output activation whose
+              derivative cancels with the gradient
+        """
+        self.name = name
+        self.function = function
+        self.gradient = gradient
+        self.canonical_activation = canonical_activation
+
+    def __repr__(self):
+        return "Loss(" + self.name + ")"
+
+    def output_delta(self, outputs: np.ndarray, labels: np.ndarray,
+                     activation) -> np.ndarray:
+        """
+        Calculates the deltas of the output neurodes.
+
+        Args:
+            outputs: values of the output layer
+            labels: expected values, same shape as outputs
+            activation: Activation of the output layer
+
+        Returns:
+            array of deltas, same shape as outputs
+        """
+        if activation.name == self.canonical_activation:
+            return labels - outputs
+        return activation.backward(outputs, -self.gradient(outputs, labels))
+
+
+def mean_squared_error(outputs: np.ndarray, labels: np.ndarray):
+    """Mean over the outputs of the squared errors"""
+    return np.mean(np.square(outputs - labels), axis=-1)
+
+
+def root_mean_squared_error(outputs: np.ndarray, labels: np.ndarray):
+    """Root of the mean over the outputs of the squared errors"""
+    return np.sqrt(mean_squared_error(outputs, labels))
+
+
+def squared_error_gradient(outputs: np.ndarray, labels: np.ndarray):
+    """Gradient of the squared errors, without the factor 2"""
+    return outputs - labels
+
+
+def binary_cross_entropy(outputs: np.ndarray, labels: np.ndarray):
+    """Mean over the outputs of the cross-entropy of independent
+    probabilities"""
+    outputs = np.clip(outputs, EPSILON, 1 - EPSILON)
+    return -np.mean(labels * np.log(outputs)
+                    + (1 - labels) * np.log(1 - outputs), axis=-1)
+
+
+def binary_cross_entropy_gradient(outputs: np.ndarray, labels: np.ndarray):
+    """Gradient of the binary cross-entropy of each output"""
+    outputs = np.clip(outputs, EPSILON, 1 - EPSILON)
+    return (outputs - labels) / (outputs * (1 - outputs))
+
+
+def categorical_cross_entropy(outputs: np.ndarray, labels: np.ndarray):
+    """Cross-entropy of a probability distribution over the outputs"""
+    return -np.sum(labels * np.log(np.clip(outputs, EPSILON, 1)), axis=-1)
+
+
+def categorical_cross_entropy_gradient(outputs: np.ndarray,
+                                       labels: np.ndarray):
+    """Gradient of the categorical cross-entropy of each output"""
+    return -labels / np.clip(outputs, EPSILON, 1)
+
+
+LOSSES = {}
+
+
+def register_loss(loss: Loss):
+    """
+    Adds a loss to the registry, replacing any loss already registered
+    under the same name.
+
+    Args:
+        loss: Loss to register
+    """
+    LOSSES[loss.name] = loss
+
+
+def get_loss(loss) -> Loss:
+    """
+    Looks up a loss in the registry.
+
+    Args:
+        loss: registered name, or a Loss which is returned unchanged
+
+    Returns:
+        Loss registered under the given name
+
+    Raises:
+        UnknownLossError: if no loss has the given name
+    """
+    if isinstance(loss, Loss):
+        return loss
+    if loss not in LOSSES:
+        raise UnknownLossError(loss)
+    return LOSSES[loss]
+
+
+# Minimizing the RMSE of an example is minimizing its squared error, whose
+# gradient stays finite where the error is zero
+register_loss(Loss('mse', mean_squared_error, squared_error_gradient))
+register_loss(Loss('rmse', root_mean_squared_error, squared_error_gradient))
+register_loss(Loss('binary_cross_entropy', binary_cross_entropy,
+                   binary_cross_entropy_gradient, 'sigmoid'))
+register_loss(Loss('categorical_cross_entropy', categorical_cross_entropy,
+                   categorical_cross_entropy_gradient, 'softmax'))
+
+
+class UnknownLossError(Exception):
+    """No loss is registered under the given name"""
+
+
+def main():
+    """Main Unit test for module"""
+    # Imported here, as MatrixEngine imports this module
+    from Network.Activation import ACTIVATIONS, get_activation
+    from Network.MatrixEngine import MatrixEngine
+
+    def assert_descent(delta, numeric):
+        """Deltas point down the numeric gradient, up to a constant factor
+        the losses leave out"""
+        scale = np.dot(delta, -numeric) / np.dot(delta, delta)
+        assert scale > 0 and np.allclose(delta * scale, -numeric,
+                                         atol=1e-7), (delta, numeric)
+
+    rng = np.random.default_rng(0)
+    step = 1e-6
+    sums = rng.uniform(-1, 1, 4)
+    labels = np.array([0.0, 1.0, 0.0, 0.0])
+    for loss in LOSSES.values():
+        probabilities = loss.name.endswith('cross_entropy')
+        for activation in ACTIVATIONS.values():
+            if probabilities and activation.name not in ('sigmoid',
+                                                          'softmax'):
+                continue
+            numeric = np.array([
+                (loss.function(activation.function(sums + shift), labels)
+                 - loss.function(activation.function(sums - shift), labels))
+                / (2 * step) for shift in np.eye(4) * step])
+            assert_descent(loss.output_delta(activation.function(sums),
+                                             labels, activation), numeric)
+
+    # Weight adjustments of a whole network, with a hidden softmax layer
+    weights = [rng.normal(size=(5, 3)), rng.normal(size=(4, 5))]
+    engine = MatrixEngine.detached(weights, [np.ones(5), np.ones(4)],
+                                   [get_activation('softmax'),
+                                    get_activation('tanh')])
+    examples = rng.random((2, 3))
+    targets = rng.uniform(-1, 1, (2, 4))
+    loss = get_loss('mse')
+
+    def total_loss():
+        return np.sum(loss.function(engine.forward_batch(examples),
+                                    targets))
+
+    numeric = []
+    for matrix in weights:
+        for position in np.ndindex(matrix.shape):
+            matrix[position] += step
+            higher = total_loss()
+            matrix[position] -= 2 * step
+            lower = total_loss()
+            matrix[position] += step
+            numeric.append((higher - lower) / (2 * step))
+    engine.forward_batch(examples)
+    adjustments = engine.batch_adjustments(targets, loss)
+    assert_descent(np.concatenate([adjustment.ravel()
+                                   for adjustment in adjustments]),
+                   np.array(numeric))
+
+    assert np.isclose(get_loss('categorical_cross_entropy').function(
+        np.array([0.2, 0.7, 0.1]), np.array([0, 1, 0])), -np.log(0.7))
+    try:
+        get_loss('nope')
+        assert False
+    except UnknownLossError:
+        pass
+    print("Done!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,509 @@
+"""Module which evaluates a LayerList one layer at a time with numpy
+matrix operations instead of one Python call per connection."""
+import numpy as np
+
+from Network.LayerList import LayerList
+from Network.Loss import Loss
+from Network.MultiLinkNode import slot_index
+
+
+class MatrixEngine:
+    """
+    Compute engine which stores the incoming weights of each Layer as a
+    numpy matrix and runs the forward and backward passes layer by layer,
+    evaluating each layer's activation in one vectorized call.
+
+    Binding copies the weights out of the neurodes into one matrix per
+    layer (rows are neurodes, columns are the neurodes of the previous
+    layer) and points each neurode's input_weights at its row, so the
+    weights stay readable and writable through the neurode API.
+    The engine re-binds itself whenever the ExecutionPlan of the LayerList
+    changes, reusing the matrix of every layer whose neurodes still read
+    their rows of it, so a topology edit only gathers the layers it
+    reconnected. Learning rates are gathered again whenever a learning rate
+    of a neurode in one of its layers is assigned after the bind.
+
+    Attributes:
+        layers: LayerList which is evaluated by the engine, None for a
+          detached engine
+        weights: list of weight matrices, one per non-input layer
+        learning_rates: list of learning rate vectors, one per non-input
+          layer, taken from the receiving neurodes
+        layer_activations: list of Activations, one per non-input layer
+        activations: list of layer values from the latest forward pass,
+          starting with the input values
+        dtype: numpy dtype of the weights and of every value the engine
+          calculates, the dtype of the LayerList
+    """
+
+    def __init__(self, layers: LayerList):
+        """
+        Inits MatrixEngine with all class attributes initialized.
+
+        Args:
+            layers: LayerList to evaluate
+        """
+        self.layers = layers
+        self.weights = []
+        self.learning_rates = []
+        self.layer_activations = []
+        self.activations = []
+        self.dtype = np.dtype(np.float64) if layers is None \
+            else layers.dtype
+        self._plan = None
+        self._rate_changes = None
+
+    def get_layers(self) -> list:
+        """
+        Lists the layers of the LayerList's execution plan, without moving
+        its current pointer.
+
+        Returns:
+            list of Layers in order from input to output
+        """
+        return list(self.layers.plan.layers)
+
+    def bind(self, weights: list = None):
+        """
+        Builds the weight matrices from the neurodes' current weights and
+        points every neurode's input_weights at its row of the matrix.
+
+        Args:
+            weights: optional list of weight matrices, one per non-input
+              layer, to bind in place of the neurodes' current weights.
+              The matrices are used as they are, so memory-mapped
+              matrices stay memory-mapped.
+
+        Raises:
+            WeightShapeError: if a given matrix does not match the size of
+              its layer and the previous layer
+        """
+        layers = self.get_layers()
+        replaced = False
+        self.weights = []
+        self.layer_activations = []
+
+        for position, (prev_layer, layer) in enumerate(zip(layers,
+                                                           layers[1:])):
+            inputs = prev_layer.neurodes
+            bound = weights is None and self.is_bound(layer, inputs)
+            if weights is None:
+                matrix = layer.weights
+                if not bound:
+                    matrix = np.array(
+                        [node.input_weights[[node.input_index[input_node]
+                                             for input_node in inputs]]
+                         for node in layer.neurodes], dtype=self.dtype)
+            else:
+                matrix = weights[position]
+                if matrix.shape != (len(layer.neurodes), len(inputs)):
+                    raise WeightShapeError(position)
+            if not bound:
+                index = slot_index(inputs)
+                for row, node in enumerate(layer.neurodes):
+                    node.input_index = index
+                    node.input_weights = matrix[row]
+
+            replaced = replaced or matrix is not layer.weights
+            layer.weights = matrix
+            self.weights.append(matrix)
+            self.layer_activations.append(layer.activation)
+
+        self.gather_learning_rates(layers)
+        if replaced:
+            self.layers.invalidate_plan()
+        self._plan = self.layers.plan
+
+    def gather_learning_rates(self, layers: list):
+        """
+        Copies the learning rates of the neurodes into one vector per
+        non-input layer.
+
+        Args:
+            layers: list of Layers in order from input to output
+        """
+        self._rate_changes = self.count_rate_changes(layers)
+        self.learning_rates = [
+            np.array([node.learning_rate for node in layer.neurodes],
+                     dtype=self.dtype) for layer in layers[1:]]
+
+    @staticmethod
+    def count_rate_changes(layers) -> int:
+        """
+        Helper method which totals the learning rate assignments counted
+        by the layers, a total which grows whenever any is assigned.
+
+        Args:
+            layers: sequence of Layers in order from input to output
+
+        Returns:
+            number of learning rate assignments
+        """
+        return sum(layer.rate_changes for layer in layers)
+
+    @staticmethod
+    def is_bound(layer, inputs: list) -> bool:
+        """
+        Helper method which checks whether every neurode of a layer reads
+        its weights from its row of the layer's matrix, through one shared
+        index of the previous layer's neurodes in order.
+
+        Args:
+            layer: Layer to check
+            inputs: list of neurodes of the previous layer
+
+        Returns:
+            True if the layer's matrix can be used as it is
+        """
+        matrix = layer.weights
+        num_inputs = len(inputs)
+        if matrix is None or matrix.ndim != 2 \
+                or matrix.shape != (len(layer.neurodes), num_inputs):
+            return False
+        index = layer.neurodes[0].input_index
+        if isinstance(index, dict) or list(index) != inputs:
+            return False
+        address = matrix.__array_interface__['data'][0]
+        for row, node in enumerate(layer.neurodes):
+            weights = node.input_weights
+            if node.input_index is not index \
+                    or weights.shape != (num_inputs,) \
+                    or weights.strides != matrix.strides[1:] \
+                    or weights.__array_interface__['data'][0] \
+                    != address + row * matrix.strides[0]:
+                return False
+        return True
+
+    def ensure_bound(self):
+        """Re-binds the engine if the execution plan of the layers changed
+        since the last bind, and gathers the learning rates again if any
+        was assigned. A detached engine has no layers to follow."""
+        if self.layers is None:
+            return
+        if self._plan is not self.layers.plan:
+            self.bind()
+        elif self._rate_changes \
+                != self.count_rate_changes(self._plan.layers):
+            self.gather_learning_rates(self.get_layers())
+
+    @classmethod
+    def detached(cls, weights: list, learning_rates: list,
+                 layer_activations: list):
+        """
+        Builds an engine which evaluates the given matrices without any
+        LayerList, e.g. in a worker process holding only the weights. The
+        engine calculates in the dtype of the matrices.
+
+        Args:
+            weights: list of weight matrices, one per non-input layer
+            learning_rates: list of learning rate vectors, one per
+              non-input layer
+            layer_activations: list of Activations, one per non-input layer
+
+        Returns:
+            MatrixEngine whose layers are None
+        """
+        engine = cls(None)
+        engine.weights = list(weights)
+        engine.learning_rates = list(learning_rates)
+        engine.layer_activations = list(layer_activations)
+        if engine.weights:
+            engine.dtype = engine.weights[0].dtype
+        return engine
+
+    def forward(self, inputs) -> np.ndarray:
+        """
+        Runs one example through the network, one matrix product per layer.
+
+        The values of the output layer are written back to the output
+        neurodes so that FFBPNetwork can collect them as usual.
+
+        Args:
+            inputs: list or array of input values
+
+        Returns:
+            Array of output values
+        """
+        self.ensure_bound()
+        values = np.asarray(inputs, dtype=self.dtype)
+        self.activations = [values]
+
+        for position in range(len(self.weights)):
+            values = self.forward_layer(position, values)
+            self.activations.append(values)
+
+        for node, value in zip(self.layers.get_output_nodes(), values):
+            node.value = value
+        return values
+
+    def output_delta(self, expected, loss: Loss = None) -> np.ndarray:
+        """
+        Calculates the output layer deltas of the latest forward pass.
+
+        Args:
+            expected: expected output values, same shape as the outputs
+            loss: Loss whose gradient is used, None for the squared error
+
+        Returns:
+            array of output deltas, same shape as the outputs
+        """
+        outputs = self.activations[-1]
+        expected = np.asarray(expected, dtype=self.dtype)
+        if loss is None:
+            return self.layer_activations[-1].backward(outputs,
+                                                       expected - outputs)
+        return loss.output_delta(outputs, expected,
+                                 self.layer_activations[-1])
+
+    def backward(self, expected, loss: Loss = None):
+        """
+        Back-propagates the expected values of the latest forward pass and
+        updates every weight matrix in place.
+
+        Hidden deltas are calculated from the downstream weights before
+        those weights are updated, matching the neurode implementation.
+
+        Args:
+            expected: list or array of expected output values
+            loss: Loss whose gradient is used, None for the squared error
+        """
+        delta = self.output_delta(expected, loss)
+
+        for position in range(len(self.weights) - 1, -1, -1):
+            adjustment, delta = self.backward_layer(position, delta)
+            self.weights[position] += adjustment
+
+    def forward_layer(self, position: int, values: np.ndarray) -> np.ndarray:
+        """
+        Evaluates one layer from the values of the layer before it.
+
+        Args:
+            position: position of the layer's weight matrix in weights
+            values: 1-D values of the previous layer, or 2-D with one row
+              per example
+
+        Returns:
+            values of the layer, same number of dimensions as values
+        """
+        matrix = self.weights[position]
+        if values.ndim == 1:
+            return self.layer_activations[position].function(matrix @ values)
+        return self.layer_activations[position].function(values @ matrix.T)
+
+    def backward_layer(self, position: int, delta: np.ndarray) -> tuple:
+        """
+        Calculates the weight adjustment of one layer and the deltas of the
+        layer before it, from the weights of the forward pass.
+
+        Args:
+            position: position of the layer's weight matrix in weights
+            delta: 1-D deltas of the layer, or 2-D with one row per example
+
+        Returns:
+            tuple of the adjustment matrix, summed over the examples, and
+            the deltas of the previous layer, or delta unchanged for the
+            first layer
+        """
+        matrix = self.weights[position]
+        values = self.activations[position]
+        if delta.ndim == 1:
+            adjustment = np.outer(self.learning_rates[position] * delta,
+                                  values)
+        else:
+            adjustment = self.learning_rates[position][:, np.newaxis] \
+                * (delta.T @ values)
+
+        if position > 0:
+            activation = self.layer_activations[position - 1]
+            if delta.ndim == 1:
+                delta = activation.backward(values, matrix.T @ delta)
+            else:
+                delta = activation.backward(values, delta @ matrix)
+        return adjustment, delta
+
+    def forward_batch(self, inputs) -> np.ndarray:
+        """
+        Runs a batch of examples through the network, one matrix product
+        per layer for the whole batch.
+
+        Args:
+            inputs: list of rows or 2-D array of input values, one row per
+              example
+
+        Returns:
+            2-D array of output values, one row per example
+        """
+        self.ensure_bound()
+        values = np.asarray(inputs, dtype=self.dtype)
+        self.activations = [values]
+
+        for position in range(len(self.weights)):
+            values = self.forward_layer(position, values)
+            self.activations.append(values)
+        return values
+
+    def predict(self, inputs, batch_size: int = 4096) -> np.ndarray:
+        """
+        Runs examples through the network without keeping the layer
+        values, so nothing is left behind for a backward pass.
+
+        Args:
+            inputs: list of rows or 2-D array of input values, one row per
+              example
+            batch_size: number of rows evaluated per matrix product, which
+              bounds the memory used by intermediate layer values
+
+        Returns:
+            2-D array of output values, one row per example
+        """
+        self.ensure_bound()
+        inputs = np.asarray(inputs, dtype=self.dtype)
+        outputs = np.empty((len(inputs), len(self.weights[-1])), self.dtype)
+
+        for start in range(0, len(inputs), batch_size):
+            values = inputs[start:start + batch_size]
+            for position in range(len(self.weights)):
+                values = self.forward_layer(position, values)
+            outputs[start:start + batch_size] = values
+        return outputs
+
+    def batch_adjustments(self, expected, loss: Loss = None) -> list:
+        """
+        Calculates the weight adjustments of the latest batch forward pass
+        without applying them.
+
+        Args:
+            expected: list of rows or 2-D array of expected output values,
+              one row per example
+            loss: Loss whose gradient is used, None for the squared error
+
+        Returns:
+            list of adjustment matrices, one per weight matrix, each summed
+            over the examples of the batch
+        """
+        delta = self.output_delta(expected, loss)
+        adjustments = [None] * len(self.weights)
+
+        for position in range(len(self.weights) - 1, -1, -1):
+            adjustments[position], delta = self.backward_layer(position,
+                                                               delta)
+        return adjustments
+
+    def backward_batch(self, expected, loss: Loss = None):
+        """
+        Back-propagates the expected values of the latest batch forward
+        pass and applies one weight update per layer, averaged over the
+        batch.
+
+        Args:
+            expected: list of rows or 2-D array of expected output values,
+              one row per example
+            loss: Loss whose gradient is used, None for the squared error
+        """
+        size = len(self.activations[-1])
+        for matrix, adjustment in zip(self.weights,
+                                      self.batch_adjustments(expected,
+                                                             loss)):
+            adjustment /= size
+            matrix += adjustment
+
+
+class WeightShapeError(Exception):
+    """Weight matrix does not match the size of its layers"""
+
+
+def main():
+    """Main Unit test for module"""
+    # Imported here, as FFBPNetwork imports this module
+    import random
+    from Network.FFBPNetwork import FFBPNetwork
+
+    networks = []
+    for engine in FFBPNetwork.Engine:
+        random.seed(1)
+        network = FFBPNetwork(3, 2, engine)
+        network.add_hidden_layer(4)
+        network.add_hidden_layer(5, 'tanh')
+        networks.append(network)
+    object_network, matrix_network = networks
+
+    rng = np.random.default_rng(1)
+    for _ in range(20):
+        example = rng.random(3).tolist()
+        label = rng.random(2).tolist()
+        for network in networks:
+            network.send_data_to_inputs(example)
+        assert np.allclose(object_network.collect_outputs(),
+                           matrix_network.collect_outputs())
+        for network in networks:
+            network.send_data_to_outputs(label)
+    for object_layer, matrix_layer in zip(
+            object_network.matrix_engine.get_layers(),
+            matrix_network.matrix_engine.get_layers()):
+        for object_node, matrix_node in zip(object_layer.neurodes,
+                                            matrix_layer.neurodes):
+            assert np.allclose(list(object_node.input_nodes.values()),
+                               list(matrix_node.input_nodes.values()))
+
+    # Learning rates set after the bind are used by the next update
+    engine = matrix_network.matrix_engine
+    for node in matrix_network.layers.get_output_nodes():
+        node.learning_rate = 0
+    before = engine.weights[-1].copy()
+    matrix_network.send_data_to_inputs(example)
+    matrix_network.send_data_to_outputs(label)
+    assert np.array_equal(engine.weights[-1], before)
+    for node in matrix_network.layers.get_output_nodes():
+        node.learning_rate = 0.05
+    # Building or editing another network leaves these rates alone
+    engine.ensure_bound()
+    rates = engine.learning_rates
+    FFBPNetwork(3, 2, FFBPNetwork.Engine.MATRIX).add_hidden_layer(4)
+    engine.ensure_bound()
+    assert engine.learning_rates is rates
+
+    # A batch update is the average of the online updates of its examples,
+    # each taken from the same starting weights
+    examples = rng.random((4, 3))
+    labels = rng.random((4, 2))
+    start = [matrix.copy() for matrix in engine.weights]
+    online = [np.zeros_like(matrix) for matrix in start]
+    for example, label in zip(examples, labels):
+        for matrix, weights in zip(engine.weights, start):
+            matrix[:] = weights
+        engine.forward(example)
+        engine.backward(label)
+        for total, matrix, weights in zip(online, engine.weights, start):
+            total += (matrix - weights) / len(examples)
+    for matrix, weights in zip(engine.weights, start):
+        matrix[:] = weights
+    engine.forward_batch(examples)
+    engine.backward_batch(labels)
+    for total, matrix, weights in zip(online, engine.weights, start):
+        assert np.allclose(matrix - weights, total)
+
+    # A float32 network trains in float32 on float16 data, and stays close
+    # to the same network in float64
+    from Network.NNData import NNData
+    x = rng.random((40, 3))
+    y = np.sin(x[:, :2]) / 2
+    results = []
+    for dtype in (np.float64, np.float32):
+        network = FFBPNetwork(3, 2, FFBPNetwork.Engine.MATRIX, seed=0,
+                              dtype=dtype)
+        network.add_hidden_layer(4, 'tanh')
+        data_set = NNData(x, y, 100, NNData.Storage.NUMPY, np.float16,
+                          seed=0)
+        network.train(data_set, 5, 0, NNData.Order.SEQUENTIAL)
+        network.train(data_set, 5, 0, NNData.Order.SEQUENTIAL, batch_size=4)
+        assert all(matrix.dtype == dtype
+                   for matrix in network.matrix_engine.weights)
+        assert network.matrix_engine.learning_rates[0].dtype == dtype
+        results.append(network.predict(x))
+        assert results[-1].dtype == dtype
+    assert np.allclose(results[0], results[1], atol=1e-3)
+    print("Done!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,507 @@
+"""Module which collects training progress and reports it to sinks.
+
+Errors are accumulated with running sums while an epoch runs, and the
+outputs of an epoch are only kept on epochs whose details are reported.
+Records are handed to a background thread which writes them to the sinks,
+so formatting and I/O stay off the training loop. The csv and json
+modules are only imported by the sinks which write them, so importing the
+network does not load them.
+"""
+import queue
+import sys
+import threading
+import time
+
+import numpy as np
+
+
+class MetricsSink:
+    """
+    Destination of training progress records. Subclasses override the
+    methods for the records they handle.
+    """
+
+    def write_epoch(self, record: dict):
+        """
+        Writes the summary of one epoch.
+
+        Args:
+            record: dict of epoch, samples, loss, rmse, mae, max_error and
+              seconds
+        """
+
+    def write_detail(self, epoch: int, outputs: list, labels: list):
+        """
+        Writes every output and label of one epoch.
+
+        Args:
+            epoch: epoch the outputs belong to
+            outputs: list of output rows
+            labels: list of label rows
+        """
+
+    def flush(self):
+        """Writes out anything buffered by the sink."""
+
+    def close(self):
+        """Flushes the sink and releases its resources."""
+        self.flush()
+
+
+class StdoutSink(MetricsSink):
+    """Prints epoch summaries and details in the network's usual format."""
+
+    def __init__(self, stream=None):
+        """
+        Inits StdoutSink.
+
+        Args:
+            stream: text stream to print to, defaults to sys.stdout
+        """
+        self.stream = stream
+
+    def write_epoch(self, record: dict):
+        print("Epoch: ", record['epoch'], "RMSE: ", record['rmse'],
+              file=self.stream or sys.stdout)
+
+    def write_detail(self, epoch: int, outputs: list, labels: list):
+        lines = ['[' + str(output) + ', ' + str(label) + ']'
+                 for output, label in zip(outputs, labels)]
+        print('[' + '\n'.join(lines) + '\n', file=self.stream or sys.stdout)
+
+    def flush(self):
+        (self.stream or sys.stdout).flush()
+
+
+class CSVSink(MetricsSink):
+    """
+    Writes epoch summaries as rows of a CSV file.
+
+    Attributes:
+        file: open CSV file
+        writer: csv.DictWriter writing to file
+    """
+
+    FIELDS = ('epoch', 'samples', 'loss', 'rmse', 'mae', 'max_error',
+              'seconds')
+
+    def __init__(self, path: str):
+        """
+        Inits CSVSink and writes the header row.
+
+        Args:
+            path: path of the CSV file, overwritten if it exists
+        """
+        import csv
+        self.file = open(path, 'w', newline='')
+        self.writer = csv.DictWriter(self.file, CSVSink.FIELDS)
+        self.writer.writeheader()
+
+    def write_epoch(self, record: dict):
+        self.writer.writerow(record)
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class JSONLinesSink(MetricsSink):
+    """
+    Writes every record as one JSON object per line.
+
+    Attributes:
+        file: open JSON-lines file
+    """
+
+    def __init__(self, path: str):
+        """
+        Inits JSONLinesSink.
+
+        Args:
+            path: path of the file, overwritten if it exists
+        """
+        self.file = open(path, 'w')
+
+    def write_epoch(self, record: dict):
+        import json
+        self.file.write(json.dumps(record) + '\n')
+
+    def write_detail(self, epoch: int, outputs: list, labels: list):
+        import json
+        self.file.write(json.dumps({'epoch': epoch,
+                                    'outputs': np.asarray(outputs).tolist(),
+                                    'labels': np.asarray(labels).tolist()})
+                        + '\n')
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class MemorySink(MetricsSink):
+    """
+    Keeps every record in memory.
+
+    Attributes:
+        epochs: list of epoch summary dicts
+        details: list of (epoch, outputs, labels) tuples
+    """
+
+    def __init__(self):
+        """Inits MemorySink with no records."""
+        self.epochs = []
+        self.details = []
+
+    def write_epoch(self, record: dict):
+        self.epochs.append(record)
+
+    def write_detail(self, epoch: int, outputs: list, labels: list):
+        self.details.append((epoch, outputs, labels))
+
+
+class BackgroundWriter:
+    """
+    Thread which hands queued records to the sinks, so the thread which
+    emits them never waits on formatting or I/O.
+
+    Attributes:
+        sinks: list of MetricsSinks records are written to
+        records: queue of (method name, args) tuples waiting to be written
+        thread: daemon thread writing the records
+        error: first exception raised by a sink, re-raised by flush
+    """
+
+    QUEUE_SIZE = 1024
+
+    def __init__(self, sinks: list):
+        """
+        Inits BackgroundWriter and starts its thread.
+
+        Args:
+            sinks: list of MetricsSinks to write to
+        """
+        self.sinks = sinks
+        self.records = queue.Queue(BackgroundWriter.QUEUE_SIZE)
+        self.error = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        """Writes queued records until None is queued."""
+        while True:
+            item = self.records.get()
+            try:
+                if item is None:
+                    return
+                if self.error is None:
+                    method, args = item
+                    for sink in self.sinks:
+                        getattr(sink, method)(*args)
+                    if self.records.empty():
+                        for sink in self.sinks:
+                            sink.flush()
+            except Exception as error:  # pylint: disable=broad-except
+                self.error = error
+            finally:
+                self.records.task_done()
+
+    def put(self, method: str, *args):
+        """
+        Queues a record for the sinks.
+
+        Args:
+            method: name of the MetricsSink method to call
+            args: arguments of the method
+        """
+        self.records.put((method, args))
+
+    def flush(self):
+        """
+        Waits until every queued record is written.
+
+        Raises:
+            Exception: the first exception raised by a sink, if any
+        """
+        self.records.join()
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def close(self):
+        """Writes every queued record, stops the thread and closes the
+        sinks."""
+        self.records.put(None)
+        self.thread.join()
+        for sink in self.sinks:
+            sink.close()
+        self.flush()
+
+
+class Metrics:
+    """
+    Running error statistics of the training loop, reported to sinks.
+
+    Attributes:
+        writer: BackgroundWriter the records are sent to
+        report_every: epochs between two epoch summaries, 0 for never
+        detail_every: epochs between two reports of every output and
+          label, 0 for never
+        loss: Loss reported as the loss of each epoch, None for the mean
+          squared error
+        epoch: epoch being accumulated
+        samples: number of examples accumulated in the epoch
+        total_loss: sum over the examples of their loss, if loss is set
+        squared_error: sum over the examples of their mean squared error
+        absolute_error: sum over the examples of their mean absolute error
+        max_error: largest absolute error of a single output
+        outputs: output rows of the epoch, kept on detail epochs only
+        labels: label rows of the epoch, kept on detail epochs only
+        start_time: perf_counter value at the start of the epoch
+    """
+
+    def __init__(self, sinks: list, report_every: int = 100,
+                 detail_every: int = 0):
+        """
+        Inits Metrics and starts its background writer.
+
+        Args:
+            sinks: list of MetricsSinks to report to
+            report_every: epochs between two epoch summaries, 0 for never
+            detail_every: epochs between two reports of every output and
+              label, 0 for never
+        """
+        self.writer = BackgroundWriter(sinks)
+        self.report_every = report_every
+        self.detail_every = detail_every
+        self.loss = None
+        self.epoch = 0
+        self.samples = 0
+        self.total_loss = 0.0
+        self.squared_error = 0.0
+        self.absolute_error = 0.0
+        self.max_error = 0.0
+        self.outputs = None
+        self.labels = None
+        self.start_time = 0.0
+
+    @classmethod
+    def from_verbosity(cls, verbosity: int):
+        """
+        Builds the stdout reporting FFBPNetwork.train used to print.
+
+        Args:
+            verbosity: if this value is less than 1, it will not print the
+              label data. If this value is less than 0 it will print
+              nothing
+
+        Returns:
+            Metrics printing the RMSE every 100 epochs if verbosity > 0,
+            and every output and label every 1000 epochs if verbosity > 1
+        """
+        return cls([StdoutSink()], 100 if verbosity > 0 else 0,
+                   1000 if verbosity > 1 else 0)
+
+    @staticmethod
+    def is_due(epoch: int, every: int) -> bool:
+        """Helper method which tells if a report is due on the epoch"""
+        return every > 0 and epoch % every == 0
+
+    def start_epoch(self, epoch: int):
+        """
+        Resets the running statistics for a new epoch.
+
+        Args:
+            epoch: epoch about to run
+        """
+        self.epoch = epoch
+        self.samples = 0
+        self.total_loss = 0.0
+        self.squared_error = 0.0
+        self.absolute_error = 0.0
+        self.max_error = 0.0
+        if self.is_due(epoch, self.detail_every):
+            self.outputs = []
+            self.labels = []
+        else:
+            self.outputs = self.labels = None
+        self.start_time = time.perf_counter()
+
+    def update(self, output, label):
+        """
+        Adds one example to the running statistics.
+
+        Args:
+            output: list of output values
+            label: list of expected values
+        """
+        squared, absolute, largest = 0.0, 0.0, self.max_error
+        for value, expected in zip(output, label):
+            error = abs(value - expected)
+            squared += error * error
+            absolute += error
+            if error > largest:
+                largest = error
+        size = len(output)
+        self.samples += 1
+        self.squared_error += squared / size
+        self.absolute_error += absolute / size
+        self.max_error = largest
+        if self.loss is not None:
+            self.total_loss += float(self.loss.function(
+                np.asarray(output, dtype=np.float64),
+                np.asarray(label, dtype=np.float64)))
+        if self.outputs is not None:
+            self.outputs.append(output)
+            self.labels.append(label)
+
+    def update_batch(self, outputs: np.ndarray, labels):
+        """
+        Adds a batch of examples to the running statistics.
+
+        Args:
+            outputs: 2-D array of output values, one row per example
+            labels: expected values, one row per example
+        """
+        labels = np.asarray(labels, dtype=np.float64)
+        errors = np.abs(outputs - labels)
+        self.samples += len(errors)
+        self.squared_error += float(np.sum(np.mean(np.square(errors),
+                                                   axis=1)))
+        self.absolute_error += float(np.sum(np.mean(errors, axis=1)))
+        if errors.size:
+            self.max_error = max(self.max_error, float(errors.max()))
+        if self.loss is not None:
+            self.total_loss += float(np.sum(self.loss.function(outputs,
+                                                               labels)))
+        if self.outputs is not None:
+            self.outputs.extend(outputs.tolist())
+            self.labels.extend(labels.tolist())
+
+    def rmse(self) -> float:
+        """Returns the root mean squared error of the epoch so far"""
+        return float(np.sqrt(self.squared_error / max(self.samples, 1)))
+
+    def mean_loss(self) -> float:
+        """Returns the mean loss of the examples of the epoch so far"""
+        total = self.squared_error if self.loss is None else self.total_loss
+        return total / max(self.samples, 1)
+
+    def end_epoch(self) -> float:
+        """
+        Sends the reports due on the epoch to the background writer.
+
+        Returns:
+            root mean squared error of the epoch
+        """
+        rmse = self.rmse()
+        if self.outputs is not None:
+            self.writer.put('write_detail', self.epoch, self.outputs,
+                            self.labels)
+            self.outputs = self.labels = None
+        if self.is_due(self.epoch, self.report_every):
+            self.writer.put('write_epoch', {
+                'epoch': self.epoch,
+                'samples': self.samples,
+                'loss': self.mean_loss(),
+                'rmse': rmse,
+                'mae': self.absolute_error / max(self.samples, 1),
+                'max_error': self.max_error,
+                'seconds': time.perf_counter() - self.start_time})
+        return rmse
+
+    def flush(self):
+        """Waits until every report sent so far is written."""
+        self.writer.flush()
+
+    def close(self):
+        """Writes every report and closes the sinks."""
+        self.writer.close()
+
+
+def main():
+    """Main Unit test for module"""
+    # Only the self-test reads the sinks' files back
+    import contextlib
+    import csv
+    import io
+    import json
+    import os
+    import tempfile
+    from Network.Loss import get_loss
+    # Imported here, as FFBPNetwork imports this module
+    from Network.FFBPNetwork import FFBPNetwork
+    from Network.NNData import NNData
+
+    rng = np.random.default_rng(0)
+    outputs = rng.random((6, 2))
+    labels = rng.random((6, 2))
+    errors = np.abs(outputs - labels)
+
+    with tempfile.TemporaryDirectory() as directory:
+        memory = MemorySink()
+        stream = io.StringIO()
+        csv_path = os.path.join(directory, 'metrics.csv')
+        json_path = os.path.join(directory, 'metrics.jsonl')
+        metrics = Metrics([memory, StdoutSink(stream), CSVSink(csv_path),
+                           JSONLinesSink(json_path)], 2, 3)
+        metrics.loss = get_loss('mse')
+        for epoch in range(4):
+            metrics.start_epoch(epoch)
+            if epoch % 2:
+                metrics.update_batch(outputs, labels)
+            else:
+                for output, label in zip(outputs.tolist(), labels.tolist()):
+                    metrics.update(output, label)
+            rmse = metrics.end_epoch()
+            assert np.isclose(rmse, np.sqrt(np.mean(np.square(errors))))
+        metrics.close()
+
+        # One example at a time and whole batches give the same statistics
+        assert [record['epoch'] for record in memory.epochs] == [0, 2]
+        for record in memory.epochs:
+            assert record['samples'] == 6
+            assert np.isclose(record['mae'], np.mean(errors))
+            assert np.isclose(record['max_error'], np.max(errors))
+            assert np.isclose(record['loss'], np.mean(np.square(errors)))
+        assert [detail[0] for detail in memory.details] == [0, 3]
+        assert np.allclose(memory.details[1][1], outputs)
+        assert stream.getvalue().count('Epoch:') == 2
+        with open(csv_path, newline='') as file:
+            assert [int(row['epoch']) for row in csv.DictReader(file)] \
+                == [0, 2]
+        with open(json_path) as file:
+            assert len([json.loads(line) for line in file]) == 4
+
+    class FailingSink(MetricsSink):
+        """Sink which cannot write"""
+
+        def write_epoch(self, record: dict):
+            raise OSError("disk full")
+
+    metrics = Metrics([FailingSink()], 1)
+    metrics.start_epoch(0)
+    metrics.end_epoch()
+    try:
+        metrics.flush()
+        assert False
+    except OSError:
+        pass
+    metrics.close()
+
+    # Training prints nothing of its own when it is given metrics
+    network = FFBPNetwork(2, 1)
+    memory = MemorySink()
+    stream = io.StringIO()
+    with contextlib.redirect_stdout(stream):
+        network.train(NNData(outputs, labels[:, :1], 100), 3,
+                      metrics=Metrics([memory], 1))
+    assert stream.getvalue() == '' and len(memory.epochs) == 3
+    print("Done!")
+
+
+if __name__ == "__main__":
+    main()
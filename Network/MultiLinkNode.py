@@ -1,6 +1,10 @@
-# TODO Optimize imports, math ( np )
 from abc import ABC, abstractmethod
-from collections import OrderedDict
+from types import MappingProxyType
+
+import numpy as np
+
+from Network.BitArray import BitArray
+from Network.WeightView import WeightView
 
 
 class MultiLinkNode(ABC):
@@ -8,6 +12,12 @@ class MultiLinkNode(ABC):
     Abstract class which sets up the framework for different types of nodes
     to be used in the neural network.
 
+    The class uses __slots__ and keeps the weights of its input connections
+    in one contiguous array indexed by connection slot, so large networks
+    carry no per-node attribute or OrderedDict overhead. Nodes connected to
+    the same list of nodes in one step share a single read-only index of
+    it, so a layer holds one index instead of one per node.
+
     Attributes:
         input_connections: int representing the number of current input
           connections the node has
@@ -15,6 +25,23 @@ class MultiLinkNode(ABC):
         output_connections: int representing the number of current output
           connections the node has
 
+        input_index: mapping of each input node to its connection slot, in
+          connection order. A read-only index shared with the rest of the
+          layer after set_input_nodes, copied before it is changed.
+
+        output_index: mapping of each output node to its connection slot,
+          in connection order, shared like input_index
+
+        input_weights: array of input weights indexed by connection slot,
+          in the dtype of the network. May be longer than
+          input_connections to leave room to grow.
+
+        input_reports: BitArray of input slots which have provided input
+          to this node
+
+        output_reports: BitArray of output slots which have provided input
+          to this node
+
         reporting_inputs: binary-encoded representation of input nodes which
           have provided input to this node
 
@@ -27,24 +54,27 @@ class MultiLinkNode(ABC):
         compare_outputs_full: binary-encoded representation of all ouput nodes
           reporting 'full' to be used to compare against reporting_outputs
 
-        input_nodes: Ordered dictionary of input nodes and corresponding
-          their weights
+        input_nodes: dictionary-like WeightView of input nodes and their
+          corresponding weights
 
-        output_nodes: Ordered dictionary of input nodes and corresponding
-          their weights
+        output_nodes: Ordered dictionary of output nodes and their
+          connection slots
     """
 
+    __slots__ = ('input_connections', 'output_connections', 'input_index',
+                 'output_index', 'input_weights', 'input_reports',
+                 'output_reports')
+
     def __init__(self):
         """Inits MultiLinkNode with all class attributes initialized."""
 
         self.input_connections: int = 0  # number of input connections
         self.output_connections: int = 0  # number of output connections
-        self.reporting_inputs: int = 0  # Binary which inputs gave info
-        self.reporting_outputs: int = 0  # Binary which outputs gave info
-        self.compare_inputs_full: int = 0  # Binary reported input nodes
-        self.compare_outputs_full: int = 0  # Binary output nodes
-        self.input_nodes: OrderedDict = OrderedDict()  # Ordered Dictionary
-        self.output_nodes: OrderedDict = OrderedDict()  # Ordered Dictionary
+        self.input_index: dict = {}  # input node -> connection slot
+        self.output_index: dict = {}  # output node -> connection slot
+        self.input_weights = np.empty(0)  # weights by input slot
+        self.input_reports = BitArray()  # which inputs gave info
+        self.output_reports = BitArray()  # which outputs gave info
 
     def __str__(self):
         """Stringizer"""
@@ -57,6 +87,44 @@ class MultiLinkNode(ABC):
             ret_str = ret_str + "   " + str(id(key)) + "\n"
         return ret_str
 
+    @property
+    def input_nodes(self) -> WeightView:
+        """Input nodes and their weights, viewed over input_weights"""
+        return WeightView(self.input_index, self.input_weights)
+
+    @property
+    def output_nodes(self) -> dict:
+        """Output nodes in connection order"""
+        return self.output_index
+
+    @property
+    def reporting_inputs(self) -> int:
+        """Binary-encoded input nodes which have provided input"""
+        return int(self.input_reports)
+
+    @reporting_inputs.setter
+    def reporting_inputs(self, value: int):
+        self.input_reports.load(value)
+
+    @property
+    def reporting_outputs(self) -> int:
+        """Binary-encoded output nodes which have provided input"""
+        return int(self.output_reports)
+
+    @reporting_outputs.setter
+    def reporting_outputs(self, value: int):
+        self.output_reports.load(value)
+
+    @property
+    def compare_inputs_full(self) -> int:
+        """Binary-encoded representation of all input nodes reporting"""
+        return 2 ** self.input_connections - 1
+
+    @property
+    def compare_outputs_full(self) -> int:
+        """Binary-encoded representation of all output nodes reporting"""
+        return 2 ** self.output_connections - 1
+
     @abstractmethod
     def process_new_input_node(self, node):
         """
@@ -83,8 +151,8 @@ class MultiLinkNode(ABC):
         Clears input_nodes.
         Sets input_connections to 0.
         Sets reporting_inputs to 0.
-        Sets the input_nodes dictionary to the given list of nodes with key
-          values set to None.
+        Connects each node of the given list to its own input slot, in
+          order.
 
         Args:
             nodes: list of nodes to be added
@@ -103,8 +171,8 @@ class MultiLinkNode(ABC):
         Clears output_nodes.
         Sets output_connections to 0.
         Sets reporting_outputs to 0.
-        Sets the output_nodes dictionary to the given list of nodes with key
-          values set to None.
+        Connects each node of the given list to its own output slot, in
+          order.
 
         Args:
             nodes: list of nodes to be added
@@ -115,27 +183,83 @@ class MultiLinkNode(ABC):
         for node in nodes:
             self.add_output_node(node)
 
+    def set_input_nodes(self, nodes: list, weights, index=None):
+        """
+        Method which replaces the input connections with the given nodes in
+        one step, without a process_new_input_node call per node.
+
+        Args:
+            nodes: list of nodes, connected to slots in order
+            weights: array with one weight per node, used as input_weights
+              without copying
+            index: slot_index of nodes to share with other nodes, built
+              if None
+        """
+        self.input_index = slot_index(nodes) if index is None else index
+        self.input_weights = weights
+        self.input_connections = len(nodes)
+        self.input_reports = BitArray(len(nodes))
+
+    def set_output_nodes(self, nodes: list, index=None):
+        """
+        Method which replaces the output connections with the given nodes
+        in one step, without a process_new_output_node call per node.
+
+        Args:
+            nodes: list of nodes, connected to slots in order
+            index: slot_index of nodes to share with other nodes, built
+              if None
+        """
+        self.output_index = slot_index(nodes) if index is None else index
+        self.output_connections = len(nodes)
+        self.output_reports = BitArray(len(nodes))
+
     def add_input_node(self, node):
-        self.input_nodes[node] = None
-        self.process_new_input_node(node)
+        slot = self.input_connections
+        if slot == len(self.input_weights):
+            # Grow in the dtype of the network the weights came from
+            weights = np.empty(max(4, 2 * slot), self.input_weights.dtype)
+            weights[:slot] = self.input_weights
+            self.input_weights = weights
+        if not isinstance(self.input_index, dict):
+            self.input_index = dict(self.input_index)
+        self.input_index[node] = slot
         self.input_connections += 1
-        self.compare_inputs_full = 2 ** self.input_connections - 1
+        self.input_reports.resize(self.input_connections)
+        self.process_new_input_node(node)
 
     def add_output_node(self, node):
-        self.output_nodes[node] = None
-        self.process_new_output_node(node)
+        if not isinstance(self.output_index, dict):
+            self.output_index = dict(self.output_index)
+        self.output_index[node] = self.output_connections
         self.output_connections += 1
-        self.compare_outputs_full = 2 ** self.output_connections - 1
+        self.output_reports.resize(self.output_connections)
+        self.process_new_output_node(node)
 
     def clear_outputs(self):
-        self.output_nodes = OrderedDict()
+        self.output_index = {}
         self.output_connections = 0
-        self.compare_outputs_full = 0
+        self.output_reports = BitArray()
 
     def clear_inputs(self):
-        self.input_nodes = OrderedDict()
+        self.input_index = {}
+        self.input_weights = np.empty(0, self.input_weights.dtype)
         self.input_connections = 0
-        self.compare_inputs_full = 0
+        self.input_reports = BitArray()
+
+
+def slot_index(nodes: list) -> MappingProxyType:
+    """
+    Builds the read-only index of nodes connected to slots in order, which
+    every node connected to the same list can share.
+
+    Args:
+        nodes: list of nodes
+
+    Returns:
+        read-only mapping of each node to its position in nodes
+    """
+    return MappingProxyType(dict(zip(nodes, range(len(nodes)))))
 
 
 def main():
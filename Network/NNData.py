@@ -1,8 +1,8 @@
-import collections
 from enum import Enum, auto
-import random
 import numpy as np
 
+from Network.IndexPool import IndexPool
+
 
 class NNData:
     """This class is the first part of an artificial neural network written
@@ -37,16 +37,35 @@ class NNData:
         TRAIN = 0
         TEST = 1
 
+    class Storage(Enum):
+        """Enum which selects how the examples and labels are held
+
+        Returns:
+            LIST: x and y are kept as the given lists of lists.
+
+            NUMPY: x and y are kept as 2-D numpy arrays, one row per
+            example, and the train and test split as index arrays.
+        """
+        LIST = 0
+        NUMPY = 1
+
     def __init__(self,
                  x: list = None,
                  y: list = None,
-                 percentage: int = DEFAULT_PERCENTAGE):
+                 percentage: int = DEFAULT_PERCENTAGE,
+                 storage: Storage = Storage.LIST,
+                 dtype=np.float64,
+                 seed=None):
         """
         Constructor Method
         Args:
             percentage: percentage of data to be used in training set
             x: example part of data set
             y: label part of data set
+            storage: Storage mode for x and y
+            dtype: numpy dtype of x and y in Storage.NUMPY mode. None keeps
+            the dtype of arrays passed in, without copying them.
+            seed: seed of the random Generator used to split and shuffle
         Raises:
             DataMismatchError
         """
@@ -59,14 +78,18 @@ class NNData:
 
         self.x: list = x  # example part of data - list of lists
         self.y: list = y  # label part of data - List of lists
-        self.train_indices: list = None  # List of pointers to training subset
-        self.train_pool: list = None  # dequeue containing examples not yet
+        self.train_indices = None  # Array of pointers to training subset
+        self.train_pool = None  # IndexPool of examples not yet used
         self.train_data: tuple = (self.train_indices, self.train_pool)
 
-        self.test_indices: list = None  # List of pointers for testing subset
-        self.test_pool: list = None  # dequeue containing examples not used in
+        self.test_indices = None  # Array of pointers for testing subset
+        self.test_pool = None  # IndexPool of examples not yet used
         self.test_data: tuple = (self.test_indices, self.test_pool)
 
+        self.storage = storage  # LIST or NUMPY storage of x and y
+        self.dtype = dtype  # dtype of x and y in NUMPY storage
+        self.rng = np.random.default_rng(seed)  # split and shuffle source
+
         # Filter given percentage data through mutator method
         self.train_percentage = NNData.percentage_limiter(percentage)
 
@@ -96,6 +119,10 @@ class NNData:
         """ Checks that the lengths of x and y are the same. Calls the
         method split_set
 
+        In Storage.NUMPY mode x and y are converted to contiguous 2-D arrays
+        of the data set's dtype. Arrays which already match, including
+        memory-mapped arrays, are used as they are without a copy.
+
         Args:
             x: example part of data - list of lists
             y: label part of data - List of lists
@@ -104,6 +131,9 @@ class NNData:
             """
         if len(x) != len(y):
             raise DataMismatchError
+        if self.storage is self.Storage.NUMPY:
+            x = self.as_matrix(x, self.dtype)
+            y = self.as_matrix(y, self.dtype)
         self.x = x
         self.y = y
 
@@ -113,7 +143,8 @@ class NNData:
         """ Splits the data between the training and testing pools based on
         the percentage given.
 
-        Populates train_indices and test_indices
+        Populates train_indices and test_indices as sorted index arrays
+        from a single permutation drawn from the seeded Generator.
 
         Calls prime.data()
 
@@ -128,51 +159,59 @@ class NNData:
 
         # Setting lengths relative to the size of the data, and the
         # percentage of data to use in testing
-        data_size = np.math.floor(len(self.x))
-        train_size = np.math.floor(data_size * (self.train_percentage * 0.01))
+        data_size = len(self.x)
+        train_size = int(data_size * (self.train_percentage * 0.01))
 
         # Populating train and test indices which will point to example data
-        self.train_indices = list(random.sample(range(0, data_size),
-                                                train_size))
-        self.test_indices = list(
-            set(range(0, data_size)) - set(self.train_indices))
+        permutation = self.rng.permutation(data_size)
+        self.train_indices = np.sort(permutation[:train_size])
+        self.test_indices = np.sort(permutation[train_size:])
+        self.train_pool = IndexPool(self.train_indices)
+        self.test_pool = IndexPool(self.test_indices)
+        self.train_data = (self.train_indices, self.train_pool)
+        self.test_data = (self.test_indices, self.test_pool)
 
-        self.prime_data(self)
+        self.prime_data()
 
     def prime_data(self, my_set=None, order=None):
         """ Copies indices into desired pools for training and testing.
         Default is both training and testing.
 
+        The pools are refilled and shuffled in place, so priming allocates
+        no new lists or queues.
+
         Args:
             my_set: Specified if only one set is to be primed
             order: Specified if specific ordering is desired. Defaults to
             Sequential.
         """
 
-        test_indices_temp = self.test_indices[:]
-        train_indices_temp = self.train_indices[:]
-
-        # Default ordering of data
-        if order is None or order is self.Order.SEQUENTIAL:
-            order = self.Order.SEQUENTIAL
-
-        elif order is self.Order.RANDOM:
-            random.shuffle(test_indices_temp)
-            random.shuffle(train_indices_temp)
-
         # Only populate test set
         if my_set is self.Set.TEST:
-            self.test_pool = collections.deque(test_indices_temp)
+            self.prime_pool(self.test_pool, self.test_indices, order)
 
         # Only populate train set
         elif my_set is self.Set.TRAIN:
-            self.train_pool = collections.deque(train_indices_temp)
+            self.prime_pool(self.train_pool, self.train_indices, order)
 
         # Populate test and train pools with the example values pointed to
         # by the listed indices
         else:
-            self.train_pool = collections.deque(train_indices_temp)
-            self.test_pool = collections.deque(test_indices_temp)
+            self.prime_pool(self.train_pool, self.train_indices, order)
+            self.prime_pool(self.test_pool, self.test_indices, order)
+
+    def prime_pool(self, pool: IndexPool, indices: np.ndarray, order=None):
+        """ Refills a single pool with the given indices in place, shuffling
+        them if random order is requested.
+
+        Args:
+            pool: IndexPool to refill
+            indices: array of indices the pool should hand out
+            order: Order of the pool. Defaults to Sequential.
+        """
+        pool.refill(indices)
+        if order is self.Order.RANDOM:
+            pool.shuffle(self.rng)
 
     def empty_pool(self, my_set=None) -> bool:
         """ Checks to see if the specified set is empty, defaults to
@@ -243,6 +282,64 @@ class NNData:
         ret_item = [example, label]
         return ret_item
 
+    def get_items(self, indices) -> list:
+        """Returns the items at the given indices in the form of [x, y] x
+        being the examples and y the corresponding labels, without touching
+        the pools.
+
+        In Storage.NUMPY mode x and y are 2-D arrays. A run of consecutive
+        ascending indices is returned as a view, any other set of indices
+        as a fancy-indexed copy. In Storage.LIST mode x and y are lists.
+        """
+
+        if self.storage is not self.Storage.NUMPY:
+            return [[self.x[index] for index in indices],
+                    [self.y[index] for index in indices]]
+
+        indices = np.asarray(indices, dtype=np.intp)
+        if len(indices) and indices[-1] - indices[0] == len(indices) - 1 \
+                and np.all(np.diff(indices) == 1):
+            rows = slice(indices[0], indices[-1] + 1)
+            return [self.x[rows], self.y[rows]]
+        return [self.x[indices], self.y[indices]]
+
+    def get_batch(self, my_set=None, batch_size: int = 1) -> list:
+        """Pops up to batch_size items from the indicated set and returns a
+        list in the form of [x, y], x being the examples and y the
+        corresponding labels, as returned by get_items(). Returns fewer items
+        if the pool runs out.
+        """
+
+        # Set default set to train
+        if my_set is None:
+            my_set = self.Set.TRAIN
+
+        if my_set is self.Set.TRAIN:
+            pool = self.train_pool
+        else:
+            pool = self.test_pool
+
+        return self.get_items(pool.take(batch_size))
+
+    @staticmethod
+    def as_matrix(data, dtype=np.float64) -> np.ndarray:
+        """
+        Converts examples or labels to a contiguous 2-D array with one row
+        per item. One dimensional data becomes a single column.
+
+        Args:
+            data: list of lists, list of values or array
+            dtype: numpy dtype of the returned array, None to keep the
+              dtype of an array
+
+        Returns:
+            2-D numpy array
+        """
+        matrix = np.asarray(data, dtype=dtype)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(-1, 1)
+        return np.ascontiguousarray(matrix)
+
 
 class DataMismatchError(Exception):
     """Custom Exception"""
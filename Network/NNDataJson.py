@@ -1,8 +1,12 @@
 """This module encodes and decodes NNData objects to and from json objects"""
+import io
 import json
-from collections import deque
+
+import numpy as np
+
+from Network.IndexPool import IndexPool
+from Network.JsonStream import JsonStream
 from Network.NNData import NNData
-from Network.FFBPNetwork import FFBPNetwork
 
 
 class NNDataJson(json.encoder.JSONEncoder):
@@ -27,6 +31,11 @@ class NNDataJson(json.encoder.JSONEncoder):
                                    "train_pool": {'__deque__': list(train)},
                                    "test_pool": {'__deque__': list(test)}}}
             return data
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        if isinstance(obj, np.generic):
+            return obj.item()
+        return super().default(obj)
 
 
 def nn_data_decoder(dct):
@@ -42,13 +51,67 @@ def nn_data_decoder(dct):
         return dct
     data = dct['__NNData__']
     new_data = NNData(data['x'], data['y'], data['train_percentage'])
-    new_data.train_indices = data['train_indices']
-    new_data.test_indices = data['test_indices']
+    new_data.train_indices = np.array(data['train_indices'], dtype=np.intp)
+    new_data.test_indices = np.array(data['test_indices'], dtype=np.intp)
 
     test_pool = data['test_pool']
     train_pool = data['train_pool']
-    new_data.test_pool = deque(test_pool['__deque__'])
-    new_data.train_pool = deque(train_pool['__deque__'])
+    new_data.test_pool = IndexPool(test_pool['__deque__'])
+    new_data.train_pool = IndexPool(train_pool['__deque__'])
+    new_data.train_data = (new_data.train_indices, new_data.train_pool)
+    new_data.test_data = (new_data.test_indices, new_data.test_pool)
+    return new_data
+
+
+def load_nn_data(stream, chunk_size: int = 65536,
+                 dtype=np.float64) -> NNData:
+    """    Reads an __NNData__ json document from a text stream one chunk at
+    a time and outputs a NNData object in Storage.NUMPY mode.
+
+    x and y are parsed straight into growing numpy arrays and the indices
+    and pools straight into index arrays, so no Python lists of the data
+    are built while loading.
+
+    Args:
+        stream: text stream holding the json document, e.g. an open file
+        chunk_size: number of characters read from the stream at a time
+        dtype: numpy dtype of x and y
+
+    Returns:
+        NNData object with all attributes initialized"""
+
+    document = JsonStream(stream, chunk_size)
+
+    def read_pool():
+        return dict(document.read_object_items(
+            lambda pool_key: document.read_array(np.intp)))
+
+    def read_data_member(key):
+        if key in ('x', 'y'):
+            return document.read_array(dtype)
+        if key in ('train_indices', 'test_indices'):
+            return document.read_array(np.intp)
+        if key in ('train_pool', 'test_pool'):
+            return read_pool()
+        return document.read_value()
+
+    def read_member(key):
+        if key == '__NNData__':
+            return dict(document.read_object_items(read_data_member))
+        return document.read_value()
+
+    dct = dict(document.read_object_items(read_member))
+    if "__NNData__" not in dct:
+        return dct
+    data = dct['__NNData__']
+    new_data = NNData(data['x'], data['y'], data['train_percentage'],
+                      NNData.Storage.NUMPY, None)
+    if 'train_indices' in data:
+        new_data.train_indices = data['train_indices']
+        new_data.test_indices = data['test_indices']
+    if 'train_pool' in data:
+        new_data.train_pool = IndexPool(data['train_pool']['__deque__'])
+        new_data.test_pool = IndexPool(data['test_pool']['__deque__'])
     new_data.train_data = (new_data.train_indices, new_data.train_pool)
     new_data.test_data = (new_data.test_indices, new_data.test_pool)
     return new_data
@@ -56,6 +119,7 @@ def nn_data_decoder(dct):
 
 def main():
     """Main Unit test for module"""
+    from Network.FFBPNetwork import FFBPNetwork
 
     xor_x = [[0, 0], [1, 0], [0, 1], [1, 1]]
     xor_y = [[0], [1], [1], [0]]
@@ -556,6 +620,19 @@ def main():
 
     network = FFBPNetwork(1, 1)
     sin_encoded = json.loads(sin_json, object_hook=nn_data_decoder)
+    # load_nn_data reads the same data as nn_data_decoder, wherever the
+    # chunks happen to split the document
+    for document in (xor_data_encoded, sin_json):
+        decoded = json.loads(document, object_hook=nn_data_decoder)
+        for chunk_size in (1, 3, 7, 64, 65536):
+            loaded = load_nn_data(io.StringIO(document), chunk_size)
+            assert loaded.train_percentage == decoded.train_percentage
+            for name in ('x', 'y', 'train_indices', 'test_indices'):
+                assert np.array_equal(getattr(loaded, name),
+                                      getattr(decoded, name)), name
+            for name in ('train_pool', 'test_pool'):
+                assert list(getattr(loaded, name)) \
+                    == list(getattr(decoded, name)), name
     network.train(sin_encoded, 3001, verbosity=0)
     network.test(sin_encoded)
 
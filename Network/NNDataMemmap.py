@@ -0,0 +1,148 @@
+"""This module opens NNData objects on memory-mapped files, so data sets
+larger than RAM can be split, primed and read without being loaded.
+
+Two layouts are supported: numpy .npy files, and a raw binary layout made
+of a small fixed-size header followed by the rows of the array.
+"""
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+from Network.NNData import NNData
+
+RAW_MAGIC = b'NNRAW\x00'
+RAW_VERSION = 1
+RAW_HEADER = struct.Struct('<6sB16sQQ')  # magic, version, dtype, rows, cols
+RAW_HEADER_SIZE = 64  # header is padded so the rows start aligned
+RAW_WRITE_ROWS = 65536  # rows written per chunk by save_raw
+
+
+def load_npy(x_path: str, y_path: str,
+             percentage: int = NNData.DEFAULT_PERCENTAGE,
+             seed=None) -> NNData:
+    """
+    Opens a data set stored as two .npy files without reading them.
+
+    Args:
+        x_path: path of the .npy file holding the examples
+        y_path: path of the .npy file holding the labels
+        percentage: percentage of data to be used in training set
+        seed: seed of the random Generator used to split and shuffle
+
+    Returns:
+        NNData whose x and y are read-only memory-mapped arrays
+    """
+    x = np.load(x_path, mmap_mode='r')
+    y = np.load(y_path, mmap_mode='r')
+    return NNData(x, y, percentage, NNData.Storage.NUMPY, None, seed)
+
+
+def save_raw(path: str, data, dtype=None):
+    """
+    Writes an array in the raw binary layout, one chunk of rows at a time.
+
+    Args:
+        path: path of the file to write
+        data: 2-D array, or 1-D array written as a single column
+        dtype: dtype to store, defaults to the dtype of data
+    """
+    data = np.asarray(data)
+    if data.ndim == 1:
+        data = data.reshape(-1, 1)
+    dtype = np.dtype(dtype if dtype is not None else data.dtype)
+    rows, cols = data.shape
+
+    with open(path, 'wb') as file:
+        header = RAW_HEADER.pack(RAW_MAGIC, RAW_VERSION,
+                                 dtype.str.encode('ascii'), rows, cols)
+        file.write(header.ljust(RAW_HEADER_SIZE, b'\x00'))
+        for start in range(0, rows, RAW_WRITE_ROWS):
+            chunk = data[start:start + RAW_WRITE_ROWS]
+            file.write(np.ascontiguousarray(chunk, dtype=dtype).tobytes())
+
+
+def open_raw(path: str, mode: str = 'r') -> np.memmap:
+    """
+    Memory-maps an array stored in the raw binary layout.
+
+    Args:
+        path: path of the file to open
+        mode: numpy.memmap mode, 'r' for read-only
+
+    Returns:
+        2-D memory-mapped array
+
+    Raises:
+        RawFormatError: if the file does not start with a valid header
+    """
+    with open(path, 'rb') as file:
+        header = file.read(RAW_HEADER_SIZE)
+    if len(header) < RAW_HEADER.size:
+        raise RawFormatError(path)
+    magic, version, dtype, rows, cols = RAW_HEADER.unpack_from(header)
+    if magic != RAW_MAGIC or version != RAW_VERSION:
+        raise RawFormatError(path)
+
+    dtype = np.dtype(dtype.rstrip(b'\x00').decode('ascii'))
+    if rows == 0:
+        return np.empty((0, cols), dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode=mode, offset=RAW_HEADER_SIZE,
+                     shape=(rows, cols))
+
+
+def load_raw(x_path: str, y_path: str,
+             percentage: int = NNData.DEFAULT_PERCENTAGE,
+             seed=None) -> NNData:
+    """
+    Opens a data set stored as two raw binary files without reading them.
+
+    Args:
+        x_path: path of the raw file holding the examples
+        y_path: path of the raw file holding the labels
+        percentage: percentage of data to be used in training set
+        seed: seed of the random Generator used to split and shuffle
+
+    Returns:
+        NNData whose x and y are read-only memory-mapped arrays
+    """
+    return NNData(open_raw(x_path), open_raw(y_path), percentage,
+                  NNData.Storage.NUMPY, None, seed)
+
+
+class RawFormatError(Exception):
+    """File is not in the raw binary layout"""
+
+
+def main():
+    """Main Unit test for module"""
+    x = np.arange(20, dtype=np.float32).reshape(10, 2)
+    y = np.arange(10, dtype=np.float64)
+
+    with tempfile.TemporaryDirectory() as directory:
+        x_path = os.path.join(directory, 'x.npy')
+        y_path = os.path.join(directory, 'y.npy')
+        np.save(x_path, x)
+        np.save(y_path, y)
+        npy_data = load_npy(x_path, y_path, 50, seed=1)
+        assert isinstance(npy_data.x.base, np.memmap) or \
+            isinstance(npy_data.x, np.memmap)
+        assert npy_data.x.dtype == np.float32
+        assert npy_data.y.shape == (10, 1)
+
+        x_path = os.path.join(directory, 'x.raw')
+        y_path = os.path.join(directory, 'y.raw')
+        save_raw(x_path, x)
+        save_raw(y_path, y)
+        raw_data = load_raw(x_path, y_path, 50, seed=1)
+        assert np.array_equal(raw_data.x, x)
+        raw_data.prime_data(order=NNData.Order.SEQUENTIAL)
+        example, label = raw_data.get_one_item()
+        assert example[0] * 0.5 == label[0]
+        del npy_data, raw_data, example, label
+    print("Done!")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,7 @@
 import random
 from enum import Enum
 
+from Network.Activation import Activation, get_activation
 from Network.MultiLinkNode import MultiLinkNode
 
 
@@ -13,21 +14,25 @@ class Neurode(MultiLinkNode):
     Attributes:
         value: Current value of the Neurode
         my_type: Given LayerType
+        activation: Activation applied to the weighted sum of inputs
 
     """
 
-    def __init__(self, my_type):
+    __slots__ = ('value', 'my_type', 'activation')
+
+    def __init__(self, my_type, activation='sigmoid'):
         """
         Inits Neurode with all class and inherited attributes initialized
 
         Args:
             my_type: LayerType, which indicates the type of layer this
             neurode will be part of
+            activation: registered activation name or Activation
         """
         super().__init__()
         self.value = 0  # current value of the Neurode
         self.my_type = my_type  # LayerType values: input, hidden, or output
-        self.name = random.randint(0,10)
+        self.activation: Activation = get_activation(activation)
 
     def get_value(self) -> float:
         """
@@ -52,14 +57,14 @@ class Neurode(MultiLinkNode):
         """
         Method which processes a node to be added to input connections
 
-        Generates a random weight, and then adds the node and the given
-          weight to the ordered dictionary input_nodes
+        Generates a random weight, and then stores it in the input slot
+          of the given node
 
         Args:
             node: given node
         """
         weight = random.random()
-        self.input_nodes[node] = weight
+        self.input_weights[self.input_index[node]] = weight
 
     def process_new_output_node(self, node: MultiLinkNode):
         """
@@ -0,0 +1,342 @@
+"""This module trains a network on several processes at once.
+
+The weights, the training data and the per-worker gradients live in one
+multiprocessing.shared_memory block. Every weight update, the examples of
+the batch are split into one shard per worker, each worker calculates the
+weight adjustments of its shard with a detached MatrixEngine, and the
+parent process averages the adjustments into the shared weights. Workers
+only receive the positions of their shard, so nothing but a few ints is
+pickled per update.
+"""
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from Network.Activation import get_activation
+from Network.Loss import get_loss
+from Network.MatrixEngine import MatrixEngine
+from Network.Metrics import Metrics
+from Network.NNData import NNData
+
+ALIGNMENT = 64  # bytes between the starts of two shared arrays
+COPY_ROWS = 65536  # training rows copied into shared memory at a time
+
+WORKER = None  # SharedState of the current worker process
+
+
+class SharedState:
+    """
+    Arrays of a training run stored back to back in one shared memory
+    block.
+
+    Attributes:
+        memory: SharedMemory block holding the arrays
+        layout: list of (shape, dtype) tuples describing the arrays
+        arrays: list of numpy views on memory, in layout order
+        weights: flat view of every weight matrix, back to back
+        matrices: list of weight matrices, views on weights
+        x: training examples of the data set, one row per example in
+          ascending order of their index in the data set
+        y: labels of the training examples, rows as in x
+        order: positions of the epoch's training examples in x and y
+        outputs: network outputs of the epoch, one row per entry of order
+        gradients: summed weight adjustments, one row per worker
+    """
+
+    def __init__(self, memory: shared_memory.SharedMemory, layout: list,
+                 matrix_shapes: list):
+        """
+        Inits SharedState with views on the given memory block.
+
+        Args:
+            memory: SharedMemory block holding the arrays
+            layout: list of (shape, dtype) tuples describing the arrays
+            matrix_shapes: list of shapes of the weight matrices
+        """
+        self.memory = memory
+        self.layout = layout
+        self.arrays = []
+        offset = 0
+        for shape, dtype in layout:
+            array = np.ndarray(shape, dtype, memory.buf, offset)
+            self.arrays.append(array)
+            offset = self.align(offset + array.nbytes)
+        self.weights, self.x, self.y, self.order, self.outputs, \
+            self.gradients = self.arrays
+
+        self.matrices = []
+        offset = 0
+        for shape in matrix_shapes:
+            size = shape[0] * shape[1]
+            self.matrices.append(
+                self.weights[offset:offset + size].reshape(shape))
+            offset += size
+
+    @staticmethod
+    def align(offset: int) -> int:
+        """Rounds an offset up to the next multiple of ALIGNMENT"""
+        return -(-offset // ALIGNMENT) * ALIGNMENT
+
+    @classmethod
+    def create(cls, layout: list, matrix_shapes: list):
+        """
+        Allocates a new shared memory block for the given arrays.
+
+        Args:
+            layout: list of (shape, dtype) tuples describing the arrays
+            matrix_shapes: list of shapes of the weight matrices
+
+        Returns:
+            SharedState owning the new block
+        """
+        size = 0
+        for shape, dtype in layout:
+            size = cls.align(size + int(np.prod(shape))
+                             * np.dtype(dtype).itemsize)
+        memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        return cls(memory, layout, matrix_shapes)
+
+    @classmethod
+    def attach(cls, name: str, layout: list, matrix_shapes: list):
+        """
+        Opens a shared memory block created by another process.
+
+        Args:
+            name: name of the SharedMemory block
+            layout: list of (shape, dtype) tuples describing the arrays
+            matrix_shapes: list of shapes of the weight matrices
+
+        Returns:
+            SharedState on the existing block
+        """
+        return cls(shared_memory.SharedMemory(name), layout, matrix_shapes)
+
+    def close(self):
+        """Drops the views and closes the memory block."""
+        self.arrays = self.matrices = []
+        self.weights = self.x = self.y = self.order = self.outputs = \
+            self.gradients = None
+        self.memory.close()
+
+
+def init_worker(name: str, layout: list, matrix_shapes: list,
+                learning_rates: list, activations: list, loss):
+    """
+    Pool initializer which attaches a worker process to the shared state.
+
+    Args:
+        name: name of the SharedMemory block
+        layout: list of (shape, dtype) tuples describing the arrays
+        matrix_shapes: list of shapes of the weight matrices
+        learning_rates: list of learning rate vectors, one per layer
+        activations: list of registered activation names, one per layer
+        loss: registered loss name, or None for the squared error
+    """
+    global WORKER  # pylint: disable=global-statement
+    WORKER = SharedState.attach(name, layout, matrix_shapes)
+    WORKER.engine = MatrixEngine.detached(
+        WORKER.matrices, learning_rates,
+        [get_activation(activation) for activation in activations])
+    WORKER.loss = None if loss is None else get_loss(loss)
+
+
+def run_shard(task: tuple):
+    """
+    Calculates the weight adjustments of one shard in a worker process.
+
+    Args:
+        task: tuple of the worker's gradient row, and the start and stop
+          positions of the shard in order
+    """
+    slot, start, stop = task
+    indices = WORKER.order[start:stop]
+    engine = WORKER.engine
+    WORKER.outputs[start:stop] = engine.forward_batch(WORKER.x[indices])
+    gradient = WORKER.gradients[slot]
+    offset = 0
+    for adjustment in engine.batch_adjustments(WORKER.y[indices],
+                                               WORKER.loss):
+        gradient[offset:offset + adjustment.size] = adjustment.ravel()
+        offset += adjustment.size
+
+
+class ParallelTrainer:
+    """
+    Data-parallel trainer of a network, used as a context manager around
+    the epochs of FFBPNetwork.train_parallel.
+
+    While the trainer is open, the network's MatrixEngine is bound to the
+    weights in shared memory. Closing it copies the weights back into
+    private arrays and releases the shared memory.
+
+    Attributes:
+        network: FFBPNetwork being trained
+        workers: number of worker processes
+        rows: sorted data set indices of the training examples, the rows
+          of the shared x and y
+        state: SharedState of the run, owned by this process
+        pool: multiprocessing Pool of the workers
+    """
+
+    def __init__(self, network, data_set: NNData, workers: int = None,
+                 loss=None):
+        """
+        Inits ParallelTrainer. No process is started until it is entered.
+
+        Args:
+            network: FFBPNetwork to train
+            data_set: NNData whose training set is used
+            workers: number of worker processes, defaults to the number of
+              CPUs
+            loss: name of a registered loss, or None for the squared error
+        """
+        self.network = network
+        self.data_set = data_set
+        self.workers = workers or multiprocessing.cpu_count()
+        self.loss = None if loss is None else get_loss(loss).name
+        self.rows = None
+        self.state = None
+        self.pool = None
+
+    def __enter__(self):
+        engine = self.network.matrix_engine
+        engine.ensure_bound()
+        dtype = engine.dtype.str
+        # Only the training rows are shared, so a memory-mapped data set is
+        # never read in full into memory. train_indices is sorted, which
+        # lets run_epoch find the rows of the pool by binary search.
+        self.rows = np.asarray(self.data_set.train_indices, dtype=np.intp)
+        num_train = len(self.rows)
+        num_outputs = len(self.data_set.y[0])
+        matrix_shapes = [matrix.shape for matrix in engine.weights]
+        num_weights = sum(matrix.size for matrix in engine.weights)
+        layout = [((num_weights,), dtype),
+                  ((num_train, len(self.data_set.x[0])), dtype),
+                  ((num_train, num_outputs), dtype),
+                  ((num_train,), np.dtype(np.intp).str),
+                  ((num_train, num_outputs), dtype),
+                  ((self.workers, num_weights), dtype)]
+
+        self.state = SharedState.create(layout, matrix_shapes)
+        try:
+            for start in range(0, num_train, COPY_ROWS):
+                stop = start + COPY_ROWS
+                x, y = self.data_set.get_items(self.rows[start:stop])
+                self.state.x[start:stop] = x
+                self.state.y[start:stop] = y
+            for shared, matrix in zip(self.state.matrices, engine.weights):
+                shared[:] = matrix
+            engine.bind(self.state.matrices)
+
+            self.pool = multiprocessing.Pool(
+                self.workers, init_worker,
+                (self.state.memory.name, layout, matrix_shapes,
+                 engine.learning_rates,
+                 [activation.name for activation in engine.layer_activations],
+                 self.loss))
+        except BaseException:
+            self.__exit__(None, None, None)
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+        if self.state is not None:
+            self.network.matrix_engine.bind(
+                [matrix.copy() for matrix in self.state.matrices])
+            self.network.matrix_engine.activations = []
+            self.state.close()
+            self.state.memory.unlink()
+            self.state = None
+
+    def run_epoch(self, metrics: Metrics, batch_size: int):
+        """
+        Runs the primed training pool through the network, applying one
+        weight update per batch_size examples.
+
+        Args:
+            metrics: running statistics of the epoch
+            batch_size: number of examples per weight update, split
+              between the workers
+        """
+        state = self.state
+        pool = self.data_set.train_pool
+        count = len(pool)
+        state.order[:count] = np.searchsorted(self.rows, pool.take(count))
+
+        for start in range(0, count, batch_size):
+            stop = min(start + batch_size, count)
+            bounds = np.linspace(start, stop, self.workers + 1).astype(int)
+            # A batch shorter than the worker count leaves some shards
+            # empty; number the others from 0 so their gradient rows are
+            # the first len(tasks)
+            shards = [(int(low), int(high))
+                      for low, high in zip(bounds, bounds[1:]) if low < high]
+            tasks = [(slot, low, high)
+                     for slot, (low, high) in enumerate(shards)]
+            self.pool.map(run_shard, tasks)
+
+            total = np.sum(state.gradients[:len(tasks)], axis=0)
+            total /= stop - start
+            state.weights += total
+            metrics.update_batch(state.outputs[start:stop],
+                                 state.y[state.order[start:stop]])
+
+
+def main():
+    """Main Unit test for module"""
+    # Imported here, as FFBPNetwork imports this module when training
+    from Network.FFBPNetwork import FFBPNetwork
+
+    rng = np.random.default_rng(0)
+    x = rng.random((200, 4))
+    y = np.sin(x.sum(axis=1, keepdims=True)) / 3
+
+    networks = []
+    for _ in range(2):
+        network = FFBPNetwork(4, 1, FFBPNetwork.Engine.MATRIX, seed=3)
+        network.add_hidden_layer(6, 'tanh')
+        networks.append(network)
+    serial, parallel = networks
+
+    # The same batches give the same updates, however they are sharded
+    for loss in (None, 'binary_cross_entropy'):
+        serial_rmse = serial.train(NNData(x, y, 75, NNData.Storage.NUMPY,
+                                          seed=5), 3, 0, batch_size=32,
+                                   loss=loss)
+        parallel_rmse = parallel.train_parallel(
+            NNData(x, y, 75, NNData.Storage.NUMPY, seed=5), 3, 0,
+            batch_size=32, loss=loss, workers=3)
+        assert np.isclose(serial_rmse, parallel_rmse)
+        assert np.allclose(serial.predict(x), parallel.predict(x))
+
+    # A last batch shorter than the worker count updates the same way
+    serial_rmse = serial.train(NNData(x[:21], y[:21], 100,
+                                      NNData.Storage.NUMPY, seed=5), 2, 0,
+                               batch_size=8)
+    parallel_rmse = parallel.train_parallel(
+        NNData(x[:21], y[:21], 100, NNData.Storage.NUMPY, seed=5), 2, 0,
+        batch_size=8, workers=6)
+    assert np.isclose(serial_rmse, parallel_rmse, rtol=1e-12)
+    assert np.allclose(serial.predict(x), parallel.predict(x), atol=1e-12)
+
+    # Only the training rows are shared
+    data_set = NNData(x, y, 30, NNData.Storage.NUMPY, seed=1)
+    with ParallelTrainer(parallel, data_set, 2) as trainer:
+        assert trainer.state.x.shape == (60, 4)
+        assert np.array_equal(trainer.state.x, x[data_set.train_indices])
+        assert np.array_equal(trainer.state.y, y[data_set.train_indices])
+
+    # The network's own weights are back in private memory
+    parallel.engine = FFBPNetwork.Engine.OBJECT
+    parallel.send_data_to_inputs(x[0].tolist())
+    assert np.isclose(parallel.collect_outputs()[0], serial.predict(x[:1]))
+    print("Done!")
+
+
+if __name__ == "__main__":
+    main()
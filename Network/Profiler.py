@@ -0,0 +1,257 @@
+"""This module records where the time of training goes, layer by layer.
+
+Instrumentation is opt-in: a Profiler wraps the neurode, engine, data and
+metrics methods only while it is active, and puts the original methods
+back when it exits, so code run without a Profiler executes exactly as
+before and pays nothing for it.
+
+Times are exclusive: the time of a call excludes the time of the
+instrumented calls it makes, so nested neurode calls are not counted
+twice. The profiler assumes the network is trained on a single thread.
+"""
+import time
+
+from Network.BPNeurode import BPNeurode
+from Network.FFNeurode import FFNeurode
+from Network.Metrics import Metrics
+from Network.NNData import NNData
+
+NEURODE_METHODS = ((FFNeurode, 'receive_input', 'forward'),
+                   (FFNeurode, 'register_input', 'forward'),
+                   (FFNeurode, 'fire', 'forward'),
+                   (BPNeurode, 'calculate_delta', 'backward'),
+                   (BPNeurode, 'update_weights', 'backward'))
+ENGINE_METHODS = (('forward_layer', 'forward'),
+                  ('backward_layer', 'backward'))
+DATA_METHODS = ('prime_data', 'get_one_item', 'get_batch', 'get_items')
+
+
+class Profiler:
+    """
+    Context manager which instruments an FFBPNetwork while it is active.
+
+    Attributes:
+        network: FFBPNetwork being profiled
+        totals: dict of (phase, layer, method) to [seconds, calls]
+        epochs: list of dicts of epoch, samples, seconds and
+          samples_per_second
+        stack: child times of the instrumented calls in progress
+        layer_of: dict of id(neurode) to the position of its layer
+        originals: list of (owner, name, original attribute) to restore
+    """
+
+    active = None  # Profiler currently instrumenting, at most one
+
+    def __init__(self, network):
+        """
+        Inits Profiler with no records. Nothing is instrumented until it
+        is entered.
+
+        Args:
+            network: FFBPNetwork to profile
+        """
+        self.network = network
+        self.totals = {}
+        self.epochs = []
+        self.stack = []
+        self.layer_of = {}
+        self.originals = []
+        self._epoch_start = None
+
+    def __enter__(self):
+        if Profiler.active is not None:
+            raise ProfilerActiveError
+        Profiler.active = self
+
+        layers = self.network.matrix_engine.get_layers()
+        self.layer_of = {id(node): position
+                         for position, layer in enumerate(layers)
+                         for node in layer.neurodes}
+
+        for owner, name, phase in NEURODE_METHODS:
+            self.patch(owner, name, self.neurode_wrapper(
+                getattr(owner, name), phase, name))
+        engine = self.network.matrix_engine
+        for name, phase in ENGINE_METHODS:
+            self.patch(engine, name, self.engine_wrapper(
+                getattr(engine, name), phase, name))
+        for name in DATA_METHODS:
+            self.patch(NNData, name, self.wrapper(
+                getattr(NNData, name), ('data', None, name)))
+        self.patch(Metrics, 'start_epoch',
+                   self.epoch_wrapper(Metrics.start_epoch, True))
+        self.patch(Metrics, 'end_epoch',
+                   self.epoch_wrapper(Metrics.end_epoch, False))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for owner, name, original in reversed(self.originals):
+            if original is None:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+        self.originals = []
+        Profiler.active = None
+
+    def patch(self, owner, name: str, replacement):
+        """
+        Helper method which replaces an attribute until the profiler
+        exits.
+
+        Args:
+            owner: class or instance whose attribute is replaced
+            name: name of the attribute
+            replacement: new value of the attribute
+        """
+        self.originals.append((owner, name, vars(owner).get(name)))
+        setattr(owner, name, replacement)
+
+    def call(self, key: tuple, function, *args, **kwargs):
+        """
+        Calls a function and adds its exclusive time to totals[key].
+
+        Args:
+            key: (phase, layer, method) tuple to record the call under
+            function: function to call
+            args: positional arguments of the call
+            kwargs: keyword arguments of the call
+
+        Returns:
+            return value of the function
+        """
+        self.stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self.stack.pop()
+            if self.stack:
+                self.stack[-1] += elapsed
+            total = self.totals.setdefault(key, [0.0, 0])
+            total[0] += elapsed - children
+            total[1] += 1
+
+    def wrapper(self, function, key: tuple):
+        """Helper method which wraps a function recorded under one key"""
+        def timed(*args, **kwargs):
+            return self.call(key, function, *args, **kwargs)
+        return timed
+
+    def neurode_wrapper(self, function, phase: str, name: str):
+        """Helper method which wraps a neurode method, recorded under the
+        layer of the neurode it is called on"""
+        layer_of = self.layer_of
+
+        def timed(node, *args, **kwargs):
+            return self.call((phase, layer_of.get(id(node)), name),
+                             function, node, *args, **kwargs)
+        return timed
+
+    def engine_wrapper(self, method, phase: str, name: str):
+        """Helper method which wraps a bound MatrixEngine layer method,
+        recorded under the layer it evaluates"""
+        def timed(position, *args):
+            return self.call((phase, position + 1, name), method, position,
+                             *args)
+        return timed
+
+    def epoch_wrapper(self, function, start: bool):
+        """Helper method which wraps Metrics.start_epoch or end_epoch to
+        record the wall time and samples of each epoch"""
+        def timed(metrics, *args):
+            if start:
+                result = function(metrics, *args)
+                self._epoch_start = time.perf_counter()
+                return result
+            seconds = time.perf_counter() - self._epoch_start
+            self.epochs.append({
+                'epoch': metrics.epoch, 'samples': metrics.samples,
+                'seconds': seconds,
+                'samples_per_second': metrics.samples / seconds
+                if seconds > 0 else 0.0})
+            return function(metrics, *args)
+        return timed
+
+    def report(self) -> dict:
+        """
+        Summarizes everything recorded so far.
+
+        Returns:
+            dict with 'layers', a list of dicts of phase, layer, seconds and
+            calls per layer and phase, input layer first; 'methods', a list
+            of dicts of phase, layer, method, seconds and calls, slowest
+            first; and 'epochs', a list of dicts of epoch, samples, seconds
+            and samples_per_second
+        """
+        layers = {}
+        for (phase, layer, _), (seconds, calls) in self.totals.items():
+            if phase == 'data':
+                continue
+            total = layers.setdefault((phase, layer), [0.0, 0])
+            total[0] += seconds
+            total[1] += calls
+        methods = [{'phase': phase, 'layer': layer, 'method': method,
+                    'seconds': seconds, 'calls': calls}
+                   for (phase, layer, method), (seconds, calls)
+                   in self.totals.items()]
+        return {
+            'layers': [{'phase': phase, 'layer': layer, 'seconds': seconds,
+                        'calls': calls}
+                       for (phase, layer), (seconds, calls)
+                       in sorted(layers.items(),
+                                 key=lambda item: (item[0][1] is None,
+                                                   item[0][1] or 0,
+                                                   item[0][0] != 'forward'))],
+            'methods': sorted(methods, key=lambda method: -method['seconds']),
+            'epochs': list(self.epochs)}
+
+
+class ProfilerActiveError(Exception):
+    """Another Profiler is already instrumenting"""
+
+
+def main():
+    """Main Unit test for module"""
+    # Imported here, as FFBPNetwork imports this module when profiling.
+    # Profilers are built directly, as FFBPNetwork.profile would build
+    # them from the imported module rather than this one.
+    from Network.FFBPNetwork import FFBPNetwork
+
+    x = [[value / 50, 1 - value / 50] for value in range(50)]
+    y = [[example[0] / 2] for example in x]
+    fire = FFNeurode.fire
+
+    for engine in FFBPNetwork.Engine:
+        network = FFBPNetwork(2, 1, engine)
+        network.add_hidden_layer(4)
+        network.iterate()
+        network.add_hidden_layer(3)
+        with Profiler(network) as profiler:
+            try:
+                with Profiler(network):
+                    pass
+                assert False
+            except ProfilerActiveError:
+                pass
+            network.train(NNData(x, y, 80, seed=0), 3, 0)
+        report = profiler.report()
+
+        # Every method is restored once the profiler exits
+        assert FFNeurode.fire is fire
+        assert 'forward_layer' not in vars(network.matrix_engine)
+        assert [epoch['samples'] for epoch in report['epochs']] == [40] * 3
+        layers = {(layer['phase'], layer['layer'])
+                  for layer in report['layers']}
+        assert {('forward', 1), ('forward', 2), ('forward', 3),
+                ('backward', 3)} <= layers
+        assert any(method['method'] == 'get_one_item'
+                   for method in report['methods'])
+        # Times are exclusive, so they add up to no more than the epochs
+        assert sum(method['seconds'] for method in report['methods']) \
+            <= 1.05 * sum(epoch['seconds'] for epoch in report['epochs'])
+    print("Done!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""This module searches hyperparameters by training many networks at once.
+
+A search space maps hyperparameter names to candidate values. The supported
+names are:
+
+    hidden_layers: tuple of hidden layer sizes, from input to output
+    activation: activation of the hidden layers
+    output_activation: activation of the output layer
+    learning_rate: learning rate of every neurode
+    epochs: number of training epochs
+    batch_size: number of examples per weight update
+    loss: registered loss name, or None for the squared error
+    initializer: registered weight initialiser name, or None for the
+        seeded default, as every trial is seeded
+
+Trials run in a process pool against one NNData which every worker reads,
+and successive halving can stop clearly losing trials early.
+"""
+import csv
+import itertools
+import math
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from Network.FFBPNetwork import FFBPNetwork
+from Network.Metrics import Metrics
+from Network.NNData import NNData
+
+DEFAULT_CONFIG = {'hidden_layers': (5,), 'activation': 'sigmoid',
+                  'output_activation': 'sigmoid', 'learning_rate': 0.05,
+                  'epochs': 100, 'batch_size': 1, 'loss': None,
+                  'initializer': None}
+
+RESULT_FIELDS = ('trial', 'rung', 'epochs', 'rmse', 'seconds', 'config')
+
+DATA_SET = None  # NNData of the current worker process
+
+
+def grid_space(space: dict) -> list:
+    """
+    Lists every combination of the candidate values.
+
+    Args:
+        space: dict of hyperparameter name to list of candidate values
+
+    Returns:
+        list of config dicts, one per combination
+    """
+    names = list(space)
+    return [dict(zip(names, values))
+            for values in itertools.product(*(space[name]
+                                              for name in names))]
+
+
+def random_space(space: dict, trials: int, seed=None) -> list:
+    """
+    Draws random combinations of the candidate values.
+
+    Args:
+        space: dict of hyperparameter name to candidates. A list is
+          sampled uniformly, a (low, high) tuple of ints draws an int in
+          [low, high] and a (low, high) tuple of floats draws a float
+          log-uniformly, which suits learning rates.
+        trials: number of configs to draw
+        seed: seed of the random Generator
+
+    Returns:
+        list of config dicts
+    """
+    rng = np.random.default_rng(seed)
+    configs = []
+    for _ in range(trials):
+        config = {}
+        for name, candidates in space.items():
+            if isinstance(candidates, list):
+                config[name] = candidates[rng.integers(len(candidates))]
+            elif all(isinstance(bound, int) for bound in candidates):
+                config[name] = int(rng.integers(candidates[0],
+                                                candidates[1] + 1))
+            else:
+                low, high = np.log(candidates[0]), np.log(candidates[1])
+                config[name] = float(np.exp(rng.uniform(low, high)))
+        configs.append(config)
+    return configs
+
+
+def build_network(config: dict, num_inputs: int, num_outputs: int,
+                  seed=None) -> FFBPNetwork:
+    """
+    Builds the network of a config.
+
+    Args:
+        config: dict of hyperparameters, missing ones take DEFAULT_CONFIG
+        num_inputs: number of input neurodes
+        num_outputs: number of output neurodes
+        seed: seed of the weight initialiser
+
+    Returns:
+        untrained FFBPNetwork on the matrix engine
+    """
+    config = {**DEFAULT_CONFIG, **config}
+    network = FFBPNetwork(num_inputs, num_outputs, FFBPNetwork.Engine.MATRIX,
+                          config['output_activation'], config['initializer'],
+                          seed)
+    network.reset_cur()
+    for size in config['hidden_layers']:
+        network.add_hidden_layer(size, config['activation'])
+        network.iterate()
+    network.reset_cur()
+
+    for layer in network.layers.plan.layers[1:]:
+        for node in layer.neurodes:
+            node.learning_rate = config['learning_rate']
+    return network
+
+
+def evaluate(network: FFBPNetwork, data_set: NNData) -> float:
+    """
+    Calculates the RMSE of a network on the testing set, or on the
+    training set if the testing set is empty.
+
+    Args:
+        network: trained FFBPNetwork
+        data_set: NNData to evaluate on
+
+    Returns:
+        root mean squared error (float)
+    """
+    indices = data_set.test_indices
+    if not len(indices):
+        indices = data_set.train_indices
+    examples, labels = data_set.get_items(indices)
+    errors = network.predict(examples) - np.asarray(labels, np.float64)
+    return float(np.sqrt(np.mean(np.square(errors))))
+
+
+def init_worker(data_set: NNData):
+    """
+    Pool initializer which keeps the data set of a worker process.
+
+    Args:
+        data_set: NNData every trial trains and evaluates on
+    """
+    global DATA_SET  # pylint: disable=global-statement
+    DATA_SET = data_set
+
+
+def run_trial(task: tuple) -> dict:
+    """
+    Trains one config for a number of epochs in a worker process.
+
+    Args:
+        task: tuple of trial number, config, seed, rung, epochs to train,
+          path of a checkpoint to resume from or None, and path to save
+          the trained network to or None
+
+    Returns:
+        dict of RESULT_FIELDS
+    """
+    trial, config, seed, rung, epochs, resume, save = task
+    full_config = {**DEFAULT_CONFIG, **config}
+    data_set = DATA_SET
+    data_set.rng = np.random.default_rng([seed, rung])
+    random.seed(seed)
+
+    start = time.perf_counter()
+    if resume is None:
+        network = build_network(config, len(data_set.x[0]),
+                                len(data_set.y[0]), seed)
+    else:
+        network = FFBPNetwork.load(resume, None)
+    metrics = Metrics([], 0)
+    network.train(data_set, epochs, 0, NNData.Order.RANDOM,
+                  full_config['batch_size'], metrics, full_config['loss'])
+    metrics.close()
+    rmse = evaluate(network, data_set)
+    if save is not None:
+        network.save(save)
+    return {'trial': trial, 'rung': rung, 'epochs': epochs, 'rmse': rmse,
+            'seconds': time.perf_counter() - start, 'config': config}
+
+
+class Sweep:
+    """
+    Runs a list of configs in a process pool and collects their results.
+
+    Attributes:
+        data_set: NNData every trial trains and evaluates on
+        configs: list of config dicts to try
+        workers: number of worker processes
+        seed: seed of the trials, trial i is seeded with seed + i
+        results: list of result dicts of every trial and rung run so far
+    """
+
+    def __init__(self, data_set: NNData, configs: list, workers: int = None,
+                 seed: int = 0):
+        """
+        Inits Sweep with no results.
+
+        Args:
+            data_set: NNData every trial trains and evaluates on
+            configs: list of config dicts, e.g. from grid_space or
+              random_space
+            workers: number of worker processes, defaults to the number of
+              CPUs
+            seed: seed of the trials
+        """
+        self.data_set = data_set
+        self.configs = configs
+        self.workers = workers or multiprocessing.cpu_count()
+        self.seed = seed
+        self.results = []
+
+    def run(self) -> list:
+        """
+        Trains every config for its own number of epochs.
+
+        Returns:
+            list of result dicts, best RMSE first
+        """
+        tasks = [(trial, config, self.seed + trial, 0,
+                  {**DEFAULT_CONFIG, **config}['epochs'], None, None)
+                 for trial, config in enumerate(self.configs)]
+        return self.sorted(self.run_tasks(tasks))
+
+    def run_halving(self, min_epochs: int, max_epochs: int,
+                    eta: int = 3) -> list:
+        """
+        Successive halving. Every config is trained for min_epochs, then
+        only the best 1 / eta of the trials keep training, for eta times
+        as many epochs in total, until max_epochs is reached. Surviving
+        trials resume from a checkpoint instead of starting over.
+
+        Args:
+            min_epochs: epochs every config is trained for
+            max_epochs: epochs the last surviving trials are trained for
+            eta: factor by which trials are cut and epochs grow each rung
+
+        Returns:
+            list of result dicts of the last rung, best RMSE first. The
+            epochs of a result are the trial's total epochs so far.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            trials = list(range(len(self.configs)))
+            trained, budget, rung = 0, min_epochs, 0
+            while True:
+                budget = min(budget, max_epochs)
+                tasks = [(trial, self.configs[trial], self.seed + trial,
+                          rung, budget - trained,
+                          self.checkpoint(directory, trial) if rung else None,
+                          self.checkpoint(directory, trial))
+                         for trial in trials]
+                results = self.sorted(self.run_tasks(tasks))
+                for result in results:
+                    result['epochs'] = budget
+                if budget >= max_epochs:
+                    return results
+                keep = max(1, math.ceil(len(results) / eta))
+                trials = [result['trial'] for result in results[:keep]]
+                trained, rung = budget, rung + 1
+                budget = max_epochs if keep == 1 else budget * eta
+
+    @staticmethod
+    def checkpoint(directory: str, trial: int) -> str:
+        """Helper method which returns the checkpoint path of a trial"""
+        return os.path.join(directory, 'trial' + str(trial) + '.ckpt')
+
+    def run_tasks(self, tasks: list) -> list:
+        """
+        Helper method which runs trial tasks in the process pool and
+        records their results.
+
+        Args:
+            tasks: list of run_trial task tuples
+
+        Returns:
+            list of result dicts in the order the trials finished
+        """
+        with multiprocessing.Pool(min(self.workers, len(tasks)),
+                                  init_worker, (self.data_set,)) as pool:
+            results = list(pool.imap_unordered(run_trial, tasks))
+        self.results.extend(results)
+        return results
+
+    @staticmethod
+    def sorted(results: list) -> list:
+        """Helper method which sorts results by RMSE, then trial"""
+        return sorted(results, key=lambda result: (result['rmse'],
+                                                   result['trial']))
+
+    def write_csv(self, path: str):
+        """
+        Writes every result recorded so far to a CSV file.
+
+        Args:
+            path: path of the CSV file, overwritten if it exists
+        """
+        with open(path, 'w', newline='') as file:
+            writer = csv.DictWriter(file, RESULT_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.results)
+
+    @staticmethod
+    def format_table(results: list) -> str:
+        """
+        Formats results as a plain text table.
+
+        Args:
+            results: list of result dicts
+
+        Returns:
+            table with one row per result
+        """
+        lines = ['{:>5} {:>4} {:>6} {:>10} {:>8}  {}'.format(*RESULT_FIELDS)]
+        for result in results:
+            lines.append('{:>5} {:>4} {:>6} {:>10.6f} {:>8.3f}  {}'.format(
+                *(result[field] for field in RESULT_FIELDS)))
+        return '\n'.join(lines)
+
+
+def main():
+    """Main Unit test for module"""
+    x = [[value / 10] for value in range(40)]
+    y = [[math.sin(value[0]) / 2 + 0.5] for value in x]
+    data_set = NNData(x, y, 75, seed=1)
+
+    configs = grid_space({'hidden_layers': [(2,), (6,)],
+                          'learning_rate': [0.05, 0.3],
+                          'batch_size': [4]})
+    assert len(configs) == 4
+    assert len(random_space({'learning_rate': (0.01, 1.0),
+                             'hidden_layers': [(3,), (4, 4)]}, 5, 0)) == 5
+
+    sweep = Sweep(data_set, configs, workers=2, seed=1)
+    results = sweep.run_halving(min_epochs=5, max_epochs=45, eta=2)
+    assert len(results) == 1
+    assert [len([r for r in sweep.results if r['rung'] == rung])
+            for rung in range(3)] == [4, 2, 1]
+    assert results[0]['epochs'] == 45
+    print(Sweep.format_table(sweep.results))
+    print("Done!")
+
+
+if __name__ == '__main__':
+    main()
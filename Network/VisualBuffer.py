@@ -0,0 +1,167 @@
+"""Module which keeps a bounded sample of test results for plotting."""
+from enum import Enum
+
+import numpy as np
+
+
+class VisualBuffer:
+    """
+    Fixed-capacity store of (input, output, label) rows backed by
+    preallocated numpy arrays, so memory use stays flat however many
+    examples are added.
+
+    Attributes:
+        capacity: maximum number of rows kept
+        mode: Mode deciding which rows are kept once the buffer is full
+        rng: numpy random Generator used for reservoir sampling
+        x: array of input rows, allocated on the first add
+        y: array of label rows, allocated on the first add
+        y_nw: array of network output rows, allocated on the first add
+        count: number of rows currently kept
+        seen: number of rows added since the last clear
+    """
+
+    DEFAULT_CAPACITY = 10000
+
+    class Mode(Enum):
+        """Enum which selects the rows kept once the buffer is full
+
+        Returns:
+            RING: Most recent rows replace the oldest ones.
+
+            RESERVOIR: Every row added so far is kept with equal
+            probability.
+        """
+        RING = 0
+        RESERVOIR = 1
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, mode=Mode.RING,
+                 seed=None):
+        """
+        Inits VisualBuffer with no rows.
+
+        Args:
+            capacity: maximum number of rows kept
+            mode: Mode deciding which rows are kept once the buffer is full
+            seed: seed of the random Generator used for reservoir sampling
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.mode = mode
+        self.rng = np.random.default_rng(seed)
+        self.x = None
+        self.y = None
+        self.y_nw = None
+        self.count = 0
+        self.seen = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, input_values, output, label):
+        """
+        Offers one test result to the buffer.
+
+        Args:
+            input_values: input values of the example
+            output: output values observed from the network
+            label: expected label values
+        """
+        if self.x is None:
+            self.x = self.allocate(input_values)
+            self.y_nw = self.allocate(output)
+            self.y = self.allocate(label)
+
+        if self.seen < self.capacity:
+            slot = self.seen
+            self.count += 1
+        elif self.mode is VisualBuffer.Mode.RING:
+            slot = self.seen % self.capacity
+        else:
+            slot = self.rng.integers(self.seen + 1)
+            if slot >= self.capacity:
+                slot = None
+        self.seen += 1
+
+        if slot is not None:
+            self.x[slot] = input_values
+            self.y_nw[slot] = output
+            self.y[slot] = label
+
+    def allocate(self, row) -> np.ndarray:
+        """
+        Helper method which preallocates the array for one kind of row.
+
+        Args:
+            row: example row giving the number of columns
+
+        Returns:
+            uninitialized array with capacity rows
+        """
+        return np.empty((self.capacity, np.size(row)))
+
+    def get_rows(self) -> tuple:
+        """
+        Returns the rows kept, oldest first in ring mode.
+
+        Returns:
+            tuple of input, output and label arrays
+        """
+        if self.x is None:
+            empty = np.empty((0, 0))
+            return empty, empty, empty
+        if self.mode is VisualBuffer.Mode.RING \
+                and self.seen > self.capacity:
+            order = (np.arange(self.count) + self.seen) % self.capacity
+            return self.x[order], self.y_nw[order], self.y[order]
+        return (self.x[:self.count], self.y_nw[:self.count],
+                self.y[:self.count])
+
+    def clear(self):
+        """Forgets every row, keeping the preallocated arrays."""
+        self.count = 0
+        self.seen = 0
+
+
+def main():
+    """Main Unit test for module"""
+    ring = VisualBuffer(5)
+    assert [len(rows) for rows in ring.get_rows()] == [0, 0, 0]
+    for value in range(3):
+        ring.add([value, -value], [2 * value], [3 * value])
+    x, y_nw, y = ring.get_rows()
+    assert x.shape == (3, 2) and x[:, 0].tolist() == [0, 1, 2]
+    for value in range(3, 12):
+        ring.add([value, -value], [2 * value], [3 * value])
+    x, y_nw, y = ring.get_rows()
+    assert len(ring) == 5 and ring.seen == 12
+    assert x[:, 0].tolist() == [7, 8, 9, 10, 11]
+    assert y_nw[:, 0].tolist() == [14, 16, 18, 20, 22]
+    assert y[:, 0].tolist() == [21, 24, 27, 30, 33]
+    ring.clear()
+    assert len(ring) == 0 and ring.get_rows()[0].shape == (0, 2)
+
+    # Every row has the same chance of being kept, capacity / rows added
+    kept = np.zeros(20)
+    for seed in range(2000):
+        reservoir = VisualBuffer(5, VisualBuffer.Mode.RESERVOIR, seed)
+        for value in range(20):
+            reservoir.add([value], [value], [value])
+        x, y_nw, y = reservoir.get_rows()
+        assert len(x) == 5 and np.array_equal(x, y_nw)
+        assert len(set(x[:, 0])) == 5
+        kept[x[:, 0].astype(int)] += 1
+    assert np.all(np.abs(kept / 2000 - 0.25) < 0.05)
+
+    first, second = (VisualBuffer(3, VisualBuffer.Mode.RESERVOIR, 7)
+                     for _ in range(2))
+    for value in range(50):
+        first.add([value], [value], [value])
+        second.add([value], [value], [value])
+    assert np.array_equal(first.get_rows()[0], second.get_rows()[0])
+    print("Done!")
+
+
+if __name__ == "__main__":
+    main()
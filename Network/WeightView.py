@@ -0,0 +1,50 @@
+"""Module which exposes a row of a weight array as a neurode's input_nodes."""
+from collections.abc import MutableMapping
+
+import numpy as np
+
+
+class WeightView(MutableMapping):
+    """
+    Dictionary-like view of the weights of a single neurode.
+
+    Keys are the connected neurodes in connection order, values are read
+    from and written to the backing weight array, so code written against
+    the OrderedDict interface of input_nodes keeps working after the
+    weights have been moved into a matrix.
+
+    Attributes:
+        index: dictionary mapping each connected neurode to its position
+          in the weight array
+        weights: one dimensional numpy array holding the weights
+    """
+
+    def __init__(self, index: dict, weights: np.ndarray):
+        """
+        Inits WeightView with all class attributes initialized.
+
+        Args:
+            index: dictionary mapping each connected neurode to its position
+              in the weight array
+            weights: one dimensional numpy array holding the weights
+        """
+        self.index = index
+        self.weights = weights
+
+    def __getitem__(self, node) -> float:
+        return float(self.weights[self.index[node]])
+
+    def __setitem__(self, node, value):
+        self.weights[self.index[node]] = value
+
+    def __delitem__(self, node):
+        raise TypeError("Connections cannot be removed through a WeightView")
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, node) -> bool:
+        return node in self.index
@@ -0,0 +1,34 @@
+"""Feed-forward back-propagation neural network package.
+
+Importing the package runs no code of its modules: every module is imported
+on first attribute access, so a training worker which only needs
+Network.FFBPNetwork does not pay for the sweep, benchmark or plotting
+modules.
+
+    import Network
+    network = Network.FFBPNetwork.FFBPNetwork(2, 1)
+"""
+import importlib
+
+MODULES = ('Activation', 'BPNeurode', 'Benchmark', 'BitArray', 'Checkpoint',
+           'DLLNode', 'Data', 'DoublyLinkedList', 'ExecutionPlan',
+           'FFBPNetwork', 'FFBPNeurode', 'FFNeurode', 'HogwildTrainer',
+           'IndexPool', 'Initializer', 'InteractiveMenu', 'JsonStream',
+           'Layer', 'LayerList', 'LayerType', 'Loss', 'MatrixEngine',
+           'Metrics', 'MultiLinkNode', 'NNData', 'NNDataJson', 'NNDataMemmap',
+           'NNMath', 'Neurode', 'ParallelTrainer', 'Profiler', 'Sweep',
+           'VisualBuffer', 'WeightView')
+
+__all__ = list(MODULES)
+
+
+def __getattr__(name: str):
+    """Imports a module of the package on first access"""
+    if name in MODULES:
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError("module " + repr(__name__) + " has no attribute "
+                         + repr(name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(MODULES))